@@ -2,25 +2,98 @@
 Sistema de Scraping iFood
 Ponto de entrada principal
 """
+import argparse
+import asyncio
 import sys
 import os
+from colorama import Fore
 from src.menu.main_menu import MainMenu
 from src.utils.logger import setup_logger
+from src.scrapers.checkpoint import RunCheckpoint
+
+def retomar_execucao(run_id):
+    """Retomar uma execução interrompida a partir do checkpoint (só as tarefas pendentes)"""
+    execucao = RunCheckpoint.carregar(run_id)
+    if execucao is None:
+        print(f"{Fore.RED}❌ Execução não encontrada: {run_id} (veja python main.py --runs)")
+        return False
+
+    tipo = execucao["tipo"]
+    if tipo == "restaurantes":
+        from src.scrapers.restaurants_scraper import RestaurantsScraper
+        asyncio.run(RestaurantsScraper().executar_scraping_restaurantes(None, run_id=run_id))
+    elif tipo == "restaurantes_paralelo":
+        from src.scrapers.restaurants_scraper import RestaurantsScraper
+        from src.scrapers.parallel.parallel_restaurants import ParallelRestaurants
+        asyncio.run(ParallelRestaurants().executar_paralelo(RestaurantsScraper(), None, run_id=run_id))
+    elif tipo == "produtos":
+        from src.scrapers.products_scraper import ProductsScraper
+        scraper = ProductsScraper()
+        scraper._criar_tabela_produtos()
+        asyncio.run(scraper.executar_scraping_produtos(None, run_id=run_id))
+    elif tipo == "produtos_paralelo":
+        from src.scrapers.products_scraper import ProductsScraper
+        from src.scrapers.parallel.parallel_products import ParallelProducts
+        scraper = ProductsScraper()
+        scraper._criar_tabela_produtos()
+        ParallelProducts().executar_pool_processos(scraper, None, run_id=run_id)
+    elif tipo == "info_extra":
+        from src.scrapers.extra_info_scraper import ExtraInfoScraper
+        scraper = ExtraInfoScraper()
+        scraper._verificar_colunas_extras()
+        asyncio.run(scraper.executar_coleta_info_extra(None, run_id=run_id))
+    elif tipo == "info_extra_paralelo":
+        from src.scrapers.extra_info_scraper import ExtraInfoScraper
+        from src.scrapers.parallel.parallel_extra import ParallelExtra
+        scraper = ExtraInfoScraper()
+        scraper._verificar_colunas_extras()
+        asyncio.run(ParallelExtra().executar_paralelo(scraper, None, run_id=run_id))
+    else:
+        print(f"{Fore.RED}❌ Tipo de execução não suportado: {tipo}")
+        return False
+    return True
+
+def listar_execucoes():
+    """Listar as execuções mais recentes com checkpoint"""
+    execucoes = RunCheckpoint.listar(20)
+    if not execucoes:
+        print(f"{Fore.YELLOW}Nenhuma execução com checkpoint registrada.")
+        return
+
+    print(f"\n{Fore.CYAN}🧷 EXECUÇÕES COM CHECKPOINT:")
+    for run_id, tipo, status, concluidas, total, atualizado_em in execucoes:
+        cor = Fore.GREEN if status == "concluido" else Fore.YELLOW
+        print(f"{cor}   • {run_id} | {tipo} | {status} | {concluidas}/{total} tarefas | {atualizado_em:%d/%m %H:%M}")
 
 def main():
     """Função principal do sistema"""
+    parser = argparse.ArgumentParser(description="Sistema de Scraping iFood")
+    parser.add_argument("--resume", metavar="RUN_ID", help="retomar uma execução interrompida a partir do checkpoint")
+    parser.add_argument("--runs", action="store_true", help="listar as execuções com checkpoint")
+    args = parser.parse_args()
+
     # Configurar logger
     logger = setup_logger()
-    
+
     try:
+        if args.runs:
+            listar_execucoes()
+            return
+
+        if args.resume:
+            logger.info(f"Retomando execução {args.resume}")
+            if not retomar_execucao(args.resume):
+                sys.exit(1)
+            return
+
         logger.info("Iniciando sistema de scraping iFood")
-        
+
         # Criar instância do menu principal
         menu = MainMenu()
-        
+
         # Executar menu
         menu.run()
-        
+
     except KeyboardInterrupt:
         logger.info("Sistema interrompido pelo usuário")
         print("\n\nSistema finalizado.")
@@ -30,4 +103,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -47,7 +47,92 @@ class ConfigManager:
                 "proxies": {
                     "enabled": False,
                     "list": [],
-                    "rotation": "random"  # random, sequential
+                    "rotation": "random",  # random, sequential, best
+                    "test_url": "https://www.ifood.com.br",
+                    "test_timeout": 10,
+                    "cooldown_s": 300,  # quarentena após max_failures falhas seguidas
+                    "max_failures": 2
+                },
+                "network": {
+                    "block_resources": True,
+                    "blocked_resource_types": ["image", "media", "font"],
+                    "blocked_url_patterns": [
+                        "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+                        "connect.facebook.net", "hotjar.com", "clarity.ms", "nr-data.net", "sentry.io"
+                    ],
+                    "disable_animations": True
+                },
+                "session_cache": {
+                    "enabled": True,
+                    "ttl_hours": 12,
+                    "dir": "data/sessions"
+                },
+                "extraction": {
+                    "mode": "batch",  # batch, legacy
+                    "benchmark": False,
+                    "incremental": False,  # extrair e salvar a cada leva de scroll
+                    "incremental_batch": 20
+                },
+                "direct_http": {
+                    "enabled": False,
+                    "concurrency": 8,
+                    "max_connections": 10,
+                    "endpoints_file": "data/sessions/endpoints.json",
+                    "endpoints": {}  # catalogo/merchant: URL com {merchant_id} (opcional, ex.: servidor local)
+                },
+                "fingerprints": {
+                    "rotation": "random",  # random, sequential (identidades livres primeiro)
+                    "viewports": [[1280, 720], [1366, 768], [1440, 900], [1536, 864], [1920, 1080]],
+                    "locales": ["pt-BR"],
+                    "timezones": ["America/Sao_Paulo"]
+                },
+                "rate_limit": {
+                    "enabled": True,
+                    "burst": 1,  # requisições permitidas em rajada antes de aplicar o intervalo
+                    "backend": "file",  # file (compartilhado entre processos), memory
+                    "dir": "data/ratelimit",
+                    "hosts": {}  # sobrescritas por host: {"host": {"interval": 0.5, "burst": 4}}
+                },
+                "retry": {
+                    "base_delay_s": 1.0,  # backoff: sorteio entre 0 e base * 2^tentativa
+                    "max_delay_s": 30,
+                    "breaker_failures": 3,  # falhas seguidas que pausam o host/categoria/restaurante
+                    "breaker_cooldown_s": 60
+                },
+                "scroll": {
+                    "idle_ms": 2500,
+                    "max_duration_s": 90,
+                    "end_sentinels": []
+                },
+                "readiness": {
+                    "selector_timeout_ms": 10000,
+                    "stable_ms": 500,
+                    "quiet_ms": 400,
+                    "max_wait_ms": 5000
+                },
+                "capture": {
+                    "enabled": True,
+                    "url_patterns": ["marketplace.ifood.com.br", "wsloja.ifood.com.br", "/catalog", "/merchants"],
+                    "timeout": 5
+                },
+                "writer": {
+                    "batch_size": 200,  # registros por gravação no banco
+                    "flush_interval_s": 5,  # grava o lote parcial após esse tempo
+                    "queue_size": 50  # envios pendentes antes de a coleta esperar pelo banco
+                },
+                "scheduler": {
+                    "enabled": True,
+                    "ttl_hours": 24,  # restaurantes coletados há menos tempo ficam fora da fila
+                    "max_requests": 0,  # orçamento por execução (0 = sem limite)
+                    "max_minutes": 0,
+                    "seconds_per_restaurant": 10,  # estimativa até haver duração no histórico
+                    "prior_changes_per_day": 0.5,  # frequência de mudança suposta para quem tem pouco histórico
+                    "prior_weight_days": 2
+                },
+                "dedupe_cache": {
+                    "enabled": True,  # chaves gravadas carregadas uma vez por execução e consultadas em memória
+                    "bloom_min_keys": 2000000,  # a partir de quantos produtos usar filtro de Bloom no lugar do conjunto
+                    "false_positive_rate": 0.001  # positivos do filtro de Bloom são conferidos no banco
                 }
             },
             "parallel": {
@@ -744,13 +829,16 @@ class ConfigManager:
         print(f"\n{Fore.CYAN}Modos disponíveis:")
         print(f"{Fore.WHITE}[1] Random - Seleciona proxy aleatório a cada request")
         print(f"{Fore.WHITE}[2] Sequential - Usa proxies em sequência")
+        print(f"{Fore.WHITE}[3] Best - Usa o proxy saudável com menor latência/taxa de erro")
         
-        choice = input(f"\n{Fore.GREEN}Escolha o modo (1-2): {Fore.WHITE}").strip()
+        choice = input(f"\n{Fore.GREEN}Escolha o modo (1-3): {Fore.WHITE}").strip()
         
         if choice == "1":
             new_mode = "random"
         elif choice == "2":
             new_mode = "sequential"
+        elif choice == "3":
+            new_mode = "best"
         else:
             print(f"{Fore.RED}Opção inválida!")
             input(f"{Fore.GREEN}Pressione ENTER para continuar...")
@@ -773,14 +861,24 @@ class ConfigManager:
         print(f"\n{Fore.YELLOW}TESTAR PROXY")
         for i, proxy in enumerate(proxies, 1):
             print(f"{Fore.WHITE}[{i}] {proxy}")
+        print(f"{Fore.WHITE}[99] Testar todos")
         
         try:
             choice = int(input(f"\n{Fore.WHITE}Número do proxy a testar: {Fore.GREEN}"))
-            if 1 <= choice <= len(proxies):
-                proxy = proxies[choice - 1]
-                print(f"\n{Fore.CYAN}Testando proxy: {proxy}")
-                print(f"{Fore.YELLOW}Função de teste não implementada ainda.")
-                print(f"{Fore.WHITE}Em uma implementação real, faria uma requisição HTTP de teste.")
+            if choice == 99 or 1 <= choice <= len(proxies):
+                # Import local: o pool depende do ConfigManager
+                import asyncio
+                from src.scrapers.proxy_pool import ProxyPool
+                
+                pool = ProxyPool(self)
+                if choice != 99:
+                    pool.estados = {proxies[choice - 1]: pool.estados[proxies[choice - 1]]}
+                
+                print(f"\n{Fore.CYAN}Testando {len(pool.estados)} proxy(s) em {pool.url_teste}...")
+                resultados = asyncio.run(pool.verificar_todos())
+                saudaveis = sum(1 for ok in resultados.values() if ok)
+                pool.exibir_relatorio()
+                print(f"{Fore.GREEN if saudaveis else Fore.RED}{saudaveis}/{len(resultados)} proxy(s) respondendo")
             else:
                 print(f"{Fore.RED}Número inválido!")
         except ValueError:
@@ -819,6 +917,11 @@ class ConfigManager:
             print(f"{Fore.WHITE}• Timeout: tempo limite para cada tentativa")
             print(f"{Fore.WHITE}• Retries: tentativas adicionais após falha")
             print(f"{Fore.WHITE}• Total de tentativas = retries + 1")
+            retry = self.get_retry_config()
+            print(f"{Fore.WHITE}• Só erros transitórios (timeout, rede, 429/5xx) são repetidos, "
+                  f"com backoff exponencial até {retry.get('max_delay_s', 30)}s")
+            print(f"{Fore.WHITE}• {retry.get('breaker_failures', 3)} falhas seguidas pausam o host/categoria "
+                  f"por {retry.get('breaker_cooldown_s', 60)}s")
             
             choice = input(f"\n{Fore.GREEN}Escolha uma opção: {Fore.WHITE}").strip()
             
@@ -1460,6 +1563,66 @@ class ConfigManager:
         """Obter número máximo de tentativas"""
         return self.config.get('scraping', {}).get('max_retries', 3)
     
+    def get_retry_config(self):
+        """Obter backoff e circuit breaker das novas tentativas"""
+        return self.config.get('scraping', {}).get('retry', {})
+    
+    def get_network_config(self):
+        """Obter perfil de bloqueio de recursos de rede"""
+        return self.config.get('scraping', {}).get('network', {})
+    
+    def get_session_cache_config(self):
+        """Obter configuração do cache de sessão de localização"""
+        return self.config.get('scraping', {}).get('session_cache', {})
+    
+    def get_extraction_config(self):
+        """Obter modo de extração do DOM (batch/legacy), coleta incremental e flag de benchmark"""
+        return self.config.get('scraping', {}).get('extraction', {})
+    
+    def get_direct_http_config(self):
+        """Obter configuração do modo HTTP direto (sem navegador)"""
+        return self.config.get('scraping', {}).get('direct_http', {})
+    
+    def get_fingerprint_config(self):
+        """Obter identidades de contexto (viewports, locales, fusos) para rotação"""
+        return self.config.get('scraping', {}).get('fingerprints', {})
+    
+    def get_rate_limit_config(self):
+        """Obter configuração do limitador de taxa global (token bucket por host)"""
+        return self.config.get('scraping', {}).get('rate_limit', {})
+    
+    def get_scroll_config(self):
+        """Obter configuração do scroll infinito (ociosidade, orçamento e sentinelas de fim)"""
+        return self.config.get('scraping', {}).get('scroll', {})
+    
+    def get_readiness_config(self):
+        """Obter orçamentos de espera por prontidão da página"""
+        return self.config.get('scraping', {}).get('readiness', {})
+    
+    def get_capture_config(self):
+        """Obter configuração da captura de respostas JSON"""
+        return self.config.get('scraping', {}).get('capture', {})
+    
+    def get_writer_config(self):
+        """Obter tamanho de lote, intervalo e fila da gravação em segundo plano"""
+        return self.config.get('scraping', {}).get('writer', {})
+    
+    def get_scheduler_config(self):
+        """Obter TTL, orçamento e prior do agendador de coleta por frescor"""
+        return self.config.get('scraping', {}).get('scheduler', {})
+    
+    def get_dedupe_cache_config(self):
+        """Obter habilitação e limites do cache de dedupe por execução"""
+        return self.config.get('scraping', {}).get('dedupe_cache', {})
+    
+    def get_max_workers(self):
+        """Obter número máximo de workers paralelos"""
+        return self.config.get('parallel', {}).get('max_workers', 5)
+    
+    def get_checkpoint_interval(self):
+        """Obter intervalo de checkpoint (em registros)"""
+        return self.config.get('parallel', {}).get('checkpoint_interval', 100)
+    
     def get_user_agents(self):
         """Obter lista de user agents"""
         return self.config.get('scraping', {}).get('user_agents', [
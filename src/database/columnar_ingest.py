@@ -0,0 +1,176 @@
+"""
+Ingestão colunar de produtos: DataFrame pandas ou Table pyarrow (preço já numérico) registrado sem cópia no DuckDB
+e gravado com dedupe vetorizado (um UPDATE ... FROM e um INSERT ... SELECT por lote)
+"""
+import sys
+import time
+from collections import Counter
+import duckdb
+import numpy as np
+import pandas as pd
+from src.database.staging import carregar_staging_colunar, inserir_novos, em_transacao
+from src.database.dedupe_keys import garantir_chaves, sql_chave
+from src.utils.content_hash import hash_conteudo
+
+# Colunas gravadas pelo staging (id vem da SEQUENCE nos novos)
+COLUNAS_PRODUTOS = ["restaurant_id", "restaurant_name", "category", "name", "description", "price", "content_hash"]
+# content_hash é o mesmo do caminho por linha (ProductsScraper.hash_produto, sobre o preço ainda em texto): não dá
+# para recalculá-lo aqui a partir do preço numérico sem que todo produto pareça alterado
+COLUNAS_OBRIGATORIAS = ["restaurant_id", "restaurant_name", "category", "name", "price", "content_hash"]
+
+
+def _nomes_colunas(dados):
+    """Nomes das colunas de um DataFrame (columns) ou Table pyarrow (column_names)"""
+    nomes = getattr(dados, "column_names", None)
+    return list(nomes if nomes is not None else dados.columns)
+
+
+def _expressoes_ausentes(colunas):
+    """SQL para as colunas opcionais que não vieram no lote (só a descrição, gravada nula)"""
+    return {} if "description" in colunas else {"description": "NULL"}
+
+
+def ingerir_produtos(conn, dados):
+    """Gravar um lote colunar de produtos (restaurant_id, restaurant_name, category, name, price, content_hash e,
+    opcional, description): mesmo produto com hash diferente é atualizado, novos são inseridos, iguais
+    ignorados; retorna Counter(salvos, atualizados, duplicados)"""
+    colunas = _nomes_colunas(dados)
+    faltando = [coluna for coluna in COLUNAS_OBRIGATORIAS if coluna not in colunas]
+    if faltando:
+        raise ValueError(f"Colunas ausentes no lote de produtos: {', '.join(faltando)}")
+
+    total = len(dados)
+    if not total:
+        return Counter()
+
+    garantir_chaves(conn, "products")
+
+    def gravar():
+        carregar_staging_colunar(conn, "stg_products", "products", COLUNAS_PRODUTOS, dados,
+                                 _expressoes_ausentes(colunas))
+        # Produtos já salvos cujo conteúdo mudou (chave repetida no lote: vale a primeira ocorrência)
+        atualizados = conn.execute(f"""
+            UPDATE products SET description = s.description, price = s.price, content_hash = s.content_hash,
+                scraped_at = CURRENT_TIMESTAMP
+            FROM (
+                SELECT *, {sql_chave('name')} AS name_key, {sql_chave('category')} AS category_key
+                FROM stg_products
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY restaurant_id, name_key, category_key ORDER BY ordem) = 1
+            ) s
+            WHERE products.restaurant_id = s.restaurant_id
+              AND products.name_key = s.name_key
+              AND products.category_key = s.category_key
+              AND products.content_hash IS DISTINCT FROM s.content_hash
+        """).fetchone()[0]
+        salvos = inserir_novos(conn, "products", "stg_products", COLUNAS_PRODUTOS)
+        return salvos, atualizados
+
+    salvos, atualizados = em_transacao(conn, "products", gravar)
+    return Counter(salvos=salvos, atualizados=atualizados, duplicados=max(0, total - salvos - atualizados))
+
+
+def _criar_tabela(conn):
+    """Mesma estrutura de products (sem a FK para restaurants) para o benchmark"""
+    conn.execute("""
+        CREATE TABLE products (
+            id INTEGER PRIMARY KEY,
+            restaurant_id INTEGER,
+            restaurant_name VARCHAR NOT NULL,
+            category VARCHAR NOT NULL,
+            name VARCHAR NOT NULL,
+            description TEXT,
+            price DECIMAL(10,2),
+            scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            content_hash VARCHAR
+        )
+    """)
+
+
+def hash_linhas(dados):
+    """content_hash de um lote sintético (mesma fórmula de hash_produto: nome, descrição e preço)"""
+    return [hash_conteudo([nome, descricao, preco])
+            for nome, descricao, preco in zip(dados["name"], dados["description"], dados["price"])]
+
+
+def gerar_produtos(quantidade, itens_por_restaurante=100):
+    """Lote sintético com o perfil dos cardápios (~100 produtos por restaurante, 8 categorias)"""
+    indices = pd.Series(np.arange(quantidade))
+    restaurantes = indices // itens_por_restaurante
+    dados = pd.DataFrame({
+        "restaurant_id": restaurantes.astype("int32"),
+        "restaurant_name": "Restaurante " + restaurantes.astype(str),
+        "category": "Categoria " + (indices % 8).astype(str),
+        "name": "Produto " + indices.astype(str),
+        "description": "Descrição do produto " + indices.astype(str),
+        "price": np.round(5 + (indices % 9500) / 100, 2)
+    })
+    dados["content_hash"] = hash_linhas(dados)
+    return dados
+
+
+def _inserir_legado(conn, dados):
+    """Caminho antigo (referência do benchmark): consulta de duplicata, MAX(id) e INSERT por produto"""
+    for restaurant_id, restaurant_name, category, name, description, price, _ in dados.itertuples(index=False):
+        if conn.execute("""
+            SELECT id FROM products
+            WHERE LOWER(TRIM(name)) = LOWER(TRIM(?)) AND restaurant_id = ? AND LOWER(TRIM(category)) = LOWER(TRIM(?))
+            LIMIT 1
+        """, [name, restaurant_id, category]).fetchone():
+            continue
+        next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM products").fetchone()[0]
+        conn.execute("""
+            INSERT INTO products (id, restaurant_id, restaurant_name, category, name, description, price, scraped_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, [next_id, restaurant_id, restaurant_name, category, name, description, price])
+    conn.commit()
+
+
+def comparar_ingestao(tamanhos=(10_000, 100_000, 1_000_000), limite_legado=10_000):
+    """Benchmark: caminho antigo linha a linha x ingestão colunar, em um DuckDB em memória por tamanho.
+    O antigo é quadrático (consulta por linha numa tabela que cresce): acima de limite_legado linhas ele roda
+    só nas primeiras limite_legado e a taxa medida é usada como estimativa (otimista) do total"""
+    resultados = []
+    for tamanho in tamanhos:
+        dados = gerar_produtos(tamanho)
+
+        conn = duckdb.connect()
+        _criar_tabela(conn)
+        amostra = min(tamanho, limite_legado)
+        inicio = time.perf_counter()
+        _inserir_legado(conn, dados.head(amostra))
+        tempo_legado = (time.perf_counter() - inicio) * tamanho / amostra
+        conn.close()
+
+        conn = duckdb.connect()
+        _criar_tabela(conn)
+        inicio = time.perf_counter()
+        carga = ingerir_produtos(conn, dados)
+        tempo_carga = time.perf_counter() - inicio
+
+        # Recarga do mesmo lote com 10% dos preços alterados: só o dedupe e as atualizações
+        alterados = dados.copy()
+        alterados.loc[alterados.index % 10 == 0, "price"] += 1
+        alterados["content_hash"] = hash_linhas(alterados)
+        inicio = time.perf_counter()
+        recarga = ingerir_produtos(conn, alterados)
+        tempo_recarga = time.perf_counter() - inicio
+        conn.close()
+
+        resultados.append({
+            "Linhas": f"{tamanho:,}",
+            "Tempo (linha a linha)": f"{tempo_legado:.1f}s" + (" (estimado)" if amostra < tamanho else ""),
+            "Tempo (colunar)": f"{tempo_carga:.2f}s",
+            "Linhas/s (colunar)": f"{tamanho / tempo_carga:,.0f}" if tempo_carga > 0 else "N/A",
+            "Speedup": f"{tempo_legado / tempo_carga:.0f}x" if tempo_carga > 0 else "N/A",
+            "Recarga (10% alterados)": f"{tempo_recarga:.2f}s",
+            "Salvos/atualizados/iguais": f"{carga['salvos']}/{recarga['atualizados']}/{recarga['duplicados']}"
+        })
+    return resultados
+
+
+if __name__ == "__main__":
+    from src.utils.display_formatter import DisplayFormatter
+
+    tamanhos = [int(argumento) for argumento in sys.argv[1:]] or (10_000, 100_000, 1_000_000)
+    for resultado in comparar_ingestao(tamanhos):
+        print(DisplayFormatter.stats_table(resultado))
@@ -10,6 +10,7 @@ from pathlib import Path
 from colorama import Fore, Back, Style
 from src.utils.logger import get_logger
 from src.database.db_manager import DatabaseManager
+from src.database.dedupe_keys import comandos_chaves
 
 class DatabaseUtils:
     def __init__(self):
@@ -841,6 +842,23 @@ class DatabaseUtils:
                         ALTER TABLE products ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP;
                         ALTER TABLE categories ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP;
                     """
+                },
+                {
+                    "version": "1.3.0",
+                    "description": "Hashes de conteúdo (card, produto e cardápio) para detectar mudanças",
+                    "sql": """
+                        ALTER TABLE restaurants ADD COLUMN IF NOT EXISTS content_hash VARCHAR;
+                        ALTER TABLE restaurants ADD COLUMN IF NOT EXISTS menu_hash VARCHAR;
+                        ALTER TABLE products ADD COLUMN IF NOT EXISTS content_hash VARCHAR;
+                    """
+                },
+                {
+                    "version": "1.4.0",
+                    "description": "Chaves de dedupe normalizadas com índices únicos (categorias, restaurantes, produtos)",
+                    "sql": ";\n".join(
+                        comando for tabela in ("categories", "restaurants", "products")
+                        for comando in comandos_chaves(tabela)
+                    )
                 }
             ]
             
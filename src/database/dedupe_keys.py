@@ -0,0 +1,81 @@
+"""
+Chaves de dedupe persistidas: colunas <coluna>_key normalizadas (minúsculas, sem acentos, espaços colapsados)
+com índice único, no lugar de LOWER(TRIM()) calculado linha a linha em cada verificação
+"""
+import re
+import unicodedata
+
+# Colunas de texto normalizadas e colunas comparadas como estão (ids), por tabela
+CHAVES_DEDUPE = {
+    "restaurants": {"texto": ["name", "city"], "exatas": []},
+    "products": {"texto": ["name", "category"], "exatas": ["restaurant_id"]},
+    "categories": {"texto": ["categorias", "links"], "exatas": []},
+}
+
+PADRAO_ESPACOS = re.compile(r"\s+")
+
+
+def coluna_chave(coluna):
+    """Nome da coluna normalizada persistida (name -> name_key)"""
+    return f"{coluna}_key"
+
+
+def sql_chave(expressao):
+    """Normalização em SQL (mesmo resultado de normalizar_chave): espaços colapsados, sem acentos, minúsculas"""
+    return rf"lower(strip_accents(trim(regexp_replace({expressao}, '[\s\pZ]+', ' ', 'g'))))"
+
+
+def normalizar_chave(texto):
+    """Normalização em Python para comparar com as colunas <coluna>_key sem ir ao banco"""
+    if texto is None:
+        return None
+    sem_acentos = "".join(c for c in unicodedata.normalize("NFD", str(texto)) if not unicodedata.combining(c))
+    return PADRAO_ESPACOS.sub(" ", sem_acentos).strip().lower()
+
+
+def colunas_chave(tabela):
+    """Colunas do índice único: exatas + normalizadas (restaurant_id, name_key, category_key)"""
+    chaves = CHAVES_DEDUPE[tabela]
+    return chaves["exatas"] + [coluna_chave(coluna) for coluna in chaves["texto"]]
+
+
+def indice_chave(tabela):
+    return f"idx_{tabela}_chave"
+
+
+def comandos_chaves(tabela):
+    """SQL que cria as colunas de chave, preenche as linhas existentes e cria o índice único. Duplicatas antigas
+    ficam sem chave (só o menor id de cada grupo a recebe; nada é apagado) e rodar de novo não muda nada"""
+    exatas = CHAVES_DEDUPE[tabela]["exatas"]
+    texto = CHAVES_DEDUPE[tabela]["texto"]
+    chaves = colunas_chave(tabela)
+    comandos = [f"ALTER TABLE {tabela} ADD COLUMN IF NOT EXISTS {coluna_chave(coluna)} VARCHAR" for coluna in texto]
+    comandos.append(f"""
+        UPDATE {tabela} SET {', '.join(f'{coluna_chave(coluna)} = n.{coluna_chave(coluna)}' for coluna in texto)}
+        FROM (
+            SELECT id, {', '.join(exatas + [f'{sql_chave(coluna)} AS {coluna_chave(coluna)}' for coluna in texto])}
+            FROM {tabela}
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY {', '.join(exatas + [sql_chave(coluna) for coluna in texto])} ORDER BY id
+            ) = 1
+        ) n
+        WHERE {tabela}.id = n.id AND {tabela}.{coluna_chave(texto[0])} IS NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM {tabela} o WHERE {' AND '.join(f'o.{chave} = n.{chave}' for chave in chaves)}
+          )
+    """)
+    comandos.append(f"CREATE UNIQUE INDEX IF NOT EXISTS {indice_chave(tabela)} ON {tabela}({', '.join(chaves)})")
+    return comandos
+
+
+def garantir_chaves(conn, tabela):
+    """Criar e preencher as colunas de chave e o índice único (só na primeira vez: depois o índice já existe
+    e as linhas novas recebem a chave no INSERT)"""
+    existe = conn.execute(
+        "SELECT COUNT(*) FROM duckdb_indexes() WHERE index_name = ?", [indice_chave(tabela)]
+    ).fetchone()[0]
+    if existe:
+        return False
+    for comando in comandos_chaves(tabela):
+        conn.execute(comando)
+    return True
@@ -0,0 +1,91 @@
+"""
+Gravação de lotes por tabela de staging: carga temporária, anti-join contra a tabela final e ids de uma SEQUENCE
+"""
+import duckdb
+from src.database.dedupe_keys import CHAVES_DEDUPE, coluna_chave, colunas_chave, sql_chave
+
+
+def garantir_sequencia(conn, tabela, recriar=False):
+    """SEQUENCE de ids da tabela (seq_<tabela>_id), criada a partir do maior id existente"""
+    sequencia = f"seq_{tabela}_id"
+    if recriar:
+        conn.execute(f"DROP SEQUENCE IF EXISTS {sequencia}")
+
+    existe = conn.execute(
+        "SELECT COUNT(*) FROM duckdb_sequences() WHERE sequence_name = ?", [sequencia]
+    ).fetchone()[0]
+    if not existe:
+        inicio = conn.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {tabela}").fetchone()[0]
+        conn.execute(f"CREATE SEQUENCE IF NOT EXISTS {sequencia} START {inicio}")
+    return sequencia
+
+
+def carregar_staging(conn, staging, tabela, colunas, linhas):
+    """Tabela temporária com os tipos das colunas da tabela final (+ ordem no lote) carregada com as linhas"""
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE {staging} AS
+        SELECT 0 AS ordem, {', '.join(colunas)} FROM {tabela} LIMIT 0
+    """)
+    conn.executemany(
+        f"INSERT INTO {staging} VALUES ({', '.join(['?'] * (len(colunas) + 1))})",
+        [[ordem, *linha] for ordem, linha in enumerate(linhas)]
+    )
+
+
+def carregar_staging_colunar(conn, staging, tabela, colunas, dados, expressoes=None):
+    """Como carregar_staging, mas a partir de um DataFrame pandas ou Table pyarrow: registrado sem cópia no
+    DuckDB e lido num único INSERT ... SELECT (expressoes: SQL no lugar de colunas ausentes em dados)"""
+    expressoes = expressoes or {}
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE {staging} AS
+        SELECT 0 AS ordem, {', '.join(colunas)} FROM {tabela} LIMIT 0
+    """)
+    conn.register(f"{staging}_origem", dados)
+    try:
+        selecao = ", ".join(expressoes.get(coluna, coluna) for coluna in colunas)
+        conn.execute(f"""
+            INSERT INTO {staging}
+            SELECT ROW_NUMBER() OVER () - 1, {selecao} FROM {staging}_origem
+        """)
+    finally:
+        conn.unregister(f"{staging}_origem")
+
+
+def inserir_novos(conn, tabela, staging, colunas):
+    """Um único INSERT ... SELECT: linhas do staging sem correspondente na tabela (anti-join pelas colunas de
+    chave normalizadas, ver dedupe_keys) e sem repetição no lote, com ids da SEQUENCE e a chave já preenchida;
+    retorna quantas entraram"""
+    sequencia = garantir_sequencia(conn, tabela)
+    texto = CHAVES_DEDUPE[tabela]["texto"]
+    chaves = colunas_chave(tabela)
+    calculadas = ", ".join(f"{sql_chave(f's.{coluna}')} AS {coluna_chave(coluna)}" for coluna in texto)
+    iguais = " AND ".join(f"t.{chave} = s.{chave}" for chave in chaves)
+    return conn.execute(f"""
+        INSERT INTO {tabela} (id, {', '.join(colunas)}, {', '.join(coluna_chave(coluna) for coluna in texto)})
+        SELECT nextval('{sequencia}'), {', '.join(colunas)}, {', '.join(coluna_chave(coluna) for coluna in texto)}
+        FROM (
+            SELECT * FROM (SELECT s.*, {calculadas} FROM {staging} s) s
+            WHERE NOT EXISTS (SELECT 1 FROM {tabela} t WHERE {iguais})
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY {', '.join(f's.{chave}' for chave in chaves)} ORDER BY ordem) = 1
+            ORDER BY ordem
+        )
+    """).fetchone()[0]
+
+
+def em_transacao(conn, tabela, gravar):
+    """Executar gravar() numa transação; se a SEQUENCE ficou atrás de ids inseridos por fora
+    (MAX(id) + 1), realinhar e repetir uma vez"""
+    for tentativa in range(2):
+        conn.begin()
+        try:
+            resultado = gravar()
+            conn.commit()
+            return resultado
+        except duckdb.ConstraintException:
+            conn.rollback()
+            if tentativa:
+                raise
+            garantir_sequencia(conn, tabela, recriar=True)
+        except Exception:
+            conn.rollback()
+            raise
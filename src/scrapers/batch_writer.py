@@ -0,0 +1,125 @@
+"""
+Gravação em segundo plano: extratores enfileiram registros e uma única task grava lotes no DuckDB fora do event loop
+"""
+import asyncio
+import time
+from collections import Counter
+from colorama import Fore
+from src.utils.logger import get_logger
+from src.config.config_manager import ConfigManager
+
+# Fim da fila: grava o que restou e encerra a task
+_FIM = object()
+
+
+class BatchWriter:
+    """Fila limitada (produtores esperam se o banco ficar para trás) + lote gravado a cada N registros ou T segundos"""
+
+    def __init__(self, gravar, checkpoint=None, config_manager=None, descricao="registros"):
+        self.logger = get_logger()
+        self.config_manager = config_manager or ConfigManager()
+        config = self.config_manager.get_writer_config()
+
+        self.gravar = gravar  # função síncrona: lista de registros -> Counter (salvos, duplicados, erros...)
+        self.checkpoint = checkpoint
+        self.descricao = descricao
+        self.tamanho_lote = max(1, int(config.get("batch_size", 200)))
+        self.intervalo_s = config.get("flush_interval_s", 5)
+        self.tamanho_fila = max(1, int(config.get("queue_size", 50)))
+
+        self._fila = None
+        self._task = None
+        self.contadores = Counter()
+        self.stats = Counter()
+
+    async def __aenter__(self):
+        self.iniciar()
+        return self
+
+    async def __aexit__(self, *_):
+        await self.fechar()
+
+    def iniciar(self):
+        """Criar a fila e a task gravadora (no event loop em execução)"""
+        if self._task is None:
+            self._fila = asyncio.Queue(maxsize=self.tamanho_fila)
+            self._task = asyncio.create_task(self._consumir())
+
+    async def enviar(self, registros):
+        """Enfileirar registros para gravação (espera se a fila estiver cheia)"""
+        if registros:
+            await self._fila.put((list(registros), None))
+
+    async def concluir(self, tarefa, registros=0):
+        """Marcar a tarefa no checkpoint depois que os registros enviados antes dela forem gravados"""
+        await self._fila.put(([], (tarefa, registros)))
+
+    async def fechar(self):
+        """Gravar o que estiver na fila e encerrar a task"""
+        if self._task is None:
+            return
+        await self._fila.put(_FIM)
+        await self._task
+        self._task = None
+
+    async def _consumir(self):
+        loop = asyncio.get_running_loop()
+        registros, tarefas = [], []
+        prazo = None
+        fim = False
+
+        while not fim:
+            espera = None if prazo is None else max(0.0, prazo - loop.time())
+            try:
+                item = await asyncio.wait_for(self._fila.get(), espera)
+            except asyncio.TimeoutError:
+                item = None
+
+            if item is _FIM:
+                fim = True
+            elif item is not None:
+                novos, tarefa = item
+                registros.extend(novos)
+                if tarefa is not None:
+                    tarefas.append(tarefa)
+                if prazo is None:
+                    prazo = loop.time() + self.intervalo_s
+                self.stats["maior_fila"] = max(self.stats["maior_fila"], self._fila.qsize())
+
+            if (registros or tarefas) and (fim or len(registros) >= self.tamanho_lote or loop.time() >= prazo):
+                # Gravação síncrona do DuckDB em thread: a coleta segue enquanto o lote é gravado
+                await loop.run_in_executor(None, self._gravar_lote, registros, tarefas)
+                registros, tarefas = [], []
+                prazo = None
+
+    def _gravar_lote(self, registros, tarefas):
+        """Gravar o lote e só então marcar as tarefas no checkpoint (executado fora do event loop)"""
+        inicio = time.perf_counter()
+        if registros:
+            try:
+                self.contadores.update(self.gravar(registros) or {})
+            except Exception as e:
+                # Tarefas do lote ficam pendentes no checkpoint (refeitas ao retomar)
+                self.contadores["erros"] += len(registros)
+                self.logger.error(f"Erro ao gravar lote de {len(registros)} {self.descricao}: {str(e)}")
+                print(f"{Fore.RED}   ❌ Erro ao gravar lote de {len(registros)} {self.descricao}: {str(e)}")
+                return
+            self.stats["lotes"] += 1
+            self.stats["registros"] += len(registros)
+            print(f"{Fore.BLUE}   💾 Lote gravado: {len(registros)} {self.descricao} ({self.stats['registros']} no total)")
+
+        if self.checkpoint:
+            try:
+                for tarefa, quantidade in tarefas:
+                    self.checkpoint.concluir(tarefa, registros=quantidade)
+            except Exception as e:
+                self.logger.error(f"Erro ao gravar checkpoint {self.checkpoint.run_id}: {str(e)}")
+        self.stats["segundos"] += time.perf_counter() - inicio
+
+    def exibir_relatorio(self):
+        """Lotes gravados e tempo gasto gravando (sobreposto à coleta)"""
+        if not self.stats["lotes"]:
+            return
+        print(f"{Fore.WHITE}   💾 Gravação em segundo plano: {self.stats['registros']} {self.descricao} em "
+              f"{self.stats['lotes']} lotes | {self.stats['segundos']:.1f}s gravando | "
+              f"fila máx. {self.stats['maior_fila']}/{self.tamanho_fila}")
@@ -8,7 +8,16 @@ from playwright.async_api import async_playwright, TimeoutError as PlaywrightTim
 from colorama import Fore, Style
 from src.utils.logger import get_logger
 from src.database.db_manager import DatabaseManager
+from src.database.staging import carregar_staging, inserir_novos, em_transacao
+from src.database.dedupe_keys import garantir_chaves
 from src.config.config_manager import ConfigManager
+from src.scrapers.resource_blocker import ResourceBlocker
+from src.scrapers.session_cache import LocationSessionCache
+from src.scrapers.page_readiness import PageReadiness
+from src.scrapers.rate_limiter import obter_limitador
+from src.scrapers.retry_policy import obter_politica
+from src.scrapers.proxy_pool import obter_pool
+from src.scrapers.context_factory import ContextFactory
 
 class CategoriesScraper:
     def __init__(self):
@@ -18,6 +27,15 @@ class CategoriesScraper:
         self.base_url = "https://www.ifood.com.br"
         self.cidade_busca = self.config_manager.get_default_city()
         self.endereco_completo = f"{self.cidade_busca}, SP, Brasil"
+        self.resource_blocker = ResourceBlocker(self.config_manager)
+        self.session_cache = LocationSessionCache(self.config_manager)
+        self.readiness = PageReadiness(self.config_manager)
+        self.limitador = obter_limitador(self.config_manager)
+        self.retry_policy = obter_politica(self.config_manager)
+        self.proxy_pool = obter_pool(self.config_manager)
+        self.context_factory = ContextFactory(
+            self.config_manager, self.resource_blocker, self.session_cache, self.proxy_pool
+        )
         
         # Configurações otimizadas baseadas nos testes de performance + melhorias do teste_localizacao.py
         self.config_otimizado = {
@@ -123,7 +141,8 @@ class CategoriesScraper:
                 self.logger.debug("Seleção via teclado")
                 print(f"{Fore.WHITE}   ✅ Seleção via teclado")
             
-            await asyncio.sleep(2)
+            # Aguardar o modal reagir à seleção (botão de confirmar ou DOM estável)
+            await self.readiness.pronta(page, "button:has-text('Confirmar')", timeout_ms=3000)
             
             # Confirmar localização
             try:
@@ -143,7 +162,7 @@ class CategoriesScraper:
             except:
                 self.logger.debug("Botão salvar não encontrado")
             
-            await asyncio.sleep(2)
+            await self.readiness.dom_quieto(page)
             
             # ESTRATEGIA OTIMIZADA para navegar para "Restaurantes"
             restaurantes_encontrado = await self.navegar_para_restaurantes_otimizado(page)
@@ -167,6 +186,25 @@ class CategoriesScraper:
             
             return False
     
+    async def configurar_localizacao(self, page, context):
+        """Reaproveitar a sessão localizada em cache ou preencher a localização e salvar a sessão"""
+        if self.session_cache.obter(self.cidade_busca):
+            if await self.session_cache.sessao_localizada(page, self.config_otimizado['campo_endereco']):
+                print(f"{Fore.GREEN}✅ Localização restaurada da sessão salva ({self.cidade_busca})")
+                
+                if not await self.navegar_para_restaurantes_otimizado(page):
+                    self.logger.warning("Falha ao navegar para restaurantes, mas continuando...")
+                return True
+            
+            # Sessão não foi aceita pelo site: descartar e localizar normalmente
+            self.logger.warning(f"Sessão salva de '{self.cidade_busca}' não está localizada - descartando")
+            self.session_cache.invalidar(self.cidade_busca)
+        
+        sucesso = await self.preencher_localizacao(page)
+        if sucesso:
+            await self.session_cache.salvar(context, self.cidade_busca)
+        return sucesso
+    
     async def navegar_para_restaurantes_otimizado(self, page):
         """Navegar para seção Restaurantes com estratégias otimizadas"""
         tempo_inicio = time.time()
@@ -203,7 +241,7 @@ class CategoriesScraper:
                         await elemento.click()
                         self.logger.debug(f"Clicado com seletor: {seletor}")
                         print(f"{Fore.GREEN}   ✅ 'Restaurantes' clicado com seletor direto!")
-                        await asyncio.sleep(1)
+                        await self.readiness.dom_quieto(page)
                         return True
                 except:
                     continue
@@ -222,7 +260,7 @@ class CategoriesScraper:
                             await page.click("text='Restaurantes'")
                             self.logger.debug(f"Encontrado após {i} navegações")
                             print(f"{Fore.GREEN}   ✅ 'Restaurantes' encontrado no carrossel!")
-                            await asyncio.sleep(1)
+                            await self.readiness.dom_quieto(page)
                             return True
                         
                         # Navegar para próximo
@@ -239,7 +277,7 @@ class CategoriesScraper:
                         if not navegou:
                             break
                         
-                        await asyncio.sleep(0.3)  # Pausa rápida
+                        await self.readiness.dom_quieto(page, quieto_ms=150, limite_ms=1000)
             except:
                 pass
             
@@ -258,7 +296,7 @@ class CategoriesScraper:
                             await elemento.click()
                             self.logger.debug("Clicado via busca ampla")
                             print(f"{Fore.GREEN}   ✅ 'Restaurantes' encontrado por busca ampla!")
-                            await asyncio.sleep(1)
+                            await self.readiness.dom_quieto(page)
                             return True
                     except:
                         continue
@@ -283,9 +321,9 @@ class CategoriesScraper:
             self.logger.info("Iniciando coleta de categorias")
             print(f"\n{Fore.CYAN}📂 Coletando categorias...")
             
-            # Aguardar página carregar completamente
-            await page.wait_for_load_state("networkidle")
-            await asyncio.sleep(3)
+            # Aguardar os banners de categoria aparecerem e pararem de chegar
+            if await self.readiness.seletor(page, ".small-banner-item"):
+                await self.readiness.contagem_estavel(page, ".small-banner-item")
             
             categorias_coletadas = []
             
@@ -474,22 +512,6 @@ class CategoriesScraper:
             
             return []
     
-    def _verificar_duplicata_categoria(self, conn, nome_categoria, link_categoria):
-        """Verificar se categoria já existe no banco"""
-        try:
-            # Verificar por nome (critério principal)
-            result = conn.execute("""
-                SELECT id FROM categories 
-                WHERE LOWER(TRIM(categorias)) = LOWER(TRIM(?))
-                LIMIT 1
-            """, [nome_categoria]).fetchone()
-            
-            return result is not None
-            
-        except Exception as e:
-            self.logger.debug(f"Erro ao verificar duplicata categoria: {str(e)}")
-            return False
-
     async def salvar_categorias_no_banco(self, categorias):
         """Salvar categorias coletadas no banco de dados (evitando duplicatas)"""
         try:
@@ -508,43 +530,26 @@ class CategoriesScraper:
                 )
             """)
             
+            # Chave de dedupe normalizada (nome + link) com índice único
+            garantir_chaves(conn, "categories")
+            
             categorias_salvas = 0
-            categorias_duplicadas = 0
             categorias_erros = 0
             
-            for i, cat in enumerate(categorias):
-                try:
-                    nome = cat["nome"]
-                    link = cat["link"]
-                    
-                    # NOVO: Verificar se já existe (anti-duplicatas)
-                    if self._verificar_duplicata_categoria(conn, nome, link):
-                        categorias_duplicadas += 1
-                        if categorias_duplicadas <= 3:  # Mostrar apenas os primeiros 3
-                            print(f"{Fore.YELLOW}   🔄 Duplicata: {nome} (já existe)")
-                        elif categorias_duplicadas == 4:
-                            print(f"{Fore.YELLOW}   🔄 ... (mais duplicatas encontradas)")
-                        continue
-                    
-                    # Obter próximo ID disponível
-                    result = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 as next_id FROM categories").fetchone()
-                    next_id = result[0]
-                    
-                    # Inserir nova categoria
-                    conn.execute("""
-                        INSERT INTO categories (id, categorias, links, created_at) 
-                        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-                    """, [next_id, nome, link])
-                    
-                    categorias_salvas += 1
-                    self.logger.debug(f"Nova categoria salva: {nome}")
-                    
-                except Exception as e:
-                    categorias_erros += 1
-                    self.logger.error(f"Erro ao salvar categoria {cat.get('nome', 'N/A')}: {str(e)}")
+            # Staging + anti-join pela chave + ids da SEQUENCE: um INSERT ... SELECT para o lote inteiro
+            def gravar():
+                carregar_staging(conn, "stg_categories", "categories", ["categorias", "links"],
+                                 [[cat["nome"], cat["link"]] for cat in categorias])
+                return inserir_novos(conn, "categories", "stg_categories", ["categorias", "links"])
+            
+            try:
+                categorias_salvas = em_transacao(conn, "categories", gravar)
+            except Exception as e:
+                categorias_erros = len(categorias)
+                self.logger.error(f"Erro ao salvar lote de categorias: {str(e)}")
             
-            conn.commit()
             conn.close()
+            categorias_duplicadas = len(categorias) - categorias_salvas - categorias_erros
             
             # Relatório final detalhado
             total_processadas = len(categorias)
@@ -592,12 +597,14 @@ class CategoriesScraper:
     async def executar_scraping(self):
         """Executar o processo de scraping"""
         tempo_inicio = time.time()
+        self.resource_blocker.resetar()
         
         async with async_playwright() as p:
             # Configurar navegador
             self.logger.info("Iniciando navegador")
             print(f"\n{Fore.CYAN}🌐 Iniciando navegador...")
             
+            await self.proxy_pool.preparar()
             browser = await p.chromium.launch(
                 headless=False,  # False para ver o processo
                 args=[
@@ -606,14 +613,13 @@ class CategoriesScraper:
                     '--disable-blink-features=AutomationControlled',
                     '--disable-web-security',
                     '--disable-features=VizDisplayCompositor'
-                ]
+                ],
+                **self.proxy_pool.opcoes_launch()
             )
             
-            context = await browser.new_context(
-                viewport={'width': 1280, 'height': 720},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            context = await self.context_factory.novo_contexto(
+                browser, self.cidade_busca,
                 extra_http_headers={
-                    'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
                     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
                 }
             )
@@ -632,14 +638,11 @@ class CategoriesScraper:
                 self.logger.info(f"Acessando {self.base_url}")
                 print(f"{Fore.CYAN}🔗 Acessando iFood (otimizado)...")
                 
-                await page.goto(self.base_url, wait_until=self.config_otimizado['wait_until'], timeout=30000)
+                await self.retry_policy.navegar(page, self.base_url, wait_until=self.config_otimizado['wait_until'])
                 self.logger.info("Página carregada com sucesso (otimizado)")
                 
-                # Aguardar menos tempo (otimizado)
-                await asyncio.sleep(2)
-                
-                # Preencher localização
-                if await self.preencher_localizacao(page):
+                # Preencher localização (ou reaproveitar a sessão salva da cidade)
+                if await self.configurar_localizacao(page, context):
                     # Coletar categorias
                     categorias = await self.coletar_categorias(page)
                     
@@ -681,4 +684,7 @@ class CategoriesScraper:
             finally:
                 await browser.close()
                 print(f"\n{Fore.CYAN}🔒 Navegador fechado")
+                self.resource_blocker.exibir_relatorio()
+                self.context_factory.exibir_relatorio()
+                self.retry_policy.exibir_relatorio()
                 input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
\ No newline at end of file
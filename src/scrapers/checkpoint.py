@@ -0,0 +1,237 @@
+"""
+Checkpoint de execuções longas: tarefas concluídas, cursor e resultados parciais persistidos a cada N registros
+"""
+import json
+import uuid
+from collections import Counter
+from datetime import datetime
+from colorama import Fore
+from src.utils.logger import get_logger
+from src.config.config_manager import ConfigManager
+from src.database.db_manager import DatabaseManager
+
+STATUS_ANDAMENTO = "em_andamento"
+STATUS_CONCLUIDO = "concluido"
+STATUS_INTERROMPIDO = "interrompido"
+
+
+def _garantir_tabelas(conn):
+    """Criar as tabelas de execuções e de tarefas concluídas (se não existirem)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS scraping_runs (
+            run_id VARCHAR PRIMARY KEY,
+            tipo VARCHAR NOT NULL,
+            status VARCHAR NOT NULL,
+            chave VARCHAR NOT NULL,
+            tarefas VARCHAR NOT NULL,
+            parametros VARCHAR,
+            total INTEGER,
+            concluidas INTEGER DEFAULT 0,
+            registros INTEGER DEFAULT 0,
+            cursor VARCHAR,
+            iniciado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS scraping_checkpoints (
+            run_id VARCHAR NOT NULL,
+            tarefa_id VARCHAR NOT NULL,
+            registros INTEGER,
+            concluido_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (run_id, tarefa_id)
+        )
+    """)
+
+
+class RunCheckpoint:
+    """Uma execução de scraping retomável: a lista de tarefas fica salva e cada tarefa concluída é registrada"""
+
+    def __init__(self, run_id, tipo, tarefas, chave, parametros=None, concluidas=None,
+                 ao_salvar=None, config_manager=None):
+        self.logger = get_logger()
+        self.config_manager = config_manager or ConfigManager()
+        self.db_manager = DatabaseManager()
+        self.intervalo = max(1, int(self.config_manager.get_checkpoint_interval()))
+
+        self.run_id = run_id
+        self.tipo = tipo
+        self.tarefas = tarefas
+        self.chave = chave
+        self.parametros = parametros or {}
+        self.concluidas = set(concluidas or ())
+        self.ao_salvar = ao_salvar
+
+        # Resultados e tarefas ainda não gravados (perdidos no máximo N registros em uma queda)
+        self._resultados = []
+        self._tarefas_buffer = []
+        self._registros_buffer = 0
+        self.registros = 0
+        self.contadores = Counter()
+
+    @classmethod
+    def abrir(cls, tipo, tarefas, chave, run_id=None, **kwargs):
+        """Retomar run_id (se informado) ou iniciar uma nova execução com as tarefas"""
+        if run_id:
+            return cls.retomar(run_id, **kwargs)
+        return cls.iniciar(tipo, tarefas, chave, **kwargs)
+
+    @classmethod
+    def iniciar(cls, tipo, tarefas, chave, parametros=None, ao_salvar=None, config_manager=None):
+        """Registrar uma nova execução com a lista completa de tarefas"""
+        run_id = f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+        checkpoint = cls(run_id, tipo, tarefas, chave, parametros, ao_salvar=ao_salvar, config_manager=config_manager)
+
+        conn = checkpoint.db_manager._get_connection()
+        try:
+            _garantir_tabelas(conn)
+            conn.execute("""
+                INSERT INTO scraping_runs (run_id, tipo, status, chave, tarefas, parametros, total)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [run_id, tipo, STATUS_ANDAMENTO, chave, json.dumps(tarefas, ensure_ascii=False, default=str),
+                  json.dumps(checkpoint.parametros, ensure_ascii=False, default=str), len(tarefas)])
+            conn.commit()
+        finally:
+            conn.close()
+
+        print(f"{Fore.CYAN}🧷 Execução {run_id} ({len(tarefas)} tarefas) - retomar com: python main.py --resume {run_id}")
+        return checkpoint
+
+    @classmethod
+    def retomar(cls, run_id, ao_salvar=None, config_manager=None, **_):
+        """Carregar a execução salva; as tarefas já concluídas ficam fora de pendentes()"""
+        execucao = cls.carregar(run_id)
+        if execucao is None:
+            raise ValueError(f"Execução não encontrada: {run_id}")
+
+        checkpoint = cls(run_id, execucao["tipo"], execucao["tarefas"], execucao["chave"], execucao["parametros"],
+                         execucao["concluidas"], ao_salvar, config_manager)
+        checkpoint.registros = execucao["registros"]
+        checkpoint._atualizar_execucao(status=STATUS_ANDAMENTO)
+
+        print(f"{Fore.CYAN}🧷 Retomando {run_id}: {len(checkpoint.concluidas)}/{len(checkpoint.tarefas)} tarefas já concluídas"
+              f" (cursor: {execucao['cursor'] or 'início'})")
+        return checkpoint
+
+    @staticmethod
+    def carregar(run_id):
+        """Dados da execução (tipo, tarefas, parâmetros, ids concluídos...) ou None"""
+        conn = DatabaseManager()._get_connection()
+        try:
+            _garantir_tabelas(conn)
+            linha = conn.execute("""
+                SELECT tipo, status, chave, tarefas, parametros, registros, cursor
+                FROM scraping_runs WHERE run_id = ?
+            """, [run_id]).fetchone()
+            if not linha:
+                return None
+            concluidas = conn.execute(
+                "SELECT tarefa_id FROM scraping_checkpoints WHERE run_id = ?", [run_id]
+            ).fetchall()
+        finally:
+            conn.close()
+
+        tipo, status, chave, tarefas, parametros, registros, cursor = linha
+        return {
+            "run_id": run_id, "tipo": tipo, "status": status, "chave": chave,
+            "tarefas": json.loads(tarefas), "parametros": json.loads(parametros or "{}"),
+            "registros": registros or 0, "cursor": cursor,
+            "concluidas": {tarefa_id for (tarefa_id,) in concluidas}
+        }
+
+    @staticmethod
+    def listar(limite=10):
+        """Execuções mais recentes: (run_id, tipo, status, concluidas, total, atualizado_em)"""
+        conn = DatabaseManager()._get_connection()
+        try:
+            _garantir_tabelas(conn)
+            return conn.execute("""
+                SELECT run_id, tipo, status, concluidas, total, atualizado_em
+                FROM scraping_runs ORDER BY atualizado_em DESC LIMIT ?
+            """, [limite]).fetchall()
+        finally:
+            conn.close()
+
+    def _id(self, tarefa):
+        return str(tarefa[self.chave])
+
+    def pendentes(self):
+        """Tarefas ainda não concluídas, na ordem original"""
+        return [tarefa for tarefa in self.tarefas if self._id(tarefa) not in self.concluidas]
+
+    def concluir(self, tarefa, resultados=None, registros=None):
+        """Marcar a tarefa como concluída (com seus resultados, se ainda não salvos); grava a cada N registros"""
+        registros = len(resultados or []) if registros is None else registros
+        tarefa_id = self._id(tarefa)
+
+        self.concluidas.add(tarefa_id)
+        self._tarefas_buffer.append((tarefa_id, registros))
+        self._registros_buffer += registros
+        if resultados:
+            self._resultados.extend(resultados)
+
+        # Tarefas sem registros também contam, para não refazer N tarefas vazias após uma queda
+        if self._registros_buffer >= self.intervalo or len(self._tarefas_buffer) >= self.intervalo:
+            self.salvar()
+
+    def salvar(self):
+        """Gravar resultados pendentes (ao_salvar) e depois marcar as tarefas concluídas"""
+        if not self._tarefas_buffer:
+            return
+
+        # Resultados primeiro: uma queda entre os dois passos só faz a tarefa ser refeita (duplicatas são filtradas)
+        if self._resultados and self.ao_salvar:
+            try:
+                self.contadores.update(self.ao_salvar(self._resultados) or {})
+            except Exception:
+                # Lote não gravado: as tarefas voltam a pendentes (refeitas ao retomar)
+                self.contadores["erros"] += len(self._resultados)
+                self.concluidas.difference_update(tarefa_id for tarefa_id, _ in self._tarefas_buffer)
+                self._resultados = []
+                self._tarefas_buffer = []
+                self._registros_buffer = 0
+                raise
+
+        self.registros += self._registros_buffer
+        conn = self.db_manager._get_connection()
+        try:
+            _garantir_tabelas(conn)
+            conn.executemany("""
+                INSERT OR REPLACE INTO scraping_checkpoints (run_id, tarefa_id, registros, concluido_em)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            """, [[self.run_id, tarefa_id, registros] for tarefa_id, registros in self._tarefas_buffer])
+            conn.commit()
+        finally:
+            conn.close()
+        self._atualizar_execucao(cursor=self._tarefas_buffer[-1][0])
+
+        print(f"{Fore.BLUE}   🧷 Checkpoint: {len(self.concluidas)}/{len(self.tarefas)} tarefas, "
+              f"{self.registros} registros")
+        self._resultados = []
+        self._tarefas_buffer = []
+        self._registros_buffer = 0
+
+    def _atualizar_execucao(self, status=None, cursor=None):
+        conn = self.db_manager._get_connection()
+        try:
+            conn.execute("""
+                UPDATE scraping_runs
+                SET status = COALESCE(?, status), cursor = COALESCE(?, cursor),
+                    concluidas = ?, registros = ?, atualizado_em = CURRENT_TIMESTAMP
+                WHERE run_id = ?
+            """, [status, cursor, len(self.concluidas), self.registros, self.run_id])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def finalizar(self):
+        """Gravar o que restou; a execução fica concluída ou interrompida (retomável)"""
+        try:
+            self.salvar()
+        except Exception as e:
+            self.logger.error(f"Erro ao gravar checkpoint final de {self.run_id}: {str(e)}")
+
+        restantes = len(self.tarefas) - len(self.concluidas)
+        self._atualizar_execucao(status=STATUS_CONCLUIDO if not restantes else STATUS_INTERROMPIDO)
+        if restantes:
+            print(f"{Fore.YELLOW}🧷 {restantes} tarefas pendentes - retomar com: python main.py --resume {self.run_id}")
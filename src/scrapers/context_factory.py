@@ -0,0 +1,134 @@
+"""
+Fábrica de contextos do navegador: identidade (user agent, viewport, locale, fuso) rotacionada por contexto
+"""
+import itertools
+import random
+from collections import Counter, defaultdict
+from colorama import Fore
+from src.utils.logger import get_logger
+from src.config.config_manager import ConfigManager
+
+class ContextFactory:
+    """Cria contextos com identidades distintas entre si e registra quais requisições cada identidade serviu"""
+
+    # Respostas que indicam limitação/bloqueio da identidade
+    STATUS_BLOQUEIO = {403, 429}
+    # Requisições cujo resultado é atribuído ao proxy do contexto (imagens/fontes bloqueadas ficam de fora)
+    TIPOS_PROXY = {"document", "xhr", "fetch"}
+
+    def __init__(self, config_manager=None, resource_blocker=None, session_cache=None, proxy_pool=None):
+        self.logger = get_logger()
+        self.config_manager = config_manager or ConfigManager()
+        config = self.config_manager.get_fingerprint_config()
+
+        self.resource_blocker = resource_blocker
+        self.session_cache = session_cache
+        self.proxy_pool = proxy_pool
+
+        self.rotacao = config.get("rotation", "random")  # random, sequential
+        viewports = [{"width": largura, "height": altura} for largura, altura in config.get("viewports", [[1280, 720]])]
+        self.identidades = [
+            {"id": f"id{indice}", "user_agent": user_agent, "viewport": viewport, "locale": locale, "timezone_id": fuso}
+            for indice, (user_agent, viewport, locale, fuso) in enumerate(itertools.product(
+                self.config_manager.get_user_agents(),
+                viewports,
+                config.get("locales", ["pt-BR"]),
+                config.get("timezones", ["America/Sao_Paulo"])
+            ), 1)
+        ]
+        random.shuffle(self.identidades)
+        self._ciclo = itertools.cycle(self.identidades)
+        self._em_uso = Counter()
+        self.stats = defaultdict(Counter)
+
+    def escolher_identidade(self):
+        """Identidade para um novo contexto, evitando as que já estão em uso por contextos abertos"""
+        menos_usada = min(self._em_uso[identidade["id"]] for identidade in self.identidades)
+        livres = [identidade for identidade in self.identidades if self._em_uso[identidade["id"]] == menos_usada]
+
+        if self.rotacao == "sequential":
+            ids_livres = {identidade["id"] for identidade in livres}
+            return next(identidade for identidade in self._ciclo if identidade["id"] in ids_livres)
+        return random.choice(livres)
+
+    async def novo_contexto(self, browser, cidade=None, **opcoes):
+        """Criar contexto com identidade rotacionada + bloqueio de recursos, sessão da cidade e proxy"""
+        identidade = self.escolher_identidade()
+
+        extras = {}
+        if self.resource_blocker:
+            extras.update(self.resource_blocker.opcoes_contexto())
+        if self.session_cache and cidade:
+            extras.update(self.session_cache.opcoes_contexto(cidade))
+        proxy = self.proxy_pool.escolher() if self.proxy_pool else None
+        if proxy:
+            extras.update(self.proxy_pool.opcoes_contexto(proxy))
+        extras.update(opcoes)
+
+        context = await browser.new_context(
+            user_agent=identidade["user_agent"],
+            viewport=identidade["viewport"],
+            locale=identidade["locale"],
+            timezone_id=identidade["timezone_id"],
+            **extras
+        )
+        if self.resource_blocker:
+            await self.resource_blocker.aplicar(context)
+
+        self._em_uso[identidade["id"]] += 1
+        context.on("close", lambda _: self._liberar(identidade))
+        context.on("response", lambda response: self._registrar(identidade, response, proxy))
+        if proxy:
+            context.on("requestfailed", lambda request: self._registrar_falha_proxy(proxy, request))
+
+        self.logger.info(f"Contexto com identidade {identidade['id']}: {self.descrever(identidade)}")
+        return context
+
+    def _liberar(self, identidade):
+        self._em_uso[identidade["id"]] -= 1
+
+    def _registrar(self, identidade, response, proxy=None):
+        """Contabilizar a resposta na identidade que a recebeu (e no proxy do contexto: bloqueios e latência
+        das páginas, para a quarentena valer também no navegador)"""
+        try:
+            stats = self.stats[identidade["id"]]
+            stats["requisicoes"] += 1
+            if response.status in self.STATUS_BLOQUEIO:
+                stats["bloqueios"] += 1
+                self.logger.warning(f"[{identidade['id']}] HTTP {response.status} em {response.url[:90]}")
+            tipo = response.request.resource_type
+            if tipo in self.TIPOS_PROXY:
+                self.logger.debug(f"[{identidade['id']}] {response.status} {response.url[:120]}")
+                if proxy:
+                    inicio_resposta = response.request.timing.get("responseStart", -1)
+                    latencia_s = inicio_resposta / 1000 if tipo == "document" and inicio_resposta >= 0 else None
+                    self.proxy_pool.registrar_resposta(proxy, response.status, latencia_s)
+        except Exception:
+            pass
+
+    def _registrar_falha_proxy(self, proxy, request):
+        """Falha de rede de uma página/API pelo proxy (conexão recusada, timeout...); navegação cancelada não conta"""
+        try:
+            motivo = request.failure or ""
+            if request.resource_type in self.TIPOS_PROXY and "ERR_ABORTED" not in motivo:
+                self.proxy_pool.registrar_falha(proxy, motivo or "requestfailed")
+        except Exception:
+            pass
+
+    @staticmethod
+    def descrever(identidade):
+        """Resumo legível da identidade"""
+        navegador = identidade["user_agent"].split("(")[1].split(")")[0] if "(" in identidade["user_agent"] else identidade["user_agent"]
+        return (f"{navegador[:40]} | {identidade['viewport']['width']}x{identidade['viewport']['height']} | "
+                f"{identidade['locale']} | {identidade['timezone_id']}")
+
+    def exibir_relatorio(self):
+        """Requisições e bloqueios por identidade"""
+        if not self.stats:
+            return
+        por_id = {identidade["id"]: identidade for identidade in self.identidades}
+        print(f"\n{Fore.CYAN}🪪 IDENTIDADES ({len(self.stats)} usadas de {len(self.identidades)}):")
+        for identidade_id, stats in sorted(self.stats.items(), key=lambda item: -item[1]["requisicoes"]):
+            cor = Fore.RED if stats["bloqueios"] else Fore.WHITE
+            print(f"{cor}   • {identidade_id}: {stats['requisicoes']} respostas, {stats['bloqueios']} bloqueios | "
+                  f"{self.descrever(por_id[identidade_id])}")
@@ -0,0 +1,183 @@
+"""
+Agendador de coleta por frescor: prioriza os restaurantes com maior chance de terem mudado, dentro de um orçamento
+"""
+import math
+from colorama import Fore
+from src.utils.logger import get_logger
+from src.config.config_manager import ConfigManager
+from src.database.db_manager import DatabaseManager
+from src.utils.display_formatter import DisplayFormatter
+from src.utils.content_hash import hash_conjunto
+
+# Tabela de onde sai a última coleta de quem ainda não tem histórico
+ULTIMA_COLETA_LEGADA = {
+    "produtos": "SELECT restaurant_id, MAX(scraped_at) FROM products GROUP BY restaurant_id",
+    "info_extra": "SELECT id, scraped_at FROM restaurants WHERE reviews IS NOT NULL OR min_order IS NOT NULL"
+}
+
+
+def _garantir_tabela(conn):
+    """Histórico de coletas: quando cada restaurante foi coletado, assinatura do conteúdo e se mudou"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_history (
+            restaurant_id INTEGER NOT NULL,
+            tipo VARCHAR NOT NULL,
+            coletado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            assinatura VARCHAR,
+            mudou BOOLEAN,
+            duracao_s DOUBLE
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_crawl_history_restaurante ON crawl_history(tipo, restaurant_id)")
+
+
+class CrawlScheduler:
+    """Idade da última coleta x frequência de mudança aprendida = prioridade; TTL e orçamento cortam a lista"""
+
+    def __init__(self, config_manager=None):
+        self.logger = get_logger()
+        self.config_manager = config_manager or ConfigManager()
+        self.db_manager = DatabaseManager()
+        config = self.config_manager.get_scheduler_config()
+
+        self.habilitado = config.get("enabled", True)
+        self.ttl_horas = config.get("ttl_hours", 24)
+        self.max_requisicoes = config.get("max_requests", 0)  # 0 = sem limite
+        self.max_minutos = config.get("max_minutes", 0)  # 0 = sem limite
+        self.segundos_padrao = config.get("seconds_per_restaurant", 10)
+        # Prior das mudanças/dia para quem tem pouco histórico (equivale a `prior_weight_days` dias observados)
+        self.taxa_prior = config.get("prior_changes_per_day", 0.5)
+        self.peso_prior = config.get("prior_weight_days", 2)
+
+        self._pendentes = []
+
+    def _historico(self, conn, tipo):
+        """Por restaurante: última coleta, primeira coleta, mudanças observadas e duração média"""
+        _garantir_tabela(conn)
+        linhas = conn.execute("""
+            SELECT restaurant_id, MAX(coletado_em), MIN(coletado_em), COUNT(*) FILTER (WHERE mudou), AVG(duracao_s)
+            FROM crawl_history WHERE tipo = ? GROUP BY restaurant_id
+        """, [tipo]).fetchall()
+        historico = {linha[0]: linha[1:] for linha in linhas}
+
+        # Restaurantes coletados antes do histórico existir: só a data da última coleta
+        consulta = ULTIMA_COLETA_LEGADA.get(tipo)
+        if consulta:
+            try:
+                for restaurant_id, ultima in conn.execute(consulta).fetchall():
+                    if restaurant_id not in historico and ultima is not None:
+                        historico[restaurant_id] = (ultima, ultima, 0, None)
+            except Exception as e:
+                self.logger.debug(f"Sem data de coleta legada para {tipo}: {str(e)}")
+        return historico
+
+    def taxa_mudanca(self, mudancas, dias_observados):
+        """Mudanças por dia estimadas (média suavizada pelo prior)"""
+        return (mudancas + self.taxa_prior * self.peso_prior) / (dias_observados + self.peso_prior)
+
+    @staticmethod
+    def prioridade(taxa_dia, idade_horas):
+        """Probabilidade de ter mudado desde a última coleta (mudanças como processo de Poisson)"""
+        return 1 - math.exp(-taxa_dia * idade_horas / 24)
+
+    def planejar(self, restaurantes, tipo):
+        """Lista de coleta ordenada por prioridade, sem os frescos (TTL) e limitada ao orçamento"""
+        if not self.habilitado or not restaurantes:
+            return restaurantes
+
+        conn = self.db_manager._get_connection()
+        try:
+            historico = self._historico(conn, tipo)
+            # Mesmo relógio do CURRENT_TIMESTAMP que preenche scraped_at/coletado_em
+            agora = conn.execute("SELECT CURRENT_TIMESTAMP::TIMESTAMP").fetchone()[0]
+        finally:
+            conn.close()
+
+        candidatos = []
+        frescos = 0
+        duracoes = []
+        for restaurante in restaurantes:
+            dados = historico.get(restaurante['id'])
+            if dados is None:
+                # Nunca coletado: prioridade máxima
+                candidatos.append((1.0, restaurante))
+                continue
+
+            ultima, primeira, mudancas, duracao = dados
+            idade_horas = (agora - ultima).total_seconds() / 3600
+            if idade_horas < self.ttl_horas:
+                frescos += 1
+                continue
+
+            if duracao:
+                duracoes.append(duracao)
+            taxa = self.taxa_mudanca(mudancas, (ultima - primeira).total_seconds() / 86400)
+            candidatos.append((self.prioridade(taxa, idade_horas), restaurante))
+
+        candidatos.sort(key=lambda item: -item[0])
+
+        # Orçamento: número de requisições e/ou tempo (duração média aprendida das coletas anteriores)
+        limite = len(candidatos)
+        if self.max_requisicoes:
+            limite = min(limite, self.max_requisicoes)
+        segundos = sum(duracoes) / len(duracoes) if duracoes else self.segundos_padrao
+        if self.max_minutos:
+            limite = min(limite, int(self.max_minutos * 60 / segundos))
+        plano = [restaurante for _, restaurante in candidatos[:limite]]
+
+        stats_data = {
+            'Restaurantes': len(restaurantes),
+            f'Frescos (< {self.ttl_horas}h)': frescos,
+            'Fora do orçamento': len(candidatos) - len(plano),
+            'Na fila': len(plano),
+            'Prioridade máx/mín': f"{candidatos[0][0]:.2f}/{candidatos[len(plano) - 1][0]:.2f}" if plano else '-',
+            'Tempo estimado': f"{len(plano) * segundos / 60:.0f}min"
+        }
+        print(f"\n{Fore.CYAN}🕒 PLANO DE COLETA ({tipo}):")
+        print(DisplayFormatter.stats_table(stats_data))
+        if not plano:
+            print(f"{Fore.GREEN}✅ Nada a coletar: todos os restaurantes foram coletados há menos de {self.ttl_horas}h")
+        self.logger.info(f"Plano de coleta {tipo}: {len(plano)}/{len(restaurantes)} restaurantes "
+                         f"({frescos} frescos, {len(candidatos) - len(plano)} fora do orçamento)")
+        return plano
+
+    def registrar(self, tipo, restaurant_id, valores, duracao_s=None):
+        """Anotar uma coleta concluída (gravada em lote por gravar())"""
+        self._pendentes.append((tipo, restaurant_id, hash_conjunto(valores), duracao_s))
+
+    def gravar(self):
+        """Gravar o histórico pendente comparando a assinatura com a última de cada restaurante"""
+        if not self._pendentes:
+            return
+
+        conn = self.db_manager._get_connection()
+        try:
+            _garantir_tabela(conn)
+            ultimas = {
+                (tipo, restaurant_id): anterior
+                for tipo, restaurant_id, anterior in conn.execute("""
+                    SELECT tipo, restaurant_id, arg_max(assinatura, coletado_em)
+                    FROM crawl_history GROUP BY tipo, restaurant_id
+                """).fetchall()
+            }
+
+            linhas = []
+            for tipo, restaurant_id, atual, duracao_s in self._pendentes:
+                anterior = ultimas.get((tipo, restaurant_id))
+                # Primeira coleta não conta como mudança (não há com o que comparar)
+                linhas.append([restaurant_id, tipo, atual, anterior is not None and anterior != atual, duracao_s])
+                ultimas[(tipo, restaurant_id)] = atual
+
+            conn.executemany("""
+                INSERT INTO crawl_history (restaurant_id, tipo, coletado_em, assinatura, mudou, duracao_s)
+                VALUES (?, ?, CURRENT_TIMESTAMP, ?, ?, ?)
+            """, linhas)
+            conn.commit()
+
+            mudaram = sum(1 for linha in linhas if linha[3])
+            print(f"{Fore.BLUE}   🕒 Histórico de coleta: {len(linhas)} restaurantes, {mudaram} com mudanças")
+            self._pendentes = []
+        except Exception as e:
+            self.logger.error(f"Erro ao gravar histórico de coleta: {str(e)}")
+        finally:
+            conn.close()
@@ -0,0 +1,232 @@
+"""
+Cache de dedupe por execução: chaves já gravadas carregadas uma vez e consultadas em memória, para que só
+registros novos ou alterados cheguem ao banco
+"""
+import hashlib
+import math
+import os
+import sys
+import time
+from collections import Counter
+import numpy as np
+from colorama import Fore
+from src.utils.logger import get_logger
+from src.config.config_manager import ConfigManager
+from src.database.dedupe_keys import normalizar_chave
+
+
+class FiltroBloom:
+    """Conjunto aproximado em bits (numpy): sem falsos negativos, falsos positivos na taxa configurada
+    (quem usa confirma os positivos no banco)"""
+
+    def __init__(self, capacidade, taxa_falsos_positivos, semente=None):
+        capacidade = max(1, int(capacidade))
+        self.tamanho = max(8, math.ceil(-capacidade * math.log(taxa_falsos_positivos) / math.log(2) ** 2))
+        self.funcoes = max(1, round(self.tamanho / capacidade * math.log(2)))
+        self.semente = semente if semente is not None else os.urandom(16)
+        self.bits = np.zeros((self.tamanho + 7) // 8, dtype=np.uint8)
+        self.quantidade = 0
+
+    def _posicoes(self, chaves):
+        """k posições por chave por hashing duplo (h1 + i*h2) sobre um blake2b de 128 bits"""
+        digests = b"".join(hashlib.blake2b(chave.encode(), digest_size=16, key=self.semente).digest()
+                           for chave in chaves)
+        h1, h2 = np.frombuffer(digests, dtype=np.uint64).reshape(-1, 2).T
+        passos = np.arange(self.funcoes, dtype=np.uint64)
+        return (h1[:, None] + passos * (h2[:, None] | np.uint64(1))) % np.uint64(self.tamanho)
+
+    def adicionar(self, chaves):
+        chaves = list(chaves)
+        if not chaves:
+            return
+        posicoes = self._posicoes(chaves).ravel()
+        mascaras = np.left_shift(1, posicoes & np.uint64(7)).astype(np.uint8)
+        np.bitwise_or.at(self.bits, posicoes >> np.uint64(3), mascaras)
+        self.quantidade += len(chaves)
+
+    def contem(self, chaves):
+        """Array booleano: True = talvez já gravado, False = certamente novo"""
+        chaves = list(chaves)
+        if not chaves:
+            return np.zeros(0, dtype=bool)
+        posicoes = self._posicoes(chaves)
+        bits = (self.bits[posicoes >> np.uint64(3)] >> (posicoes & np.uint64(7)).astype(np.uint8)) & 1
+        return bits.all(axis=1)
+
+    def __len__(self):
+        return self.quantidade
+
+    @property
+    def bytes(self):
+        return self.bits.nbytes
+
+
+class DedupeCache:
+    """Restaurantes da cidade (chave -> id e hash do card), hash do cardápio por restaurante e assinaturas dos
+    produtos gravados (conjunto exato, ou filtro de Bloom a partir de bloom_min_keys produtos)"""
+
+    def __init__(self, config_manager=None):
+        self.logger = get_logger()
+        self.config_manager = config_manager or ConfigManager()
+        config = self.config_manager.get_dedupe_cache_config()
+
+        self.habilitado = config.get("enabled", True)
+        self.bloom_min_chaves = config.get("bloom_min_keys", 2_000_000)
+        self.taxa_falsos_positivos = config.get("false_positive_rate", 0.001)
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descartar o que foi carregado (nova execução: o banco pode ter mudado por fora)"""
+        self._restaurantes = {}
+        self._menus = None
+        self._produtos = None
+        self.stats = Counter()
+
+    def restaurantes(self, conn, cidade):
+        """name_key -> (id, content_hash) dos restaurantes da cidade (carregado na primeira chamada da execução)"""
+        cidade_key = normalizar_chave(cidade)
+        if self.habilitado and cidade_key in self._restaurantes:
+            self.stats["consultas_evitadas"] += 1
+            return self._restaurantes[cidade_key]
+
+        existentes = self._ler_restaurantes(conn, cidade_key)
+        if self.habilitado:
+            self._restaurantes[cidade_key] = existentes
+            print(f"{Fore.BLUE}   🧠 Cache de dedupe: {len(existentes)} restaurantes de {cidade} em memória")
+        return existentes
+
+    def atualizar_restaurantes(self, conn, cidade, chaves):
+        """Reler só as chaves gravadas no lote (ids dos novos e hashes dos atualizados)"""
+        cidade_key = normalizar_chave(cidade)
+        if self.habilitado and chaves and cidade_key in self._restaurantes:
+            self._restaurantes[cidade_key].update(self._ler_restaurantes(conn, cidade_key, list(chaves)))
+
+    @staticmethod
+    def _ler_restaurantes(conn, cidade_key, chaves=None):
+        filtro = " AND list_contains(?, name_key)" if chaves is not None else ""
+        parametros = [cidade_key] + ([chaves] if chaves is not None else [])
+        return {
+            nome: (restaurant_id, content_hash)
+            for restaurant_id, nome, content_hash in conn.execute(
+                f"SELECT id, name_key, content_hash FROM restaurants WHERE city_key = ?{filtro}", parametros
+            ).fetchall()
+        }
+
+    @staticmethod
+    def assinatura_produto(restaurant_id, nome, categoria, content_hash):
+        """Mesma composição de _carregar_produtos (colunas de chave + hash do conteúdo)"""
+        return f"{restaurant_id}|{normalizar_chave(nome)}|{normalizar_chave(categoria)}|{content_hash}"
+
+    def menus(self, conn, ids):
+        """restaurant_id -> menu_hash (todos os restaurantes, carregado uma vez por execução)"""
+        if not self.habilitado:
+            return dict(conn.execute(
+                "SELECT id, menu_hash FROM restaurants WHERE list_contains(?, id)", [list(ids)]
+            ).fetchall())
+        if self._menus is None:
+            self._menus = dict(conn.execute(
+                "SELECT id, menu_hash FROM restaurants WHERE menu_hash IS NOT NULL"
+            ).fetchall())
+        else:
+            self.stats["consultas_evitadas"] += 1
+        return self._menus
+
+    def _carregar_produtos(self, conn):
+        """Assinaturas de todos os produtos com chave: conjunto exato ou, em tabelas grandes, filtro de Bloom"""
+        inicio = time.perf_counter()
+        total = conn.execute("SELECT COUNT(*) FROM products WHERE name_key IS NOT NULL").fetchone()[0]
+        assinaturas = (linha[0] for linha in conn.execute("""
+            SELECT concat_ws('|', restaurant_id, name_key, category_key, content_hash)
+            FROM products WHERE name_key IS NOT NULL AND content_hash IS NOT NULL
+        """).fetchall())
+
+        if total >= self.bloom_min_chaves:
+            # Folga para os produtos novos desta execução sem estourar a taxa de falsos positivos
+            self._produtos = FiltroBloom(total * 1.5, self.taxa_falsos_positivos)
+            self._produtos.adicionar(assinaturas)
+            descricao = (f"filtro de Bloom ({self._produtos.bytes / 1024 / 1024:.1f}MB, "
+                         f"{self.taxa_falsos_positivos:.2%} de falsos positivos)")
+        else:
+            self._produtos = set(assinaturas)
+            descricao = "conjunto exato"
+        print(f"{Fore.BLUE}   🧠 Cache de dedupe: {len(self._produtos)} produtos em memória, {descricao}, "
+              f"{time.perf_counter() - inicio:.1f}s")
+
+    def filtrar_produtos(self, conn, assinaturas):
+        """Máscara dos candidatos (True = novo ou alterado, vai ao banco); sem cache, todos são candidatos"""
+        if not self.habilitado:
+            return [True] * len(assinaturas)
+        if self._produtos is None:
+            self._carregar_produtos(conn)
+
+        if isinstance(self._produtos, FiltroBloom):
+            candidatos = (~self._produtos.contem(assinaturas)).tolist()
+            # Bloom só garante o "não": os "talvez já gravado" são confirmados no banco numa consulta por lote
+            # (um falso positivo pulado aqui ficaria perdido, já que o menu_hash novo é gravado em seguida)
+            talvez = [assinatura for assinatura, novo in zip(assinaturas, candidatos) if not novo]
+            confirmadas = self._confirmar_produtos(conn, talvez)
+            candidatos = [novo or assinatura not in confirmadas for assinatura, novo in zip(assinaturas, candidatos)]
+            self.stats["falsos_positivos"] += len(talvez) - sum(1 for a in talvez if a in confirmadas)
+        else:
+            candidatos = [assinatura not in self._produtos for assinatura in assinaturas]
+        self.stats["produtos_filtrados"] += len(candidatos) - sum(candidatos)
+        return candidatos
+
+    @staticmethod
+    def _confirmar_produtos(conn, assinaturas):
+        """Assinaturas que de fato estão gravadas em products (mesma composição de _carregar_produtos)"""
+        if not assinaturas:
+            return set()
+        restaurantes = sorted({int(assinatura.split("|", 1)[0]) for assinatura in assinaturas})
+        return {linha[0] for linha in conn.execute("""
+            SELECT assinatura FROM (
+                SELECT concat_ws('|', restaurant_id, name_key, category_key, content_hash) AS assinatura
+                FROM products WHERE list_contains(?, restaurant_id)
+            ) WHERE list_contains(?, assinatura)
+        """, [restaurantes, list(assinaturas)]).fetchall()}
+
+    def registrar_produtos(self, restaurantes_menus, assinaturas):
+        """Depois de gravar: novos hashes de cardápio e assinaturas dos produtos enviados ao banco"""
+        if not self.habilitado:
+            return
+        if self._menus is not None:
+            self._menus.update(restaurantes_menus)
+        if isinstance(self._produtos, FiltroBloom):
+            self._produtos.adicionar(assinaturas)
+        elif self._produtos is not None:
+            self._produtos.update(assinaturas)
+
+
+def comparar_dedupe(existentes=1_000_000, lote=10_000, taxa_falsos_positivos=0.001):
+    """Microbenchmark: dedupe em memória de um lote de produtos contra `existentes` assinaturas gravadas
+    (metade do lote já existe), em conjunto exato e em filtro de Bloom"""
+    assinatura = DedupeCache.assinatura_produto
+    gravadas = [assinatura(i // 100, f"Produto {i}", "Pratos", f"{i:016x}") for i in range(existentes)]
+    novos = lote - lote // 2
+    consultas = gravadas[:lote // 2] + [assinatura(-1, f"Novo {i}", "Pratos", "0") for i in range(novos)]
+
+    conjunto = set(gravadas)
+    inicio = time.perf_counter()
+    novos_conjunto = sum(assinatura not in conjunto for assinatura in consultas)
+    tempo_conjunto = time.perf_counter() - inicio
+
+    filtro = FiltroBloom(existentes, taxa_falsos_positivos)
+    filtro.adicionar(gravadas)
+    inicio = time.perf_counter()
+    novos_bloom = int((~filtro.contem(consultas)).sum())
+    tempo_bloom = time.perf_counter() - inicio
+
+    return {
+        "Assinaturas gravadas": f"{existentes:,}",
+        "Lote": f"{lote:,} ({novos} novos)",
+        "Tempo (conjunto)": f"{tempo_conjunto * 1000:.1f}ms",
+        "Tempo (Bloom)": f"{tempo_bloom * 1000:.1f}ms",
+        "Novos (conjunto/Bloom)": f"{novos_conjunto}/{novos_bloom}",
+        "Memória (conjunto/Bloom)": f"{sys.getsizeof(conjunto) / 2**20:.0f}MB+/{filtro.bytes / 2**20:.1f}MB"
+    }
+
+
+if __name__ == "__main__":
+    from src.utils.display_formatter import DisplayFormatter
+
+    print(DisplayFormatter.stats_table(comparar_dedupe()))
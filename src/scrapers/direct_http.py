@@ -0,0 +1,271 @@
+"""
+Modo HTTP direto: busca os JSON de catálogo/merchant com um cliente httpx assíncrono (sem navegador)
+"""
+import asyncio
+import json
+import random
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlsplit
+import httpx
+from colorama import Fore
+from playwright.async_api import async_playwright
+from src.utils.logger import get_logger
+from src.config.config_manager import ConfigManager
+from src.scrapers.session_cache import LocationSessionCache
+from src.scrapers.response_capture import ResponseCapture
+from src.scrapers.rate_limiter import obter_limitador
+from src.scrapers.retry_policy import obter_politica
+from src.scrapers.proxy_pool import obter_pool
+
+class DirectHttpFetcher:
+    """Cliente HTTP com pool (keep-alive), limite de concorrência, cookies da sessão localizada e proxies/UAs"""
+
+    # Cabeçalhos da requisição original que não devem ser repetidos (o cliente cuida deles)
+    CABECALHOS_IGNORADOS = {"cookie", "content-length", "host", "user-agent", "accept-encoding", "connection"}
+
+    PADRAO_MERCHANT_ID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)
+
+    def __init__(self, config_manager=None):
+        self.logger = get_logger()
+        self.config_manager = config_manager or ConfigManager()
+        config = self.config_manager.get_direct_http_config()
+
+        self.habilitado = config.get("enabled", False)
+        self.concorrencia = config.get("concurrency", 8)
+        self.max_conexoes = config.get("max_connections", 10)
+        self.arquivo_endpoints = Path(config.get("endpoints_file", "data/sessions/endpoints.json"))
+        self.endpoints_config = {tipo: url for tipo, url in config.get("endpoints", {}).items() if url}
+
+        self.timeout = self.config_manager.get_timeout()
+        self.user_agents = self.config_manager.get_user_agents()
+        self.proxy_pool = obter_pool(self.config_manager)
+
+        self.cidade = self.config_manager.get_default_city()
+        self.session_cache = LocationSessionCache(self.config_manager)
+        self.limitador = obter_limitador(self.config_manager)
+        self.retry_policy = obter_politica(self.config_manager)
+
+        self.endpoints = {}
+        self._clientes = {}
+        self._cookies_sessao = None
+        self._semaforo = None
+        self.stats = Counter()
+
+    @classmethod
+    def merchant_id(cls, restaurante):
+        """Extrair o id (UUID) do merchant do link salvo do restaurante"""
+        match = cls.PADRAO_MERCHANT_ID.search(restaurante.get("link") or "")
+        return match.group(0) if match else None
+
+    def carregar_endpoints(self):
+        """Templates de endpoint: configurados em settings.json ou descobertos anteriormente"""
+        endpoints = {}
+        try:
+            with open(self.arquivo_endpoints, 'r', encoding='utf-8') as f:
+                endpoints = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        # Endpoints fixos da configuração têm prioridade (ex.: servidor local de testes)
+        for tipo, url in self.endpoints_config.items():
+            endpoints[tipo] = {"url": url, "headers": {}}
+
+        self.endpoints = endpoints
+        return endpoints
+
+    def _salvar_endpoints(self, endpoints):
+        """Gravar templates descobertos"""
+        self.arquivo_endpoints.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.arquivo_endpoints, 'w', encoding='utf-8') as f:
+            json.dump(endpoints, f, ensure_ascii=False, indent=2)
+
+    def _templates_dos_payloads(self, payloads, merchant_id):
+        """Transformar as URLs capturadas em templates com {merchant_id}, classificando pelo conteúdo"""
+        endpoints = {}
+        for payload in payloads:
+            if merchant_id not in payload["url"]:
+                continue
+
+            captura = ResponseCapture.de_payloads([payload], self.config_manager)
+            if "catalogo" not in endpoints and captura.produtos(0, "", ""):
+                tipo = "catalogo"
+            elif "merchant" not in endpoints and captura.info_extra() != (None, None):
+                tipo = "merchant"
+            else:
+                continue
+
+            headers = {chave: valor for chave, valor in payload.get("headers", {}).items()
+                       if chave.lower() not in self.CABECALHOS_IGNORADOS and not chave.startswith(":")}
+            endpoints[tipo] = {"url": payload["url"].replace(merchant_id, "{merchant_id}"), "headers": headers}
+
+        return endpoints
+
+    async def descobrir(self, restaurante_exemplo):
+        """Configuração única no navegador: localizar (se preciso) e registrar os endpoints JSON do restaurante"""
+        # Import local: o scraper de restaurantes só é necessário nesta etapa
+        from src.scrapers.restaurants_scraper import RestaurantsScraper
+
+        merchant_id = self.merchant_id(restaurante_exemplo)
+        if not merchant_id:
+            print(f"{Fore.RED}   ❌ Link sem id de merchant: {restaurante_exemplo.get('link')}")
+            return {}
+
+        print(f"{Fore.CYAN}🔎 Descobrindo endpoints JSON a partir de {restaurante_exemplo['nome']}...")
+        scraper = RestaurantsScraper()
+
+        async with async_playwright() as p:
+            await self.proxy_pool.preparar()
+            browser = await p.chromium.launch(headless=False, args=['--no-sandbox', '--disable-setuid-sandbox'],
+                                              **self.proxy_pool.opcoes_launch())
+            try:
+                context = await scraper.context_factory.novo_contexto(browser, self.cidade)
+                page = await context.new_page()
+
+                # Garante cookies de localização (reaproveita a sessão salva quando válida)
+                if not await scraper.configurar_localizacao(page, context):
+                    return {}
+
+                captura = ResponseCapture(self.config_manager)
+                captura.anexar(page)
+                await self.retry_policy.goto(page, restaurante_exemplo["link"], wait_until="domcontentloaded")
+                await captura.aguardar(lambda: captura.produtos(0, "", ""))
+            finally:
+                await browser.close()
+
+        endpoints = self._templates_dos_payloads(captura.payloads, merchant_id)
+        if endpoints:
+            self._salvar_endpoints(endpoints)
+            for tipo, endpoint in endpoints.items():
+                print(f"{Fore.WHITE}   📡 {tipo}: {endpoint['url'][:90]}")
+        else:
+            print(f"{Fore.YELLOW}   ⚠️ Nenhum endpoint JSON reconhecido para {restaurante_exemplo['nome']}")
+
+        return endpoints
+
+    async def preparar(self, restaurantes, tipo):
+        """Garantir template do tipo pedido (descobrindo com o navegador uma única vez se necessário)"""
+        if tipo in self.carregar_endpoints():
+            return True
+
+        exemplo = next((r for r in restaurantes if self.merchant_id(r)), None)
+        if exemplo is None:
+            print(f"{Fore.YELLOW}⚠️ Nenhum restaurante com link válido para descobrir endpoints")
+            return False
+
+        descobertos = await self.descobrir(exemplo)
+        self.endpoints.update(descobertos)
+        return tipo in self.endpoints
+
+    def _cookies(self):
+        """Cookies da sessão localizada da cidade (storage_state do Playwright)"""
+        cookies = httpx.Cookies()
+        storage_state = self.session_cache.obter(self.cidade) or {}
+        for cookie in storage_state.get("cookies", []):
+            cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+        return cookies
+
+    def _novo_cliente(self, proxy=None, cookies=None):
+        """Cliente com pool de conexões keep-alive (um por proxy)"""
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=self.max_conexoes, max_keepalive_connections=self.max_conexoes),
+            proxy=self.proxy_pool.proxy_httpx(proxy),
+            retries=1
+        )
+        return httpx.AsyncClient(
+            transport=transport,
+            cookies=cookies,
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={"Accept": "application/json", "Accept-Language": "pt-BR,pt;q=0.9"}
+        )
+
+    async def __aenter__(self):
+        self._cookies_sessao = self._cookies()
+        if not self._cookies_sessao:
+            self.logger.warning("Modo HTTP direto sem cookies de localização (nenhuma sessão salva)")
+
+        await self.proxy_pool.preparar()
+        self._clientes = {}
+        self._semaforo = asyncio.Semaphore(self.concorrencia)
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.gather(*[cliente.aclose() for cliente in self._clientes.values()], return_exceptions=True)
+        return False
+
+    def _cliente(self):
+        """(proxy, cliente) para a próxima requisição: proxy escolhido pelo pool, um cliente keep-alive por proxy"""
+        proxy = self.proxy_pool.escolher()
+        if proxy not in self._clientes:
+            self._clientes[proxy] = self._novo_cliente(proxy, self._cookies_sessao)
+        return proxy, self._clientes[proxy]
+
+    async def _buscar_json_uma_vez(self, url, headers):
+        """Uma tentativa de GET: limite de taxa do host + limite de concorrência; erros sobem para a política de retry"""
+        await self.limitador.aguardar(url)
+        async with self._semaforo:
+            headers = dict(headers or {})
+            headers["User-Agent"] = random.choice(self.user_agents)
+            inicio = time.perf_counter()
+
+            proxy, cliente = self._cliente()
+            try:
+                resposta = await cliente.get(url, headers=headers)
+                if proxy and resposta.status_code in self.proxy_pool.STATUS_FALHA:
+                    self.proxy_pool.registrar_falha(proxy, f"HTTP {resposta.status_code}")
+                resposta.raise_for_status()
+                dados = resposta.json()
+                if proxy:
+                    self.proxy_pool.registrar_sucesso(proxy, time.perf_counter() - inicio)
+                self.stats["ok"] += 1
+                return dados
+            except httpx.TransportError as e:
+                # Falha de conexão/timeout: atribuída ao proxy
+                if proxy:
+                    self.proxy_pool.registrar_falha(proxy, type(e).__name__)
+                self.stats["erros"] += 1
+                raise
+            except Exception:
+                self.stats["erros"] += 1
+                raise
+            finally:
+                self.stats["tempo_total_ms"] += int((time.perf_counter() - inicio) * 1000)
+
+    async def buscar_json(self, url, headers=None):
+        """GET de um JSON com novas tentativas em erros transitórios (None se falhar)"""
+        try:
+            return await self.retry_policy.executar(
+                lambda: self._buscar_json_uma_vez(url, headers), urlsplit(url).hostname or url, url[:90]
+            )
+        except Exception as e:
+            self.logger.debug(f"Erro HTTP em {url[:90]}: {str(e)}")
+            return None
+
+    async def buscar(self, tipo, restaurante):
+        """Buscar o JSON (catalogo/merchant) de um restaurante; retorna ResponseCapture com o payload"""
+        endpoint = self.endpoints.get(tipo)
+        merchant_id = self.merchant_id(restaurante)
+        if not endpoint or not merchant_id:
+            return None
+
+        url = endpoint["url"].replace("{merchant_id}", merchant_id)
+        dados = await self.buscar_json(url, endpoint.get("headers"))
+        if dados is None:
+            return None
+        return ResponseCapture.de_payloads([{"url": url, "dados": dados}], self.config_manager)
+
+    def exibir_relatorio(self, tempo_total, total):
+        """Resumo das requisições HTTP"""
+        requisicoes = self.stats["ok"] + self.stats["erros"]
+        media_ms = self.stats["tempo_total_ms"] / requisicoes if requisicoes else 0
+
+        print(f"\n{Fore.CYAN}⚡ MODO HTTP DIRETO:")
+        print(f"{Fore.WHITE}   📡 Requisições: {requisicoes} ({self.stats['erros']} erros)")
+        print(f"{Fore.WHITE}   ⏱️ Latência média: {media_ms:.0f}ms | Tempo total: {tempo_total:.2f}s")
+        print(f"{Fore.WHITE}   🚀 Throughput: {total / tempo_total if tempo_total > 0 else 0:.1f} restaurantes/s "
+              f"(concorrência {self.concorrencia}, {len(self._clientes) or 1} cliente(s))")
+        if self.proxy_pool.habilitado:
+            self.proxy_pool.exibir_relatorio()
@@ -2,18 +2,42 @@
 Scraper de informações extras (avaliações e pedido mínimo)
 """
 import asyncio
+import statistics
 import time
 from datetime import datetime
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 from colorama import Fore, Style
 from src.utils.logger import get_logger
 from src.database.db_manager import DatabaseManager
+from src.config.config_manager import ConfigManager
+from src.scrapers.resource_blocker import ResourceBlocker
+from src.scrapers.session_cache import LocationSessionCache
+from src.scrapers.direct_http import DirectHttpFetcher
+from src.scrapers.page_readiness import PageReadiness
+from src.scrapers.rate_limiter import obter_limitador
+from src.scrapers.retry_policy import obter_politica
+from src.scrapers.proxy_pool import obter_pool
+from src.scrapers.context_factory import ContextFactory
+from src.scrapers.checkpoint import RunCheckpoint
+from src.scrapers.crawl_scheduler import CrawlScheduler
+from src.utils import text_parsers
 
 class ExtraInfoScraper:
     def __init__(self):
         self.logger = get_logger()
         self.db_manager = DatabaseManager()
+        self.config_manager = ConfigManager()
         self.base_url = "https://www.ifood.com.br"
+        self.resource_blocker = ResourceBlocker(self.config_manager)
+        self.session_cache = LocationSessionCache(self.config_manager)
+        self.readiness = PageReadiness(self.config_manager)
+        self.limitador = obter_limitador(self.config_manager)
+        self.retry_policy = obter_politica(self.config_manager)
+        self.proxy_pool = obter_pool(self.config_manager)
+        self.context_factory = ContextFactory(
+            self.config_manager, self.resource_blocker, self.session_cache, self.proxy_pool
+        )
+        self.scheduler = CrawlScheduler(self.config_manager)
         
         # Seletores para informações extras
         self.seletores = {
@@ -137,7 +161,8 @@ class ExtraInfoScraper:
                     botao = await page.wait_for_selector(seletor, timeout=5000)
                     if botao:
                         await botao.click()
-                        await asyncio.sleep(2)  # Aguardar drawer abrir
+                        # Aguardar drawer abrir
+                        await self.readiness.seletor(page, ".drawer", timeout_ms=3000)
                         botao_clicado = True
                         print(f"{Fore.GREEN}   ✅ Drawer de avaliações aberto")
                         break
@@ -158,10 +183,8 @@ class ExtraInfoScraper:
                     if elemento:
                         texto = await elemento.inner_text()
                         # Extrair número do texto (ex: "1.234 avaliações" -> 1234)
-                        import re
-                        numeros = re.findall(r'\d+', texto.replace('.', '').replace(',', ''))
-                        if numeros:
-                            reviews_count = int(numeros[0])
+                        reviews_count = text_parsers.reviews_no_texto(texto) or text_parsers.interpretar_inteiro(texto)
+                        if reviews_count is not None:
                             print(f"{Fore.GREEN}   ✅ Avaliações encontradas: {reviews_count}")
                             break
                 except:
@@ -174,7 +197,7 @@ class ExtraInfoScraper:
                     botao_fechar = await page.query_selector(seletor)
                     if botao_fechar:
                         await botao_fechar.click()
-                        await asyncio.sleep(1)
+                        await self.readiness.seletor(page, ".drawer", timeout_ms=1000, estado="detached")
                         print(f"{Fore.GREEN}   ✅ Drawer fechado")
                         break
                 except:
@@ -200,12 +223,9 @@ class ExtraInfoScraper:
                     elemento = await page.query_selector(seletor)
                     if elemento:
                         texto = await elemento.inner_text()
-                        # Extrair valor do texto (ex: "Pedido mínimo R$ 20,00" -> 20.00)
-                        import re
-                        match = re.search(r'R\$\s*([\d,]+)', texto)
-                        if match:
-                            valor_str = match.group(1).replace(',', '.')
-                            pedido_minimo = float(valor_str)
+                        # Extrair valor do texto (ex: "Pedido mínimo R$ 1.234,56" -> 1234.56)
+                        pedido_minimo = text_parsers.interpretar_preco(texto) if "R$" in texto else None
+                        if pedido_minimo is not None:
                             print(f"{Fore.GREEN}   ✅ Pedido mínimo: R$ {pedido_minimo:.2f}")
                             break
                 except:
@@ -231,8 +251,10 @@ class ExtraInfoScraper:
             # Navegar para o restaurante
             if restaurant_link and restaurant_link != "N/A":
                 print(f"{Fore.CYAN}   🔗 Navegando para: {restaurant_link[:50]}...")
-                await page.goto(restaurant_link, wait_until="domcontentloaded", timeout=30000)
-                await asyncio.sleep(3)
+                await self.retry_policy.navegar(page, restaurant_link, alvo=f"restaurante:{restaurant_data['id']}",
+                                                wait_until="domcontentloaded")
+                # Aguardar o cabeçalho do restaurante (pedido mínimo e botão de avaliações)
+                await self.readiness.pronta(page, ".merchant-info")
             else:
                 print(f"{Fore.RED}   ❌ Link inválido para {restaurant_name}")
                 return None, None
@@ -250,7 +272,7 @@ class ExtraInfoScraper:
             return None, None
     
     def atualizar_info_extra_banco(self, restaurant_id, reviews, min_order):
-        """Atualizar informações extras no banco de dados"""
+        """Atualizar informações extras no banco de dados (False se nada foi coletado ou gravado)"""
         try:
             conn = self.db_manager._get_connection()
             
@@ -266,19 +288,39 @@ class ExtraInfoScraper:
                 updates.append("min_order = ?")
                 params.append(min_order)
             
+            atualizados = 0
             if updates:
                 params.append(restaurant_id)
                 query = f"UPDATE restaurants SET {', '.join(updates)} WHERE id = ?"
-                conn.execute(query, params)
+                atualizados = conn.execute(query, params).fetchone()[0]
                 conn.commit()
                 
             conn.close()
-            return True
+            return atualizados > 0
             
         except Exception as e:
             self.logger.error(f"Erro ao atualizar info extra: {str(e)}")
             return False
     
+    def exibir_resumo_desempenho(self, tempos_tarefas, tempo_total, total_restaurantes, sucesso_count, workers=1):
+        """Exibir timing por tarefa e throughput da coleta"""
+        print(f"\n{Fore.YELLOW}📊 RESUMO DA COLETA:")
+        print(f"{Fore.WHITE}   ⏱️ Tempo total: {tempo_total:.2f}s")
+        print(f"{Fore.WHITE}   🍴 Restaurantes processados: {total_restaurantes}")
+        print(f"{Fore.WHITE}   ✅ Atualizações bem-sucedidas: {sucesso_count}")
+        if workers > 1:
+            print(f"{Fore.WHITE}   🧵 Páginas simultâneas: {workers}")
+        
+        if tempos_tarefas:
+            ordenados = sorted(tempos_tarefas)
+            p95 = ordenados[min(len(ordenados) - 1, int(len(ordenados) * 0.95))]
+            print(f"{Fore.WHITE}   ⏱️ Por tarefa: média {statistics.mean(ordenados):.1f}s | "
+                  f"mediana {statistics.median(ordenados):.1f}s | p95 {p95:.1f}s | "
+                  f"mín {ordenados[0]:.1f}s | máx {ordenados[-1]:.1f}s")
+        
+        throughput = total_restaurantes / tempo_total if tempo_total > 0 else 0
+        print(f"{Fore.WHITE}   🚀 Throughput: {throughput:.2f} restaurantes/s ({throughput * 60:.1f}/min)")
+    
     def exibir_menu_selecao(self):
         """Exibir menu para seleção de restaurantes"""
         print(f"\n{Fore.CYAN}🔍 COLETA DE INFORMAÇÕES EXTRAS:")
@@ -297,9 +339,10 @@ class ExtraInfoScraper:
                 elif escolha == '1':
                     return self._selecionar_restaurante_especifico()
                 elif escolha == '2':
-                    return self._selecionar_categoria_especifica()
+                    # Coleta em massa: só os restaurantes vencidos (TTL), por prioridade
+                    return self.scheduler.planejar(self._selecionar_categoria_especifica(), "info_extra")
                 elif escolha == '3':
-                    return self.obter_todos_restaurantes()
+                    return self.scheduler.planejar(self.obter_todos_restaurantes(), "info_extra")
                 else:
                     print(f"{Fore.RED}❌ Opção inválida!")
                     
@@ -400,21 +443,74 @@ class ExtraInfoScraper:
             self.logger.error(f"Erro ao selecionar categoria: {str(e)}")
             return None
     
-    async def executar_coleta_info_extra(self, restaurantes):
-        """Executar coleta de informações extras"""
+    async def executar_coleta_info_extra_http(self, restaurantes, checkpoint=None):
+        """Coletar avaliações/pedido mínimo via HTTP direto; retorna os restaurantes que precisam do navegador"""
+        tempo_inicio = time.time()
+        fetcher = DirectHttpFetcher(self.config_manager)
+        
+        if not await fetcher.preparar(restaurantes, "merchant"):
+            print(f"{Fore.YELLOW}⚠️ Endpoint de merchant indisponível - usando navegador")
+            return restaurantes
+        
+        print(f"\n{Fore.CYAN}⚡ Buscando info extra de {len(restaurantes)} restaurantes via HTTP direto...")
+        async with fetcher:
+            capturas = await asyncio.gather(*[fetcher.buscar("merchant", r) for r in restaurantes])
+        
+        sucesso_count = 0
+        pendentes = []
+        for restaurante, captura in zip(restaurantes, capturas):
+            reviews, min_order = captura.info_extra() if captura else (None, None)
+            if (reviews is not None or min_order is not None) and \
+                    self.atualizar_info_extra_banco(restaurante['id'], reviews, min_order):
+                sucesso_count += 1
+                self.scheduler.registrar("info_extra", restaurante['id'], [reviews, min_order])
+                if checkpoint:
+                    checkpoint.concluir(restaurante, registros=1)
+            else:
+                pendentes.append(restaurante)
+        
+        if checkpoint:
+            checkpoint.salvar()
+        
+        fetcher.exibir_relatorio(time.time() - tempo_inicio, len(restaurantes))
+        print(f"{Fore.WHITE}   ✅ {sucesso_count}/{len(restaurantes)} restaurantes atualizados")
+        if pendentes:
+            print(f"{Fore.YELLOW}   ↪️ {len(pendentes)} restaurantes seguem para o navegador")
+        
+        self.logger.info(f"Modo HTTP direto: {sucesso_count} atualizados, {len(pendentes)} pendentes")
+        return pendentes
+    
+    async def executar_coleta_info_extra(self, restaurantes, run_id=None):
+        """Executar coleta de informações extras (run_id: retomar uma execução interrompida)"""
+        # Checkpoint: cada restaurante já é atualizado no banco, o checkpoint registra os concluídos
+        checkpoint = RunCheckpoint.abrir("info_extra", restaurantes, "id", run_id=run_id,
+                                         config_manager=self.config_manager)
+        restaurantes = checkpoint.pendentes()
+        
+        # Modo HTTP direto: só os restaurantes sem resposta via HTTP seguem para o navegador
+        if self.config_manager.get_direct_http_config().get("enabled", False):
+            restaurantes = await self.executar_coleta_info_extra_http(restaurantes, checkpoint)
+            if not restaurantes:
+                checkpoint.finalizar()
+                self.scheduler.gravar()
+                input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
+                return
+        
         tempo_inicio = time.time()
         sucesso_count = 0
+        tempos_tarefas = []
+        self.resource_blocker.resetar()
         
         async with async_playwright() as p:
+            await self.proxy_pool.preparar()
             browser = await p.chromium.launch(
                 headless=False,
-                args=['--no-sandbox', '--disable-setuid-sandbox']
+                args=['--no-sandbox', '--disable-setuid-sandbox'],
+                **self.proxy_pool.opcoes_launch()
             )
             
-            context = await browser.new_context(
-                viewport={'width': 1280, 'height': 720},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            )
+            # Sessão localizada (se houver) para o cardápio refletir o endereço de entrega
+            context = await self.context_factory.novo_contexto(browser, self.config_manager.get_default_city())
             
             page = await context.new_page()
             
@@ -425,6 +521,7 @@ class ExtraInfoScraper:
                     print(f"\n{Fore.BLUE}[{i}/{len(restaurantes)}]", end="")
                     
                     # Coletar informações extras
+                    tempo_tarefa = time.time()
                     reviews, min_order = await self.coletar_info_extra_restaurante(page, restaurante)
                     
                     # Atualizar no banco
@@ -434,23 +531,21 @@ class ExtraInfoScraper:
                         )
                         if sucesso:
                             sucesso_count += 1
+                            checkpoint.concluir(restaurante, registros=1)
+                            self.scheduler.registrar("info_extra", restaurante['id'], [reviews, min_order],
+                                                     time.time() - tempo_tarefa)
                             print(f"{Fore.GREEN}   ✅ Info extra salva no banco!")
                         else:
                             print(f"{Fore.RED}   ❌ Erro ao salvar no banco")
                     else:
                         print(f"{Fore.YELLOW}   ⚠️ Nenhuma info extra coletada")
                     
-                    # Pausa entre restaurantes
-                    if i < len(restaurantes):
-                        await asyncio.sleep(2)
+                    tempos_tarefas.append(time.time() - tempo_tarefa)
+                    print(f"{Fore.WHITE}   ⏱️ Tarefa concluída em {tempos_tarefas[-1]:.1f}s")
                 
                 # Relatório final
                 tempo_total = time.time() - tempo_inicio
-                print(f"\n{Fore.YELLOW}📊 RESUMO DA COLETA:")
-                print(f"{Fore.WHITE}   ⏱️ Tempo total: {tempo_total:.2f}s")
-                print(f"{Fore.WHITE}   🍴 Restaurantes processados: {len(restaurantes)}")
-                print(f"{Fore.WHITE}   ✅ Atualizações bem-sucedidas: {sucesso_count}")
-                print(f"{Fore.WHITE}   🚀 Performance: {tempo_total/len(restaurantes):.1f}s por restaurante")
+                self.exibir_resumo_desempenho(tempos_tarefas, tempo_total, len(restaurantes), sucesso_count)
                 
                 self.logger.info(f"Coleta de info extra concluída: {sucesso_count}/{len(restaurantes)} em {tempo_total:.2f}s")
                 
@@ -459,8 +554,14 @@ class ExtraInfoScraper:
                 print(f"\n{Fore.RED}❌ Erro durante coleta: {str(e)}")
                 
             finally:
+                checkpoint.finalizar()
+                self.scheduler.gravar()
                 await browser.close()
                 print(f"\n{Fore.CYAN}🔒 Navegador fechado")
+                self.resource_blocker.exibir_relatorio()
+                self.context_factory.exibir_relatorio()
+                self.retry_policy.exibir_relatorio()
+                self.limitador.exibir_relatorio()
                 input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
     
     def scrape_extra(self):
@@ -482,7 +583,7 @@ class ExtraInfoScraper:
             return
         
         # Mensagem personalizada baseada na seleção
-        print(f"\n{Fore.YELLOW}📍 Cidade configurada: {self.db_manager.config_manager.get_default_city()}")
+        print(f"\n{Fore.YELLOW}📍 Cidade configurada: {self.config_manager.get_default_city()}")
         
         if len(restaurantes_selecionados) == 1:
             print(f"\n{Fore.CYAN}🎯 Coletando info extra do restaurante: {restaurantes_selecionados[0]['nome']}")
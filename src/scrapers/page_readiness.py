@@ -0,0 +1,108 @@
+"""
+Espera por condições concretas da página (substitui asyncio.sleep fixos), cada uma com orçamento máximo
+"""
+import time
+from src.utils.logger import get_logger
+from src.config.config_manager import ConfigManager
+
+class PageReadiness:
+    """Esperas orientadas a eventos: seletor presente, contagem estável e DOM sem mutações"""
+
+    # Resolve quando a contagem do seletor fica igual por `estavelMs` (ou no limite de tempo)
+    SCRIPT_CONTAGEM_ESTAVEL = """
+        ({ seletor, estavelMs, limiteMs }) => new Promise(resolve => {
+            const inicio = performance.now();
+            let ultima = -1;
+            let desde = inicio;
+            const verificar = () => {
+                const agora = performance.now();
+                const atual = document.querySelectorAll(seletor).length;
+                if (atual !== ultima) {
+                    ultima = atual;
+                    desde = agora;
+                }
+                if ((atual > 0 && agora - desde >= estavelMs) || agora - inicio >= limiteMs) {
+                    resolve({ contagem: atual, estavel: agora - desde >= estavelMs });
+                } else {
+                    setTimeout(verificar, 50);
+                }
+            };
+            verificar();
+        })
+    """
+
+    # Resolve quando não há mutações no DOM por `quietoMs` (ou no limite de tempo)
+    SCRIPT_DOM_QUIETO = """
+        ({ quietoMs, limiteMs }) => new Promise(resolve => {
+            const inicio = performance.now();
+            let ultimaMutacao = inicio;
+            const observer = new MutationObserver(() => { ultimaMutacao = performance.now(); });
+            observer.observe(document.documentElement, { childList: true, subtree: true, attributes: true, characterData: true });
+            const verificar = () => {
+                const agora = performance.now();
+                if (agora - ultimaMutacao >= quietoMs || agora - inicio >= limiteMs) {
+                    observer.disconnect();
+                    resolve(agora - ultimaMutacao >= quietoMs);
+                } else {
+                    setTimeout(verificar, Math.max(20, quietoMs - (agora - ultimaMutacao)));
+                }
+            };
+            verificar();
+        })
+    """
+
+    def __init__(self, config_manager=None):
+        self.logger = get_logger()
+        config = (config_manager or ConfigManager()).get_readiness_config()
+
+        self.timeout_seletor_ms = config.get("selector_timeout_ms", 10000)
+        self.estavel_ms = config.get("stable_ms", 500)
+        self.quieto_ms = config.get("quiet_ms", 400)
+        self.limite_ms = config.get("max_wait_ms", 5000)
+
+    async def seletor(self, page, seletor, timeout_ms=None, estado="attached"):
+        """Aguardar o seletor aparecer (True/False, sem exceção)"""
+        try:
+            await page.wait_for_selector(seletor, state=estado, timeout=timeout_ms or self.timeout_seletor_ms)
+            return True
+        except Exception:
+            self.logger.debug(f"Seletor não apareceu no orçamento: {seletor[:80]}")
+            return False
+
+    async def contagem_estavel(self, page, seletor, estavel_ms=None, limite_ms=None):
+        """Aguardar a quantidade de elementos parar de mudar; retorna a contagem final"""
+        try:
+            resultado = await page.evaluate(self.SCRIPT_CONTAGEM_ESTAVEL, {
+                "seletor": seletor,
+                "estavelMs": estavel_ms or self.estavel_ms,
+                "limiteMs": limite_ms or self.limite_ms
+            })
+            return resultado["contagem"]
+        except Exception as e:
+            self.logger.debug(f"Erro ao aguardar contagem estável: {str(e)}")
+            return 0
+
+    async def dom_quieto(self, page, quieto_ms=None, limite_ms=None):
+        """Aguardar o DOM ficar sem mutações por quieto_ms (True se ficou quieto antes do limite)"""
+        try:
+            return await page.evaluate(self.SCRIPT_DOM_QUIETO, {
+                "quietoMs": quieto_ms or self.quieto_ms,
+                "limiteMs": limite_ms or self.limite_ms
+            })
+        except Exception as e:
+            # Navegação no meio da espera destrói o contexto de execução
+            self.logger.debug(f"Erro ao aguardar DOM quieto: {str(e)}")
+            return False
+
+    async def pronta(self, page, seletor=None, timeout_ms=None):
+        """Espera padrão após navegação/ação: seletor (se informado) e depois DOM quieto"""
+        inicio = time.perf_counter()
+        encontrado = True
+
+        if seletor:
+            encontrado = await self.seletor(page, seletor, timeout_ms)
+
+        await self.dom_quieto(page)
+        self.logger.debug(f"Página pronta em {(time.perf_counter() - inicio) * 1000:.0f}ms"
+                          f"{'' if encontrado else ' (seletor ausente)'}")
+        return encontrado
@@ -1,16 +1,25 @@
 """
 Scraper paralelo de informações extras
 """
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from colorama import Fore
+from playwright.async_api import async_playwright
 from src.utils.logger import get_logger
+from src.config.config_manager import ConfigManager
+from src.scrapers.extra_info_scraper import ExtraInfoScraper
+from src.scrapers.checkpoint import RunCheckpoint
 import psutil
 
 class ParallelExtra:
     def __init__(self):
         self.logger = get_logger()
-        self.max_workers = 5
-        self.checkpoint_interval = 100
-    
+        self.config_manager = ConfigManager()
+        self.max_workers = self.config_manager.get_max_workers()
+        self.checkpoint_interval = self.config_manager.get_checkpoint_interval()
+        self._gravador = None
+
     def show_system_info(self):
         """Mostrar informações do sistema"""
         print(f"\n{Fore.CYAN}INFORMAÇÕES DO SISTEMA:")
@@ -18,11 +27,131 @@ class ParallelExtra:
         print(f"{Fore.WHITE}RAM: {psutil.virtual_memory().percent}%")
         print(f"{Fore.WHITE}Workers: {self.max_workers}")
         print(f"{Fore.WHITE}Checkpoint: a cada {self.checkpoint_interval} registros\n")
-    
+
+    async def _tarefa(self, scraper, semaforo, pool_paginas, restaurante, indice, total, resultado, checkpoint):
+        """Coletar info extra de um restaurante usando uma página livre do pool"""
+        async with semaforo:
+            page = await pool_paginas.get()
+            tempo_tarefa = time.time()
+
+            try:
+                print(f"\n{Fore.BLUE}[{indice}/{total}]", end="")
+                reviews, min_order = await scraper.coletar_info_extra_restaurante(page, restaurante)
+
+                if reviews is not None or min_order is not None:
+                    # DuckDB fora do event loop (as outras páginas seguem navegando), numa única thread gravadora
+                    salvo = await asyncio.get_running_loop().run_in_executor(
+                        self._gravador, self._gravar, scraper, checkpoint, restaurante, reviews, min_order,
+                        time.time() - tempo_tarefa
+                    )
+                    if salvo:
+                        resultado["sucesso"] += 1
+                    else:
+                        print(f"{Fore.RED}   ❌ Erro ao salvar no banco: {restaurante['nome']}")
+                else:
+                    print(f"{Fore.YELLOW}   ⚠️ Nenhuma info extra coletada: {restaurante['nome']}")
+
+            except Exception as e:
+                self.logger.error(f"Erro na tarefa de {restaurante['nome']}: {str(e)}")
+
+            finally:
+                duracao = time.time() - tempo_tarefa
+                resultado["tempos"].append(duracao)
+                print(f"{Fore.WHITE}   ⏱️ {restaurante['nome']}: {duracao:.1f}s")
+                pool_paginas.put_nowait(page)
+
+    @staticmethod
+    def _gravar(scraper, checkpoint, restaurante, reviews, min_order, duracao_s):
+        """Gravar a info extra e só então marcar o checkpoint e o histórico do agendador (thread gravadora)"""
+        if not scraper.atualizar_info_extra_banco(restaurante['id'], reviews, min_order):
+            return False
+        checkpoint.concluir(restaurante, registros=1)
+        scraper.scheduler.registrar("info_extra", restaurante['id'], [reviews, min_order], duracao_s)
+        return True
+
+    async def executar_paralelo(self, scraper, restaurantes, run_id=None):
+        """Executar coleta com pool de páginas limitado por semáforo (run_id: retomar execução)"""
+        tempo_inicio = time.time()
+        checkpoint = RunCheckpoint.abrir("info_extra_paralelo", restaurantes, "id", run_id=run_id,
+                                         config_manager=self.config_manager)
+        restaurantes = checkpoint.pendentes()
+        num_workers = max(1, min(self.max_workers, len(restaurantes)))
+        resultado = {"sucesso": 0, "tempos": []}
+        self._gravador = ThreadPoolExecutor(max_workers=1, thread_name_prefix="info-extra-db")
+        scraper.resource_blocker.resetar()
+
+        async with async_playwright() as p:
+            await scraper.proxy_pool.preparar()
+            browser = await p.chromium.launch(
+                headless=False,
+                args=['--no-sandbox', '--disable-setuid-sandbox'],
+                **scraper.proxy_pool.opcoes_launch()
+            )
+
+            context = await scraper.context_factory.novo_contexto(browser, scraper.config_manager.get_default_city())
+
+            try:
+                pool_paginas = asyncio.Queue()
+                for _ in range(num_workers):
+                    pool_paginas.put_nowait(await context.new_page())
+
+                semaforo = asyncio.Semaphore(num_workers)
+
+                print(f"\n{Fore.CYAN}📊 Iniciando coleta de {len(restaurantes)} restaurantes com {num_workers} páginas...")
+
+                await asyncio.gather(*[
+                    self._tarefa(scraper, semaforo, pool_paginas, restaurante, i, len(restaurantes), resultado, checkpoint)
+                    for i, restaurante in enumerate(restaurantes, 1)
+                ])
+
+                tempo_total = time.time() - tempo_inicio
+                scraper.exibir_resumo_desempenho(
+                    resultado["tempos"], tempo_total, len(restaurantes), resultado["sucesso"], workers=num_workers
+                )
+
+                self.logger.info(f"Coleta paralela de info extra concluída: {resultado['sucesso']}/{len(restaurantes)} "
+                                 f"em {tempo_total:.2f}s com {num_workers} páginas")
+
+            except Exception as e:
+                self.logger.error(f"Erro durante coleta paralela de info extra: {str(e)}")
+                print(f"\n{Fore.RED}❌ Erro durante coleta paralela: {str(e)}")
+
+            finally:
+                self._gravador.shutdown(wait=True)
+                checkpoint.finalizar()
+                scraper.scheduler.gravar()
+                await browser.close()
+                print(f"\n{Fore.CYAN}🔒 Navegador fechado")
+                scraper.resource_blocker.exibir_relatorio()
+                scraper.context_factory.exibir_relatorio()
+                scraper.retry_policy.exibir_relatorio()
+                scraper.limitador.exibir_relatorio()
+
     def run(self):
         """Executar scraping paralelo de informações extras"""
         print(f"\n{Fore.YELLOW}Iniciando scraping paralelo de informações extras...")
         self.show_system_info()
         self.logger.info("Iniciando scraping paralelo de informações extras")
-        # TODO: Implementar lógica de scraping paralelo
-        input(f"\n{Fore.GREEN}Funcionalidade em desenvolvimento. ENTER para continuar...")
\ No newline at end of file
+
+        scraper = ExtraInfoScraper()
+        if not scraper._verificar_colunas_extras():
+            print(f"{Fore.RED}❌ Erro ao preparar banco de dados")
+            input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
+            return
+
+        restaurantes = scraper.obter_restaurantes_para_atualizar()
+        if not restaurantes:
+            print(f"{Fore.GREEN}✅ Nenhum restaurante pendente de informações extras")
+            input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
+            return
+
+        print(f"{Fore.WHITE}🎯 {len(restaurantes)} restaurantes sem avaliações ou pedido mínimo")
+
+        # Ordem por prioridade, sem os coletados há menos do TTL e dentro do orçamento
+        restaurantes = scraper.scheduler.planejar(restaurantes, "info_extra")
+        if not restaurantes:
+            input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
+            return
+
+        asyncio.run(self.executar_paralelo(scraper, restaurantes))
+        input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
@@ -1,28 +1,249 @@
 """
 Scraper paralelo de produtos
 """
+import asyncio
+import multiprocessing
+import os
+import queue
+import time
+from collections import Counter
 from colorama import Fore
-from src.utils.logger import get_logger
+from playwright.async_api import async_playwright
+from src.utils.logger import get_logger, setup_logger
+from src.config.config_manager import ConfigManager
+from src.scrapers.products_scraper import ProductsScraper
+from src.scrapers.checkpoint import RunCheckpoint
+from src.scrapers.resource_blocker import ResourceBlocker
+from src.utils.display_formatter import DisplayFormatter
 import psutil
 
+
+async def _executar_worker(worker_id, fila_tarefas, fila_resultados, restaurantes_por_id):
+    """Loop assíncrono do worker: navegador próprio consumindo ids da fila compartilhada"""
+    logger = get_logger()
+    scraper = ProductsScraper()
+    stats = {"restaurantes": 0, "produtos": 0, "falhas": 0}
+
+    async with async_playwright() as p:
+        await scraper.proxy_pool.preparar()
+        browser = await p.chromium.launch(
+            headless=False,
+            args=['--no-sandbox', '--disable-setuid-sandbox'],
+            **scraper.proxy_pool.opcoes_launch()
+        )
+
+        context = await scraper.context_factory.novo_contexto(browser, scraper.config_manager.get_default_city())
+
+        page = await context.new_page()
+
+        try:
+            while True:
+                # get() bloqueante fora do event loop para não travar o Playwright
+                restaurant_id = await asyncio.get_running_loop().run_in_executor(None, fila_tarefas.get)
+                if restaurant_id is None:
+                    break
+
+                restaurante = restaurantes_por_id[restaurant_id]
+                produtos = []
+
+                try:
+                    print(f"\n{Fore.MAGENTA}🍴 [P{worker_id}] Restaurante: {restaurante['nome']}")
+
+                    if await scraper.navegar_para_restaurante(page, restaurante):
+                        produtos = await scraper.coletar_produtos_restaurante(
+                            page, restaurante['id'], restaurante['nome'], restaurante['categoria']
+                        )
+                        stats["restaurantes"] += 1
+                        stats["produtos"] += len(produtos)
+                    else:
+                        stats["falhas"] += 1
+                        print(f"{Fore.RED}❌ [P{worker_id}] Falha ao navegar para {restaurante['nome']}")
+                        fila_resultados.put(("falha", worker_id, restaurant_id, None))
+                        continue
+
+                except Exception as e:
+                    stats["falhas"] += 1
+                    logger.error(f"[P{worker_id}] Erro no restaurante {restaurante['nome']}: {str(e)}")
+                    fila_resultados.put(("falha", worker_id, restaurant_id, None))
+                    continue
+
+                fila_resultados.put(("resultado", worker_id, restaurant_id, produtos))
+
+        finally:
+            await browser.close()
+            stats["rede"] = scraper.resource_blocker.resumo()
+
+    return stats
+
+
+def _processo_worker(worker_id, fila_tarefas, fila_resultados, restaurantes_por_id):
+    """Ponto de entrada do processo worker (precisa ser de módulo para o spawn)"""
+    setup_logger()
+    stats = {"restaurantes": 0, "produtos": 0, "falhas": 0}
+
+    try:
+        stats = asyncio.run(_executar_worker(worker_id, fila_tarefas, fila_resultados, restaurantes_por_id))
+    except Exception as e:
+        get_logger().error(f"[P{worker_id}] Erro fatal no processo worker: {str(e)}")
+    finally:
+        fila_resultados.put(("fim", worker_id, None, stats))
+
+
 class ParallelProducts:
     def __init__(self):
         self.logger = get_logger()
-        self.max_workers = 5
-        self.checkpoint_interval = 100
-    
+        self.config_manager = ConfigManager()
+        self.max_workers = self.config_manager.get_max_workers()
+        self.checkpoint_interval = self.config_manager.get_checkpoint_interval()
+
     def show_system_info(self):
         """Mostrar informações do sistema"""
         print(f"\n{Fore.CYAN}INFORMAÇÕES DO SISTEMA:")
-        print(f"{Fore.WHITE}CPU: {psutil.cpu_percent()}%")
+        print(f"{Fore.WHITE}CPU: {psutil.cpu_percent()}% ({os.cpu_count()} núcleos)")
         print(f"{Fore.WHITE}RAM: {psutil.virtual_memory().percent}%")
-        print(f"{Fore.WHITE}Workers: {self.max_workers}")
+        print(f"{Fore.WHITE}Workers: {self.max_workers} processos")
         print(f"{Fore.WHITE}Checkpoint: a cada {self.checkpoint_interval} registros\n")
-    
+
+    def executar_pool_processos(self, scraper, restaurantes, run_id=None):
+        """Distribuir restaurantes entre processos, cada um com seu próprio navegador (run_id: retomar execução)"""
+        tempo_inicio = time.time()
+
+        # Só o processo principal grava: checkpoint com os restaurantes concluídos a cada N produtos
+        checkpoint = RunCheckpoint.abrir(
+            "produtos_paralelo", restaurantes, "id", run_id=run_id,
+            ao_salvar=scraper.salvar_lote_produtos, config_manager=self.config_manager
+        )
+        restaurantes = checkpoint.pendentes()
+        scraper.dedupe_cache.reiniciar()
+        num_workers = max(1, min(self.max_workers, os.cpu_count() or 1, len(restaurantes)))
+
+        # spawn: comportamento idêntico no Windows e no Linux (sem herdar estado do Playwright)
+        ctx = multiprocessing.get_context("spawn")
+        fila_tarefas = ctx.Queue()
+        fila_resultados = ctx.Queue()
+
+        restaurantes_por_id = {r['id']: r for r in restaurantes}
+        for restaurant_id in restaurantes_por_id:
+            fila_tarefas.put(restaurant_id)
+        for _ in range(num_workers):
+            fila_tarefas.put(None)
+
+        print(f"\n{Fore.CYAN}🚀 Iniciando {num_workers} processos para {len(restaurantes_por_id)} restaurantes...")
+
+        processos = [
+            ctx.Process(
+                target=_processo_worker,
+                args=(i, fila_tarefas, fila_resultados, restaurantes_por_id),
+                daemon=True
+            )
+            for i in range(1, num_workers + 1)
+        ]
+        for processo in processos:
+            processo.start()
+
+        contadores = Counter()
+        estatisticas = {}
+        processados = 0
+
+        try:
+            while len(estatisticas) < num_workers:
+                try:
+                    tipo, worker_id, restaurant_id, dados = fila_resultados.get(timeout=1)
+                except queue.Empty:
+                    if not any(processo.is_alive() for processo in processos):
+                        break
+                    continue
+
+                if tipo == "fim":
+                    estatisticas[worker_id] = dados
+                    continue
+
+                processados += 1
+                if tipo == "resultado":
+                    # Falhas ficam pendentes no checkpoint para a próxima retomada
+                    try:
+                        checkpoint.concluir(restaurantes_por_id[restaurant_id], dados)
+                    except Exception as e:
+                        print(f"{Fore.RED}   ❌ Erro ao gravar lote de produtos: {str(e)}")
+                        continue
+                    contadores[restaurantes_por_id[restaurant_id]['nome']] += len(dados)
+                if processados % 10 == 0:
+                    print(DisplayFormatter.progress(processados, len(restaurantes_por_id), "restaurantes"))
+
+        finally:
+            for processo in processos:
+                processo.join(timeout=10)
+                if processo.is_alive():
+                    processo.terminate()
+            # Salvar no banco o que ainda não passou por um checkpoint (somente o processo principal escreve no DuckDB)
+            checkpoint.finalizar()
+            scraper.scheduler.gravar()
+
+        total_produtos = sum(contadores.values())
+        if total_produtos:
+            scraper.exibir_relatorio_salvamento(checkpoint.contadores, total_produtos)
+
+            tempo_total = time.time() - tempo_inicio
+            performance = total_produtos / tempo_total if tempo_total > 0 else 0
+            rest_por_min = processados / tempo_total * 60 if tempo_total > 0 else 0
+
+            stats_data = {
+                "Tempo total": f"{tempo_total:.2f}s",
+                "Processos": num_workers,
+                "Restaurantes": f"{processados}/{len(restaurantes_por_id)}",
+                "Produtos": total_produtos,
+                "Performance": f"{performance:.1f} prod/s",
+                "Restaurantes/min": f"{rest_por_min:.1f}"
+            }
+            print(f"\n{DisplayFormatter.stats_table(stats_data)}")
+
+            worker_list = [
+                f"P{worker_id}: {dados['restaurantes']} restaurantes, {dados['produtos']} produtos, {dados['falhas']} falhas"
+                for worker_id, dados in sorted(estatisticas.items())
+            ]
+            print(f"\n{DisplayFormatter.compact_list(worker_list, 'DISTRIBUIÇÃO POR PROCESSO', max_display=num_workers)}")
+
+            restaurante_list = [f"{nome}: {count} produtos" for nome, count in contadores.most_common()]
+            print(f"\n{DisplayFormatter.compact_list(restaurante_list, 'PRODUTOS POR RESTAURANTE')}")
+
+            scraper.resource_blocker.exibir_relatorio(
+                ResourceBlocker.somar_resumos(dados.get("rede") for dados in estatisticas.values())
+            )
+
+            self.logger.info(f"Scraping paralelo de produtos concluído: {total_produtos} produtos "
+                             f"em {tempo_total:.2f}s com {num_workers} processos")
+        else:
+            print(f"\n{Fore.YELLOW}⚠️ Nenhum produto foi coletado")
+
     def run(self):
         """Executar scraping paralelo de produtos"""
         print(f"\n{Fore.YELLOW}Iniciando scraping paralelo de produtos...")
         self.show_system_info()
         self.logger.info("Iniciando scraping paralelo de produtos")
-        # TODO: Implementar lógica de scraping paralelo
-        input(f"\n{Fore.GREEN}Funcionalidade em desenvolvimento. ENTER para continuar...")
\ No newline at end of file
+
+        scraper = ProductsScraper()
+        if not scraper._criar_tabela_produtos():
+            print(f"{Fore.RED}❌ Erro ao criar tabela de produtos")
+            input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
+            return
+
+        restaurantes = scraper.obter_todos_restaurantes()
+        if not restaurantes:
+            print(f"{Fore.RED}❌ Nenhum restaurante encontrado no banco de dados!")
+            print(f"{Fore.YELLOW}💡 Execute primeiro o Scraper de Restaurantes (opção 1 → 2)")
+            input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
+            return
+
+        # Só os restaurantes vencidos (TTL), por prioridade e dentro do orçamento
+        restaurantes = scraper.scheduler.planejar(restaurantes, "produtos")
+        if not restaurantes:
+            input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
+            return
+
+        try:
+            self.executar_pool_processos(scraper, restaurantes)
+        except Exception as e:
+            self.logger.error(f"Erro durante scraping paralelo de produtos: {str(e)}")
+            print(f"\n{Fore.RED}❌ Erro durante scraping paralelo: {str(e)}")
+
+        input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
@@ -1,17 +1,26 @@
 """
 Scraper paralelo de restaurantes
 """
+import asyncio
+import time
+from collections import Counter
 from colorama import Fore
+from playwright.async_api import async_playwright
 from src.utils.logger import get_logger
+from src.config.config_manager import ConfigManager
+from src.scrapers.restaurants_scraper import RestaurantsScraper
+from src.scrapers.checkpoint import RunCheckpoint
+from src.scrapers.batch_writer import BatchWriter
+from src.utils.display_formatter import DisplayFormatter
 import psutil
-import threading
 
 class ParallelRestaurants:
     def __init__(self):
         self.logger = get_logger()
-        self.max_workers = 5
-        self.checkpoint_interval = 100
-    
+        self.config_manager = ConfigManager()
+        self.max_workers = self.config_manager.get_max_workers()
+        self.checkpoint_interval = self.config_manager.get_checkpoint_interval()
+
     def show_system_info(self):
         """Mostrar informações do sistema"""
         print(f"\n{Fore.CYAN}INFORMAÇÕES DO SISTEMA:")
@@ -19,11 +28,182 @@ class ParallelRestaurants:
         print(f"{Fore.WHITE}RAM: {psutil.virtual_memory().percent}%")
         print(f"{Fore.WHITE}Workers: {self.max_workers}")
         print(f"{Fore.WHITE}Checkpoint: a cada {self.checkpoint_interval} registros\n")
-    
+
+    async def _worker(self, worker_id, browser, scraper, fila, writer, contadores, estatisticas):
+        """Worker: um contexto isolado consumindo categorias da fila compartilhada"""
+        context = await scraper.context_factory.novo_contexto(browser, scraper.cidade_busca)
+        page = await context.new_page()
+
+        try:
+            # Com a sessão da cidade injetada o contexto já nasce localizado (só confere o modal)
+            if not await scraper.configurar_localizacao(page, context):
+                self.logger.error(f"[W{worker_id}] Falha na localização - worker encerrado")
+                print(f"{Fore.RED}❌ [W{worker_id}] Falha na localização - categorias ficam para os demais workers")
+                return
+
+            while True:
+                try:
+                    categoria = fila.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+
+                try:
+                    tempo_categoria = time.time()
+                    print(f"\n{Fore.MAGENTA}📂 [W{worker_id}] Categoria: {categoria['nome']} ({fila.qsize()} restantes na fila)")
+
+                    # Falhas transitórias: backoff e nova tentativa; o circuito da categoria pausa só ela.
+                    # Um único gravador para todos os workers (em lotes no modo incremental, como no sequencial)
+                    quantidade = await scraper.retry_policy.executar(
+                        lambda: scraper.coletar_e_enviar_categoria(page, categoria, contadores, writer),
+                        f"categoria:{categoria['nome']}"
+                    )
+                    await writer.concluir(categoria, quantidade)
+
+                    estatisticas[worker_id]["categorias"] += 1
+                    estatisticas[worker_id]["restaurantes"] += quantidade
+
+                    print(f"{Fore.GREEN}✅ [W{worker_id}] {categoria['nome']}: {quantidade} restaurantes "
+                          f"em {time.time() - tempo_categoria:.1f}s")
+                except Exception as e:
+                    self.logger.error(f"[W{worker_id}] Categoria {categoria['nome']} abandonada: {str(e)}")
+                    print(f"{Fore.RED}❌ [W{worker_id}] {categoria['nome']} abandonada após as tentativas: {str(e)}")
+                finally:
+                    fila.task_done()
+
+        except Exception as e:
+            self.logger.error(f"[W{worker_id}] Erro no worker: {str(e)}")
+            print(f"{Fore.RED}❌ [W{worker_id}] Erro no worker: {str(e)}")
+
+        finally:
+            await context.close()
+
+    async def _preparar_sessao(self, browser, scraper):
+        """Localizar uma única vez e salvar a sessão antes de abrir os contextos dos workers"""
+        if not scraper.session_cache.habilitado or scraper.session_cache.obter(scraper.cidade_busca):
+            return
+
+        print(f"\n{Fore.CYAN}📍 Nenhuma sessão salva para {scraper.cidade_busca} - localizando uma vez para todos os workers...")
+        context = await scraper.context_factory.novo_contexto(browser)
+
+        try:
+            page = await context.new_page()
+            await scraper.configurar_localizacao(page, context)
+        except Exception as e:
+            self.logger.warning(f"Falha ao preparar sessão de localização: {str(e)}")
+        finally:
+            await context.close()
+
+    async def executar_paralelo(self, scraper, categorias, run_id=None):
+        """Executar pool de contextos sobre uma fila asyncio de categorias (run_id: retomar execução)"""
+        tempo_inicio = time.time()
+
+        checkpoint = RunCheckpoint.abrir(
+            "restaurantes_paralelo", categorias, "url", run_id=run_id, parametros={"cidade": scraper.cidade_busca},
+            config_manager=self.config_manager
+        )
+        scraper.cidade_busca = checkpoint.parametros.get("cidade", scraper.cidade_busca)
+        categorias = checkpoint.pendentes()
+        num_workers = max(1, min(self.max_workers, len(categorias)))
+
+        fila = asyncio.Queue()
+        for categoria in categorias:
+            fila.put_nowait(categoria)
+
+        contadores = Counter()
+        estatisticas = {i: {"categorias": 0, "restaurantes": 0} for i in range(1, num_workers + 1)}
+        writer = BatchWriter(scraper.salvar_lote_restaurantes, checkpoint, self.config_manager, "restaurantes")
+        scraper.resource_blocker.resetar()
+        scraper.dedupe_cache.reiniciar()
+
+        async with async_playwright() as p:
+            await scraper.proxy_pool.preparar()
+            browser = await p.chromium.launch(
+                headless=False,
+                args=['--no-sandbox', '--disable-setuid-sandbox'],
+                **scraper.proxy_pool.opcoes_launch()
+            )
+
+            writer.iniciar()
+
+            try:
+                await self._preparar_sessao(browser, scraper)
+
+                print(f"\n{Fore.CYAN}🚀 Iniciando {num_workers} contextos para {len(categorias)} categorias...")
+
+                await asyncio.gather(*[
+                    self._worker(i, browser, scraper, fila, writer, contadores, estatisticas)
+                    for i in range(1, num_workers + 1)
+                ])
+
+                nao_processadas = fila.qsize()
+                if nao_processadas:
+                    print(f"\n{Fore.YELLOW}⚠️ {nao_processadas} categorias não foram processadas (workers indisponíveis)")
+
+                # Aguardar a gravação do que ainda está na fila (uma task gravadora, conexão única por lote)
+                await writer.fechar()
+                total_restaurantes = sum(contadores.values())
+                if total_restaurantes:
+                    scraper.exibir_relatorio_salvamento(writer.contadores, total_restaurantes)
+                    writer.exibir_relatorio()
+
+                    tempo_total = time.time() - tempo_inicio
+                    performance = total_restaurantes / tempo_total if tempo_total > 0 else 0
+
+                    stats_data = {
+                        "Tempo total": f"{tempo_total:.2f}s",
+                        "Workers": num_workers,
+                        "Categorias": len(categorias) - nao_processadas,
+                        "Restaurantes": total_restaurantes,
+                        "Performance": f"{performance:.2f}/s",
+                        "Por worker": f"{performance / num_workers:.2f}/s"
+                    }
+                    print(f"\n{DisplayFormatter.stats_table(stats_data)}")
+
+                    worker_list = [
+                        f"W{worker_id}: {dados['categorias']} categorias, {dados['restaurantes']} restaurantes"
+                        for worker_id, dados in estatisticas.items()
+                    ]
+                    print(f"\n{DisplayFormatter.compact_list(worker_list, 'DISTRIBUIÇÃO POR WORKER', max_display=num_workers)}")
+
+                    categoria_list = [f"{categoria}: {count} restaurantes" for categoria, count in contadores.items()]
+                    print(f"\n{DisplayFormatter.compact_list(categoria_list, 'RESTAURANTES POR CATEGORIA')}")
+
+                    self.logger.info(f"Scraping paralelo de restaurantes concluído: {total_restaurantes} restaurantes "
+                                     f"em {tempo_total:.2f}s com {num_workers} workers")
+                else:
+                    print(f"\n{Fore.YELLOW}⚠️ Nenhum restaurante foi coletado")
+
+            except Exception as e:
+                self.logger.error(f"Erro durante scraping paralelo de restaurantes: {str(e)}")
+                print(f"\n{Fore.RED}❌ Erro durante scraping paralelo: {str(e)}")
+
+            finally:
+                await writer.fechar()
+                checkpoint.finalizar()
+                await browser.close()
+                print(f"\n{Fore.CYAN}🔒 Navegador fechado")
+                scraper.resource_blocker.exibir_relatorio()
+                scraper.context_factory.exibir_relatorio()
+                scraper.retry_policy.exibir_relatorio()
+                scraper.limitador.exibir_relatorio()
+
     def run(self):
         """Executar scraping paralelo de restaurantes"""
         print(f"\n{Fore.YELLOW}Iniciando scraping paralelo de restaurantes...")
         self.show_system_info()
         self.logger.info("Iniciando scraping paralelo de restaurantes")
-        # TODO: Implementar lógica de scraping paralelo
-        input(f"\n{Fore.GREEN}Funcionalidade em desenvolvimento. ENTER para continuar...")
\ No newline at end of file
+
+        scraper = RestaurantsScraper()
+        categorias = scraper.obter_categorias_disponiveis()
+
+        if not categorias:
+            print(f"{Fore.RED}❌ Nenhuma categoria encontrada no banco de dados!")
+            print(f"{Fore.YELLOW}💡 Execute primeiro o Scraper de Categorias (opção 1 → 1)")
+            input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
+            return
+
+        print(f"{DisplayFormatter.info(f'Cidade configurada: {scraper.cidade_busca}')}")
+        print(f"{DisplayFormatter.info(f'{len(categorias)} categorias na fila')}")
+
+        asyncio.run(self.executar_paralelo(scraper, categorias))
+        input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
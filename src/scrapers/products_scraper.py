@@ -3,19 +3,109 @@ Scraper de produtos por restaurante
 """
 import asyncio
 import time
+import pandas as pd
+from collections import Counter, defaultdict
 from datetime import datetime
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 from colorama import Fore, Style
 from src.utils.logger import get_logger
 from src.database.db_manager import DatabaseManager
 from src.config.config_manager import ConfigManager
+from src.scrapers.resource_blocker import ResourceBlocker
+from src.scrapers.session_cache import LocationSessionCache
+from src.scrapers.response_capture import obter_captura
+from src.scrapers.direct_http import DirectHttpFetcher
+from src.scrapers.page_readiness import PageReadiness
+from src.scrapers.rate_limiter import obter_limitador
+from src.scrapers.retry_policy import obter_politica
+from src.scrapers.proxy_pool import obter_pool
+from src.scrapers.context_factory import ContextFactory
+from src.scrapers.checkpoint import RunCheckpoint
+from src.scrapers.batch_writer import BatchWriter
+from src.scrapers.crawl_scheduler import CrawlScheduler
+from src.utils.display_formatter import DisplayFormatter
+from src.utils.benchmark import ContadorRoundTrips, comparar_execucoes
+from src.utils import text_parsers
+from src.utils.content_hash import hash_conteudo, hash_conjunto
+from src.database.columnar_ingest import ingerir_produtos, COLUNAS_PRODUTOS
+from src.database.dedupe_keys import garantir_chaves
+from src.scrapers.dedupe_cache import DedupeCache
 
 class ProductsScraper:
+    # Extração em lote: aplica as mesmas cadeias de seletores dentro do navegador (um round trip por cardápio)
+    SCRIPT_EXTRACAO_PRODUTOS = """
+        (args) => {
+            const primeiro = (raiz, seletores) => {
+                for (const seletor of seletores) {
+                    try {
+                        const el = raiz.querySelector(seletor);
+                        if (el) return el;
+                    } catch (e) {}
+                }
+                return null;
+            };
+            const texto = (raiz, seletores) => {
+                const el = primeiro(raiz, seletores);
+                return el ? el.innerText : null;
+            };
+
+            // Estratégia 1: seletor específico; 2: containers/itens alternativos; 3: busca ampla
+            let itens = Array.from(document.querySelectorAll(args.container));
+            if (!itens.length) {
+                for (const containerSel of args.menu_containers) {
+                    const container = document.querySelector(containerSel);
+                    if (!container) continue;
+                    for (const itemSel of args.itens) {
+                        itens = Array.from(container.querySelectorAll(itemSel));
+                        if (itens.length) break;
+                    }
+                    if (itens.length) break;
+                }
+            }
+            if (!itens.length) {
+                itens = Array.from(document.querySelectorAll(args.busca_ampla));
+            }
+
+            return itens.map(item => {
+                let nome = texto(item, args.nome);
+                if (nome === null) nome = texto(item, args.nome_generico);
+
+                let descricao = texto(item, args.descricao);
+                if (descricao === null) {
+                    for (const seletor of args.descricao_generica) {
+                        const el = primeiro(item, [seletor]);
+                        const t = el ? el.innerText : null;
+                        if (t !== null && t.length > 10 && !t.includes('R$') && t !== nome) {
+                            descricao = t;
+                            break;
+                        }
+                    }
+                }
+
+                const preco = texto(item, args.preco);
+                return { nome, descricao, preco, texto: preco === null ? item.innerText : null };
+            });
+        }
+    """
+    
     def __init__(self):
         self.logger = get_logger()
         self.db_manager = DatabaseManager()
         self.config_manager = ConfigManager()
         self.base_url = "https://www.ifood.com.br"
+        self.resource_blocker = ResourceBlocker(self.config_manager)
+        self.session_cache = LocationSessionCache(self.config_manager)
+        self.readiness = PageReadiness(self.config_manager)
+        self.limitador = obter_limitador(self.config_manager)
+        self.retry_policy = obter_politica(self.config_manager)
+        self.proxy_pool = obter_pool(self.config_manager)
+        self.context_factory = ContextFactory(
+            self.config_manager, self.resource_blocker, self.session_cache, self.proxy_pool
+        )
+        self.scheduler = CrawlScheduler(self.config_manager)
+        # Duração da coleta por restaurante, anotada no agendador quando o cardápio é gravado
+        self.duracoes_coleta = {}
+        self.dedupe_cache = DedupeCache(self.config_manager)
         
         # Seletores otimizados para produtos (baseados nos testes)
         self.seletores_produtos = {
@@ -57,6 +147,16 @@ class ProductsScraper:
                 ".dish-card-wrapper"
             ]
         }
+        
+        # Seletores genéricos (último recurso quando os específicos não encontram nada)
+        self.seletores_genericos = {
+            "busca_ampla": "li[class*='dish'], li[class*='menu-item'], li[class*='product']",
+            "nome": ["h3", "h4", "[class*='name']", "[class*='title']"],
+            "descricao": ["[class*='description']", "[class*='details']", "p", "span"]
+        }
+        
+        # Modo de extração do cardápio ("batch" = um page.evaluate por restaurante, "legacy" = item a item)
+        self.config_extracao = self.config_manager.get_extraction_config()
     
     def _criar_tabela_produtos(self):
         """Criar tabela de produtos no banco se não existir"""
@@ -74,10 +174,18 @@ class ProductsScraper:
                     description TEXT,
                     price DECIMAL(10,2),
                     scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    content_hash VARCHAR,
                     FOREIGN KEY (restaurant_id) REFERENCES restaurants(id)
                 )
             """)
             
+            # Hashes de conteúdo: por produto e do cardápio inteiro (re-coletas só gravam o que mudou)
+            conn.execute("ALTER TABLE products ADD COLUMN IF NOT EXISTS content_hash VARCHAR")
+            conn.execute("ALTER TABLE restaurants ADD COLUMN IF NOT EXISTS menu_hash VARCHAR")
+            
+            # Chave de dedupe normalizada (restaurante + nome + categoria) com índice único
+            garantir_chaves(conn, "products")
+            
             conn.commit()
             conn.close()
             
@@ -142,12 +250,16 @@ class ProductsScraper:
             
             print(f"{Fore.CYAN}🎯 Navegando para restaurante: {restaurant_name}")
             
+            # Escutar o JSON do catálogo desde o início da navegação
+            obter_captura(page, self.config_manager).limpar()
+            
             # Estratégia 1: Usar link direto do banco de dados
             if restaurant_link and restaurant_link != "N/A" and restaurant_link.startswith("http"):
                 try:
                     print(f"{Fore.WHITE}   🔗 Usando link salvo: {restaurant_link[:50]}...")
-                    await page.goto(restaurant_link, wait_until="domcontentloaded", timeout=30000)
-                    await asyncio.sleep(3)
+                    await self.retry_policy.navegar(page, restaurant_link, alvo=f"restaurante:{restaurant_data.get('id')}",
+                                                    wait_until="domcontentloaded")
+                    await self.readiness.dom_quieto(page)
                     
                     # Verificar se chegou na página do restaurante
                     page_title = await page.title()
@@ -162,34 +274,31 @@ class ProductsScraper:
             # Estratégia 2: Busca no iFood (fallback)
             try:
                 print(f"{Fore.WHITE}   🔍 Fazendo busca por: {restaurant_name}")
-                await page.goto(self.base_url, wait_until="domcontentloaded")
-                await asyncio.sleep(2)
+                await self.retry_policy.navegar(page, self.base_url, wait_until="domcontentloaded")
                 
                 # Buscar pelo restaurante
                 search_input = await page.wait_for_selector("input[placeholder*='buscar']", timeout=5000)
                 if search_input:
                     await search_input.fill(restaurant_name)
                     await page.keyboard.press("Enter")
-                    await asyncio.sleep(3)
+                    await self.readiness.seletor(page, "a[href*='delivery']", timeout_ms=5000)
                     
                     # Clicar no primeiro resultado
                     primeiro_resultado = await page.query_selector("a[href*='delivery']")
                     if primeiro_resultado:
+                        # O clique também é uma navegação: passa pelo limitador
+                        await self.limitador.aguardar(self.base_url)
                         await primeiro_resultado.click()
-                        await asyncio.sleep(3)
+                        await self.readiness.pronta(page)
                         print(f"{Fore.GREEN}✅ Encontrado via busca: {restaurant_name}")
                         return True
             except Exception as e:
                 print(f"{Fore.YELLOW}⚠️ Erro na busca: {str(e)}")
             
-            # Estratégia 3: Navegação manual
+            # Sem navegação manual: o restaurante é pulado e a coleta segue (inclusive nos workers paralelos)
             print(f"{Fore.YELLOW}⚠️ Navegação automática falhou para {restaurant_name}")
             print(f"{Fore.WHITE}   💡 Link esperado: {restaurant_link}")
-            resposta = input(f"{Fore.GREEN}Navegue manualmente para o restaurante e pressione ENTER (ou 'skip' para pular): ")
-            
-            if resposta.lower() == 'skip':
-                return False
-            return True
+            return False
             
         except Exception as e:
             print(f"{Fore.RED}❌ Erro ao navegar para restaurante: {str(e)}")
@@ -201,230 +310,328 @@ class ProductsScraper:
             self.logger.info(f"Coletando produtos do restaurante: {restaurant_name}")
             print(f"\n{Fore.CYAN}🍽️ Coletando produtos: {restaurant_name}")
             
-            # Aguardar menu aparecer
-            await asyncio.sleep(3)
+            # Modo preferencial: itens do JSON do catálogo capturado durante a navegação
+            captura = obter_captura(page, self.config_manager)
+            produtos_api = await captura.aguardar(
+                lambda: captura.produtos(restaurant_id, restaurant_name, restaurant_category)
+            )
+            if produtos_api:
+                print(f"{Fore.GREEN}   ✅ {len(produtos_api)} produtos capturados da API (JSON)!")
+                return produtos_api
+            
+            # Fallback: scraping do DOM - aguardar itens do cardápio aparecerem e estabilizarem
+            if await self.readiness.seletor(page, self._seletor_itens_menu()):
+                await self.readiness.contagem_estavel(page, self._seletor_itens_menu())
+            
+            # Benchmark opcional: extração item a item x extração em lote no mesmo cardápio
+            if self.config_extracao.get("benchmark", False):
+                await self.comparar_modos_extracao(page, restaurant_id, restaurant_name, restaurant_category)
+            
+            dados_coletados = None
+            if self.config_extracao.get("mode", "batch") == "batch":
+                dados_coletados = await self.extrair_produtos_lote(
+                    page, restaurant_id, restaurant_name, restaurant_category
+                )
             
-            # Estratégia 1: Usar seletores específicos
-            produtos = await page.query_selector_all(self.seletores_produtos["container"])
+            # Fallback: extração item a item (um round trip por seletor)
+            if dados_coletados is None:
+                dados_coletados = await self.extrair_produtos_por_item(
+                    page, restaurant_id, restaurant_name, restaurant_category
+                )
             
-            if not produtos:
-                # Estratégia 2: Seletores genéricos
-                for container_sel in self.seletores_alternativos["menu_container"]:
+            if dados_coletados:
+                print(f"{Fore.GREEN}   ✅ {len(dados_coletados)} produtos coletados!")
+            return dados_coletados
+            
+        except Exception as e:
+            self.logger.error(f"Erro ao coletar produtos do restaurante {restaurant_name}: {str(e)}")
+            print(f"{Fore.RED}❌ Erro no restaurante {restaurant_name}: {str(e)}")
+            return []
+    
+    def _seletor_itens_menu(self):
+        """Qualquer um dos seletores de item de cardápio (para esperar o menu renderizar)"""
+        return ", ".join(
+            [self.seletores_produtos["container"]]
+            + self.seletores_alternativos["produto_item"]
+            + [self.seletores_genericos["busca_ampla"]]
+        )
+    
+    def _argumentos_script_extracao(self):
+        """Cadeias de seletores (na mesma ordem do modo item a item) para o script em lote"""
+        return {
+            "container": self.seletores_produtos["container"],
+            "menu_containers": self.seletores_alternativos["menu_container"],
+            "itens": self.seletores_alternativos["produto_item"],
+            "busca_ampla": self.seletores_genericos["busca_ampla"],
+            "nome": [self.seletores_produtos["nome"]["principal"], self.seletores_produtos["nome"]["alternativo"]],
+            "nome_generico": self.seletores_genericos["nome"],
+            "descricao": [self.seletores_produtos["descricao"]["principal"],
+                          self.seletores_produtos["descricao"]["alternativo"]],
+            "descricao_generica": self.seletores_genericos["descricao"],
+            "preco": [self.seletores_produtos["preco"]["principal"], self.seletores_produtos["preco"]["alternativo"]]
+        }
+    
+    async def extrair_produtos_lote(self, page, restaurant_id, restaurant_name, restaurant_category):
+        """Extrair todo o cardápio em um único page.evaluate (None se o script falhar)"""
+        try:
+            itens = await page.evaluate(self.SCRIPT_EXTRACAO_PRODUTOS, self._argumentos_script_extracao())
+        except Exception as e:
+            self.logger.warning(f"Extração em lote falhou, usando extração item a item: {str(e)}")
+            return None
+        
+        if not itens:
+            print(f"{Fore.YELLOW}   ⚠️ Nenhum produto encontrado")
+            return []
+        
+        print(f"{Fore.WHITE}   📦 {len(itens)} produtos encontrados")
+        
+        dados_coletados = []
+        for item in itens:
+            produto = self._montar_produto(
+                item.get("nome"), item.get("descricao"), item.get("preco"), item.get("texto"),
+                restaurant_id, restaurant_name, restaurant_category
+            )
+            if produto:
+                dados_coletados.append(produto)
+        
+        return dados_coletados
+    
+    def _montar_produto(self, nome, descricao, preco, texto_completo, restaurant_id, restaurant_name, restaurant_category):
+        """Montar o registro do produto (None se não tiver nome válido)"""
+        # Se não encontrou preço, buscar por texto contendo R$
+        if not preco and texto_completo and "R$" in texto_completo:
+            preco = text_parsers.encontrar_preco(texto_completo)
+        
+        # Só adicionar se tiver pelo menos nome
+        if not nome or len(nome) <= 2:
+            return None
+        
+        return {
+            "restaurant_id": restaurant_id,
+            "restaurant_name": restaurant_name,
+            "category": restaurant_category,
+            "nome": nome,
+            "descricao": descricao or None,
+            "preco": preco or None
+        }
+    
+    async def comparar_modos_extracao(self, page, restaurant_id, restaurant_name, restaurant_category):
+        """Benchmark: round trips e tempo da extração item a item x em lote (use com 1 worker)"""
+        with ContadorRoundTrips() as antes:
+            por_item = await self.extrair_produtos_por_item(page, restaurant_id, restaurant_name, restaurant_category)
+        
+        with ContadorRoundTrips() as depois:
+            em_lote = await self.extrair_produtos_lote(page, restaurant_id, restaurant_name, restaurant_category) or []
+        
+        print(DisplayFormatter.section(f"BENCHMARK DE EXTRAÇÃO - {restaurant_name}"))
+        print(DisplayFormatter.stats_table(
+            comparar_execucoes("item a item", antes, "lote", depois, len(por_item))
+        ))
+        
+        divergentes = sum(1 for a, b in zip(por_item, em_lote) if a != b) + abs(len(por_item) - len(em_lote))
+        if divergentes:
+            print(DisplayFormatter.warning(f"{divergentes} produtos diferentes entre os dois modos"))
+        
+        self.logger.info(f"Benchmark extração {restaurant_name}: {antes.total} RT/{antes.tempo:.3f}s (item a item) x "
+                         f"{depois.total} RT/{depois.tempo:.3f}s (lote), {len(por_item)} produtos")
+    
+    async def extrair_produtos_por_item(self, page, restaurant_id, restaurant_name, restaurant_category):
+        """Extração item a item via ElementHandle (modo original, vários round trips por produto)"""
+        # Estratégia 1: Usar seletores específicos
+        produtos = await page.query_selector_all(self.seletores_produtos["container"])
+        
+        if not produtos:
+            # Estratégia 2: Seletores genéricos
+            for container_sel in self.seletores_alternativos["menu_container"]:
+                try:
+                    container = await page.query_selector(container_sel)
+                    if container:
+                        for item_sel in self.seletores_alternativos["produto_item"]:
+                            produtos = await container.query_selector_all(item_sel)
+                            if produtos:
+                                break
+                    if produtos:
+                        break
+                except:
+                    continue
+        
+        if not produtos:
+            # Estratégia 3: Busca ampla
+            produtos = await page.query_selector_all(self.seletores_genericos["busca_ampla"])
+        
+        if not produtos:
+            print(f"{Fore.YELLOW}   ⚠️ Nenhum produto encontrado")
+            return []
+        
+        print(f"{Fore.WHITE}   📦 {len(produtos)} produtos encontrados")
+        
+        dados_coletados = []
+        
+        for i, produto in enumerate(produtos):
+            try:
+                # Coletar nome
+                nome = None
+                for seletor in [self.seletores_produtos["nome"]["principal"], 
+                               self.seletores_produtos["nome"]["alternativo"]]:
                     try:
-                        container = await page.query_selector(container_sel)
-                        if container:
-                            for item_sel in self.seletores_alternativos["produto_item"]:
-                                produtos = await container.query_selector_all(item_sel)
-                                if produtos:
-                                    break
-                        if produtos:
+                        nome_elem = await produto.query_selector(seletor)
+                        if nome_elem:
+                            nome = await nome_elem.inner_text()
                             break
                     except:
                         continue
-            
-            if not produtos:
-                # Estratégia 3: Busca ampla
-                produtos = await page.query_selector_all("li[class*='dish'], li[class*='menu-item'], li[class*='product']")
-            
-            if not produtos:
-                print(f"{Fore.YELLOW}   ⚠️ Nenhum produto encontrado")
-                return []
-            
-            print(f"{Fore.WHITE}   📦 {len(produtos)} produtos encontrados")
-            
-            dados_coletados = []
-            
-            for i, produto in enumerate(produtos):
-                try:
-                    # Coletar nome
-                    nome = "N/A"
-                    for seletor in [self.seletores_produtos["nome"]["principal"], 
-                                   self.seletores_produtos["nome"]["alternativo"]]:
+                
+                # Se não encontrou nome com seletores específicos, tentar genéricos
+                if nome is None:
+                    for nome_sel in self.seletores_genericos["nome"]:
                         try:
-                            nome_elem = await produto.query_selector(seletor)
+                            nome_elem = await produto.query_selector(nome_sel)
                             if nome_elem:
                                 nome = await nome_elem.inner_text()
                                 break
                         except:
                             continue
-                    
-                    # Se não encontrou nome com seletores específicos, tentar genéricos
-                    if nome == "N/A":
-                        for nome_sel in ["h3", "h4", "[class*='name']", "[class*='title']"]:
-                            try:
-                                nome_elem = await produto.query_selector(nome_sel)
-                                if nome_elem:
-                                    nome = await nome_elem.inner_text()
-                                    break
-                            except:
-                                continue
-                    
-                    # Coletar descrição
-                    descricao = "N/A"
-                    for seletor in [self.seletores_produtos["descricao"]["principal"],
-                                   self.seletores_produtos["descricao"]["alternativo"]]:
+                
+                # Coletar descrição
+                descricao = None
+                for seletor in [self.seletores_produtos["descricao"]["principal"],
+                               self.seletores_produtos["descricao"]["alternativo"]]:
+                    try:
+                        desc_elem = await produto.query_selector(seletor)
+                        if desc_elem:
+                            descricao = await desc_elem.inner_text()
+                            break
+                    except:
+                        continue
+                
+                # Se não encontrou descrição, tentar genéricos
+                if descricao is None:
+                    for desc_sel in self.seletores_genericos["descricao"]:
                         try:
-                            desc_elem = await produto.query_selector(seletor)
+                            desc_elem = await produto.query_selector(desc_sel)
                             if desc_elem:
-                                descricao = await desc_elem.inner_text()
-                                break
-                        except:
-                            continue
-                    
-                    # Se não encontrou descrição, tentar genéricos
-                    if descricao == "N/A":
-                        for desc_sel in ["[class*='description']", "[class*='details']", "p", "span"]:
-                            try:
-                                desc_elem = await produto.query_selector(desc_sel)
-                                if desc_elem:
-                                    texto = await desc_elem.inner_text()
-                                    if len(texto) > 10 and not "R$" in texto and texto != nome:
-                                        descricao = texto
-                                        break
-                            except:
-                                continue
-                    
-                    # Coletar preço
-                    preco = "N/A"
-                    for seletor in [self.seletores_produtos["preco"]["principal"],
-                                   self.seletores_produtos["preco"]["alternativo"]]:
-                        try:
-                            preco_elem = await produto.query_selector(seletor)
-                            if preco_elem:
-                                preco = await preco_elem.inner_text()
-                                break
+                                texto = await desc_elem.inner_text()
+                                if len(texto) > 10 and not "R$" in texto and texto != nome:
+                                    descricao = texto
+                                    break
                         except:
                             continue
+                
+                # Coletar preço
+                preco = None
+                for seletor in [self.seletores_produtos["preco"]["principal"],
+                               self.seletores_produtos["preco"]["alternativo"]]:
+                    try:
+                        preco_elem = await produto.query_selector(seletor)
+                        if preco_elem:
+                            preco = await preco_elem.inner_text()
+                            break
+                    except:
+                        continue
+                
+                texto_completo = None
+                if preco is None:
+                    try:
+                        texto_completo = await produto.inner_text()
+                    except:
+                        pass
+                
+                produto_dados = self._montar_produto(
+                    nome, descricao, preco, texto_completo, restaurant_id, restaurant_name, restaurant_category
+                )
+                if produto_dados:
+                    dados_coletados.append(produto_dados)
                     
-                    # Se não encontrou preço, buscar por texto contendo R$
-                    if preco == "N/A":
-                        try:
-                            texto_completo = await produto.inner_text()
-                            if "R$" in texto_completo:
-                                import re
-                                match = re.search(r'R\$\s*(\d+[.,]\d{2})', texto_completo)
-                                if match:
-                                    preco = match.group(0)
-                        except:
-                            pass
-                    
-                    # Só adicionar se tiver pelo menos nome
-                    if nome != "N/A" and len(nome) > 2:
-                        dados_coletados.append({
-                            "restaurant_id": restaurant_id,
-                            "restaurant_name": restaurant_name,
-                            "category": restaurant_category,
-                            "nome": nome,
-                            "descricao": descricao if descricao != "N/A" else None,
-                            "preco": preco if preco != "N/A" else None
-                        })
-                        
-                        if (i + 1) % 10 == 0:
-                            print(f"{Fore.WHITE}   ✅ {i + 1} produtos processados...")
-                    
-                except Exception as e:
-                    self.logger.debug(f"Erro ao processar produto {i+1}: {str(e)}")
-                    continue
-            
-            print(f"{Fore.GREEN}   ✅ {len(dados_coletados)} produtos coletados!")
-            return dados_coletados
-            
-        except Exception as e:
-            self.logger.error(f"Erro ao coletar produtos do restaurante {restaurant_name}: {str(e)}")
-            print(f"{Fore.RED}❌ Erro no restaurante {restaurant_name}: {str(e)}")
-            return []
+                    if (i + 1) % 10 == 0:
+                        print(f"{Fore.WHITE}   ✅ {i + 1} produtos processados...")
+                
+            except Exception as e:
+                self.logger.debug(f"Erro ao processar produto {i+1}: {str(e)}")
+                continue
+        
+        return dados_coletados
     
-    def _verificar_duplicata_produto(self, conn, nome_produto, restaurant_id, category):
-        """Verificar se produto já existe no banco"""
+    @staticmethod
+    def hash_produto(produto):
+        """Hash do item como extraído (nome, descrição e preço ainda em texto)"""
+        return hash_conteudo([produto["nome"], produto["descricao"], produto["preco"]])
+    
+    def salvar_lote_produtos(self, produtos):
+        """Gravar um lote de produtos: cardápio igual ao salvo é ignorado; senão só produtos novos ou alterados;
+        retorna Counter(salvos, atualizados, duplicados, menus_inalterados); falha na gravação é levantada"""
+        conn = self.db_manager._get_connection()
         try:
-            # Verificar por nome + restaurant_id + categoria
-            result = conn.execute("""
-                SELECT id FROM products 
-                WHERE LOWER(TRIM(name)) = LOWER(TRIM(?)) 
-                AND restaurant_id = ?
-                AND LOWER(TRIM(category)) = LOWER(TRIM(?))
-                LIMIT 1
-            """, [nome_produto, restaurant_id, category]).fetchone()
+            contadores = Counter()
+            
+            por_restaurante = defaultdict(list)
+            for produto in produtos:
+                por_restaurante[produto["restaurant_id"]].append(produto)
+            ids = list(por_restaurante)
+            
+            # Cardápio inteiro igual ao último salvo: nada a interpretar nem gravar (hashes em memória na execução)
+            menus_salvos = self.dedupe_cache.menus(conn, ids)
+            hashes_itens = {restaurant_id: [self.hash_produto(p) for p in itens]
+                            for restaurant_id, itens in por_restaurante.items()}
+            alterados = []
+            for restaurant_id, itens in por_restaurante.items():
+                hash_menu = hash_conjunto(hashes_itens[restaurant_id])
+                if menus_salvos.get(restaurant_id) == hash_menu:
+                    contadores["menus_inalterados"] += 1
+                    contadores["duplicados"] += len(itens)
+                else:
+                    alterados.append((restaurant_id, hash_menu))
+            
+            if not alterados:
+                self._registrar_coletas(por_restaurante)
+                return contadores
+            
+            # Produtos dos cardápios alterados: só os que não estão no cache (novos ou alterados) vão ao banco
+            candidatos = []
+            for restaurant_id, _ in alterados:
+                for produto, hash_item in zip(por_restaurante[restaurant_id], hashes_itens[restaurant_id]):
+                    candidatos.append((produto, hash_item, self.dedupe_cache.assinatura_produto(
+                        restaurant_id, produto["nome"], produto["category"], hash_item)))
+            mascara = self.dedupe_cache.filtrar_produtos(conn, [assinatura for _, _, assinatura in candidatos])
+            candidatos = [candidato for candidato, novo in zip(candidatos, mascara) if novo]
+            contadores["duplicados"] += len(mascara) - len(candidatos)
+            
+            if candidatos:
+                # Lote colunar com o preço já numérico (formato BRL: "R$ 1.234,56")
+                linhas = [
+                    (produto["restaurant_id"], produto["restaurant_name"], produto["category"], produto["nome"],
+                     produto["descricao"], text_parsers.interpretar_preco(produto["preco"]), hash_item)
+                    for produto, hash_item, _ in candidatos
+                ]
+                try:
+                    contadores.update(ingerir_produtos(conn, pd.DataFrame(linhas, columns=COLUNAS_PRODUTOS)))
+                except Exception as e:
+                    # Propagar: sem menu_hash gravado e com as tarefas do lote pendentes no checkpoint
+                    self.logger.error(f"Erro ao gravar lote de {len(linhas)} produtos: {str(e)}")
+                    raise
             
-            return result is not None
+            conn.executemany("UPDATE restaurants SET menu_hash = ? WHERE id = ?",
+                             [[hash_menu, restaurant_id] for restaurant_id, hash_menu in alterados])
+            conn.commit()
+            self.dedupe_cache.registrar_produtos(dict(alterados), [assinatura for _, _, assinatura in candidatos])
+            self._registrar_coletas(por_restaurante)
+            return contadores
             
-        except Exception as e:
-            self.logger.debug(f"Erro ao verificar duplicata produto: {str(e)}")
-            return False
-
+        finally:
+            conn.close()
+    
+    def _registrar_coletas(self, por_restaurante):
+        """Anotar no agendador só os cardápios gravados (um lote sempre traz o cardápio inteiro do restaurante)"""
+        for restaurant_id, itens in por_restaurante.items():
+            self.scheduler.registrar("produtos", restaurant_id, self.assinatura_produtos(itens),
+                                     self.duracoes_coleta.pop(restaurant_id, None))
+    
     def salvar_produtos_no_banco(self, produtos):
         """Salvar produtos coletados no banco de dados (evitando duplicatas)"""
         try:
             self.logger.info("Salvando produtos no banco de dados")
-            print(f"\n{Fore.CYAN}💾 Salvando no banco de dados (com verificação anti-duplicatas)...")
+            print(f"\n{Fore.CYAN}💾 Salvando no banco de dados (só cardápios e produtos alterados)...")
             
-            conn = self.db_manager._get_connection()
-            produtos_salvos = 0
-            produtos_duplicados = 0
-            produtos_erros = 0
-            
-            for i, produto in enumerate(produtos):
-                try:
-                    nome = produto["nome"]
-                    restaurant_id = produto["restaurant_id"]
-                    category = produto["category"]
-                    
-                    # NOVO: Verificar se já existe (anti-duplicatas)
-                    if self._verificar_duplicata_produto(conn, nome, restaurant_id, category):
-                        produtos_duplicados += 1
-                        if produtos_duplicados <= 10:  # Mostrar apenas os primeiros 10
-                            print(f"{Fore.YELLOW}   🔄 Duplicata: {nome} ({category}) (já existe)")
-                        elif produtos_duplicados == 11:
-                            print(f"{Fore.YELLOW}   🔄 ... (mais duplicatas encontradas)")
-                        continue
-                    
-                    # Obter próximo ID
-                    result = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 as next_id FROM products").fetchone()
-                    next_id = result[0]
-                    
-                    # Processar preço
-                    preco_num = None
-                    if produto["preco"]:
-                        try:
-                            # Extrair valor numérico (ex: "15.50" de "R$ 15,50")
-                            preco_str = produto["preco"].replace("R$", "").replace(",", ".").strip()
-                            preco_num = float(preco_str) if preco_str else None
-                        except:
-                            preco_num = None
-                    
-                    # Inserir novo produto
-                    conn.execute("""
-                        INSERT INTO products (id, restaurant_id, restaurant_name, category, name, description, price, scraped_at) 
-                        VALUES (?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    """, [next_id, restaurant_id, produto["restaurant_name"], 
-                          category, nome, produto["descricao"], preco_num])
-                    
-                    produtos_salvos += 1
-                    
-                    # Log progresso a cada 100 produtos
-                    if produtos_salvos % 100 == 0:
-                        print(f"{Fore.GREEN}   ✅ {produtos_salvos} novos produtos salvos...")
-                    
-                except Exception as e:
-                    produtos_erros += 1
-                    self.logger.error(f"Erro ao salvar produto {produto.get('nome', 'N/A')}: {str(e)}")
-            
-            conn.commit()
-            conn.close()
-            
-            # Relatório final detalhado
-            total_processados = len(produtos)
-            print(f"\n{Fore.CYAN}📊 RELATÓRIO FINAL:")
-            print(f"{Fore.GREEN}   ✅ Novos produtos salvos: {produtos_salvos}")
-            print(f"{Fore.YELLOW}   🔄 Duplicatas ignoradas: {produtos_duplicados}")
-            if produtos_erros > 0:
-                print(f"{Fore.RED}   ❌ Erros encontrados: {produtos_erros}")
-            print(f"{Fore.WHITE}   📋 Total processados: {total_processados}")
-            
-            eficiencia = (produtos_salvos / total_processados * 100) if total_processados > 0 else 0
-            print(f"{Fore.CYAN}   📈 Taxa de novos dados: {eficiencia:.1f}%")
-            
-            self.logger.info(f"Produtos salvos: {produtos_salvos}/{total_processados} | Duplicatas: {produtos_duplicados}")
+            self.exibir_relatorio_salvamento(self.salvar_lote_produtos(produtos), len(produtos))
             return True
             
         except Exception as e:
@@ -432,6 +639,32 @@ class ProductsScraper:
             print(f"{Fore.RED}❌ Erro ao salvar: {str(e)}")
             return False
     
+    @staticmethod
+    def assinatura_produtos(produtos):
+        """Conteúdo do cardápio que conta como mudança para o agendador (nome e preço)"""
+        return [(produto['nome'], produto['preco']) for produto in produtos]
+    
+    def exibir_relatorio_salvamento(self, contadores, total_processados):
+        """Relatório final do salvamento (contadores de salvar_lote_produtos somados)"""
+        produtos_salvos = contadores["salvos"]
+        produtos_duplicados = contadores["duplicados"]
+        produtos_erros = contadores["erros"]
+        
+        print(f"\n{Fore.CYAN}📊 RELATÓRIO FINAL:")
+        print(f"{Fore.GREEN}   ✅ Novos produtos salvos: {produtos_salvos}")
+        print(f"{Fore.GREEN}   ♻️ Atualizados (preço/descrição mudou): {contadores['atualizados']}")
+        print(f"{Fore.YELLOW}   🔄 Sem mudanças (ignorados): {produtos_duplicados}")
+        if contadores["menus_inalterados"]:
+            print(f"{Fore.YELLOW}   📋 Cardápios idênticos ao último salvo: {contadores['menus_inalterados']}")
+        if produtos_erros > 0:
+            print(f"{Fore.RED}   ❌ Erros encontrados: {produtos_erros}")
+        print(f"{Fore.WHITE}   📋 Total processados: {total_processados}")
+        
+        eficiencia = (produtos_salvos / total_processados * 100) if total_processados > 0 else 0
+        print(f"{Fore.CYAN}   📈 Taxa de novos dados: {eficiencia:.1f}%")
+        
+        self.logger.info(f"Produtos salvos: {produtos_salvos}/{total_processados} | Duplicatas: {produtos_duplicados}")
+    
     def exibir_menu_selecao_produtos(self):
         """Exibir menu para seleção de coleta de produtos"""
         restaurantes_por_categoria = self.obter_restaurantes_por_categoria()
@@ -457,9 +690,13 @@ class ProductsScraper:
                 elif escolha == '1':
                     return self._selecionar_restaurante_especifico()
                 elif escolha == '2':
-                    return self._selecionar_categoria_especifica(restaurantes_por_categoria)
+                    restaurantes, tipo_selecao = self._selecionar_categoria_especifica(restaurantes_por_categoria)
+                    # Coleta em massa: só os restaurantes vencidos (TTL), por prioridade
+                    if restaurantes:
+                        restaurantes = self.scheduler.planejar(restaurantes, "produtos")
+                    return restaurantes, tipo_selecao
                 elif escolha == '3':
-                    todos_restaurantes = self.obter_todos_restaurantes()
+                    todos_restaurantes = self.scheduler.planejar(self.obter_todos_restaurantes(), "produtos")
                     return todos_restaurantes, "todos"
                 else:
                     print(f"{Fore.RED}❌ Opção inválida!")
@@ -564,28 +801,90 @@ class ProductsScraper:
         # Executar scraping
         asyncio.run(self.executar_scraping_produtos(restaurantes_selecionados))
     
-    async def executar_scraping_produtos(self, restaurantes):
-        """Executar scraping de produtos"""
+    async def executar_scraping_produtos_http(self, restaurantes, checkpoint=None):
+        """Coletar cardápios via HTTP direto; retorna os restaurantes que ainda precisam do navegador"""
         tempo_inicio = time.time()
+        fetcher = DirectHttpFetcher(self.config_manager)
+        
+        if not await fetcher.preparar(restaurantes, "catalogo"):
+            print(f"{Fore.YELLOW}⚠️ Endpoint de catálogo indisponível - usando navegador")
+            return restaurantes
+        
+        print(f"\n{Fore.CYAN}⚡ Buscando {len(restaurantes)} cardápios via HTTP direto...")
+        async with fetcher:
+            capturas = await asyncio.gather(*[fetcher.buscar("catalogo", r) for r in restaurantes])
+        
         todos_produtos = []
+        pendentes = []
+        for restaurante, captura in zip(restaurantes, capturas):
+            produtos = captura.produtos(restaurante['id'], restaurante['nome'], restaurante['categoria']) if captura else []
+            if produtos:
+                todos_produtos.extend(produtos)
+            else:
+                pendentes.append(restaurante)
+        
+        salvos = bool(todos_produtos) and self.salvar_produtos_no_banco(todos_produtos)
+        
+        # Já gravados acima: o checkpoint só registra os restaurantes concluídos (se a gravação falhou, ficam
+        # pendentes para o --resume)
+        if checkpoint and salvos:
+            contagem = Counter(produto['restaurant_id'] for produto in todos_produtos)
+            for restaurante in restaurantes:
+                if contagem[restaurante['id']]:
+                    checkpoint.concluir(restaurante, registros=contagem[restaurante['id']])
+            checkpoint.salvar()
+        
+        fetcher.exibir_relatorio(time.time() - tempo_inicio, len(restaurantes))
+        print(f"{Fore.WHITE}   🍽️ {len(todos_produtos)} produtos de {len(restaurantes) - len(pendentes)} restaurantes")
+        if pendentes:
+            print(f"{Fore.YELLOW}   ↪️ {len(pendentes)} restaurantes seguem para o navegador")
+        
+        self.logger.info(f"Modo HTTP direto: {len(todos_produtos)} produtos, {len(pendentes)} restaurantes pendentes")
+        return pendentes
+    
+    async def executar_scraping_produtos(self, restaurantes, run_id=None):
+        """Executar scraping de produtos (run_id: retomar uma execução interrompida)"""
+        # Checkpoint: restaurantes marcados como concluídos depois que seus produtos forem gravados
+        checkpoint = RunCheckpoint.abrir(
+            "produtos", restaurantes, "id", run_id=run_id, config_manager=self.config_manager
+        )
+        restaurantes = checkpoint.pendentes()
+        self.dedupe_cache.reiniciar()
+        
+        # Modo HTTP direto: só os restaurantes sem catálogo via HTTP seguem para o navegador
+        if self.config_manager.get_direct_http_config().get("enabled", False):
+            restaurantes = await self.executar_scraping_produtos_http(restaurantes, checkpoint)
+            if not restaurantes:
+                checkpoint.finalizar()
+                self.scheduler.gravar()
+                input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
+                return
+        
+        tempo_inicio = time.time()
+        contadores = Counter()
+        # Gravação em lotes em segundo plano, sobreposta à navegação
+        writer = BatchWriter(self.salvar_lote_produtos, checkpoint, self.config_manager, "produtos")
+        self.resource_blocker.resetar()
         
         async with async_playwright() as p:
+            await self.proxy_pool.preparar()
             browser = await p.chromium.launch(
                 headless=False,
-                args=['--no-sandbox', '--disable-setuid-sandbox']
+                args=['--no-sandbox', '--disable-setuid-sandbox'],
+                **self.proxy_pool.opcoes_launch()
             )
             
-            context = await browser.new_context(
-                viewport={'width': 1280, 'height': 720},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            )
+            # Sessão localizada (se houver) para o cardápio refletir o endereço de entrega
+            context = await self.context_factory.novo_contexto(browser, self.config_manager.get_default_city())
             
             page = await context.new_page()
+            writer.iniciar()
             
             try:
                 # ETAPA 1: Coletar produtos de cada restaurante
                 for i, restaurante in enumerate(restaurantes, 1):
                     print(f"\n{Fore.MAGENTA}🍴 Restaurante {i}/{len(restaurantes)}: {restaurante['nome']}")
+                    tempo_restaurante = time.time()
                     
                     # Navegar para restaurante
                     sucesso_navegacao = await self.navegar_para_restaurante(page, restaurante)
@@ -599,38 +898,40 @@ class ProductsScraper:
                         page, restaurante['id'], restaurante['nome'], restaurante['categoria']
                     )
                     
-                    todos_produtos.extend(produtos_restaurante)
+                    # Gravados em segundo plano (não ficam todos em memória até o fim); o agendador só anota a
+                    # coleta quando o lote for gravado
+                    if produtos_restaurante:
+                        self.duracoes_coleta[restaurante['id']] = time.time() - tempo_restaurante
+                    await writer.enviar(produtos_restaurante)
+                    await writer.concluir(restaurante, len(produtos_restaurante))
+                    contadores[restaurante['nome']] += len(produtos_restaurante)
                     
                     print(f"{Fore.GREEN}✅ {len(produtos_restaurante)} produtos coletados")
-                    
-                    # Pausa entre restaurantes
-                    if i < len(restaurantes):
-                        await asyncio.sleep(2)
                 
-                # ETAPA 2: Salvar no banco
-                if todos_produtos:
-                    self.salvar_produtos_no_banco(todos_produtos)
+                # ETAPA 2: Aguardar a gravação do que ainda está na fila
+                await writer.fechar()
+                total_produtos = sum(contadores.values())
+                if total_produtos:
+                    self.exibir_relatorio_salvamento(writer.contadores, total_produtos)
+                    writer.exibir_relatorio()
                     
                     # Relatório final
                     tempo_total = time.time() - tempo_inicio
-                    performance = len(todos_produtos) / tempo_total if tempo_total > 0 else 0
+                    performance = total_produtos / tempo_total if tempo_total > 0 else 0
                     
                     print(f"\n{Fore.YELLOW}📊 RESUMO DA COLETA:")
                     print(f"{Fore.WHITE}   ⏱️ Tempo total: {tempo_total:.2f}s")
                     print(f"{Fore.WHITE}   🍴 Restaurantes processados: {len(restaurantes)}")
-                    print(f"{Fore.WHITE}   🍽️ Produtos coletados: {len(todos_produtos)}")
+                    print(f"{Fore.WHITE}   🍽️ Produtos coletados: {total_produtos}")
                     print(f"{Fore.WHITE}   🚀 Performance: {performance:.1f} produtos/segundo")
                     print(f"{Fore.WHITE}   💾 Status: Salvo no banco de dados")
                     
                     # Estatísticas por restaurante
                     print(f"\n{Fore.CYAN}📋 PRODUTOS POR RESTAURANTE:")
-                    from collections import Counter
-                    contadores = Counter(p['restaurant_name'] for p in todos_produtos)
-                    
                     for restaurante, count in contadores.items():
                         print(f"{Fore.WHITE}   • {restaurante}: {count} produtos")
                     
-                    self.logger.info(f"Scraping de produtos concluído: {len(todos_produtos)} produtos em {tempo_total:.2f}s")
+                    self.logger.info(f"Scraping de produtos concluído: {total_produtos} produtos em {tempo_total:.2f}s")
                 else:
                     print(f"\n{Fore.YELLOW}⚠️ Nenhum produto foi coletado")
                 
@@ -639,8 +940,15 @@ class ProductsScraper:
                 print(f"\n{Fore.RED}❌ Erro durante scraping: {str(e)}")
                 
             finally:
+                await writer.fechar()
+                checkpoint.finalizar()
+                self.scheduler.gravar()
                 await browser.close()
                 print(f"\n{Fore.CYAN}🔒 Navegador fechado")
+                self.resource_blocker.exibir_relatorio()
+                self.context_factory.exibir_relatorio()
+                self.retry_policy.exibir_relatorio()
+                self.limitador.exibir_relatorio()
                 input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
     
     # Método de compatibilidade com a estrutura existente
@@ -0,0 +1,204 @@
+"""
+Pool de proxies com verificação de saúde, pontuação por latência/erros e quarentena (cooldown)
+"""
+import asyncio
+import itertools
+import random
+import time
+from urllib.parse import urlsplit
+import httpx
+from colorama import Fore
+from src.utils.logger import get_logger
+from src.config.config_manager import ConfigManager
+
+# Um pool por processo (métricas compartilhadas por todos os contextos/clientes do processo)
+_pool = None
+
+
+def obter_pool(config_manager=None):
+    """Obter (ou criar) o pool de proxies do processo"""
+    global _pool
+    if _pool is None:
+        _pool = ProxyPool(config_manager)
+    return _pool
+
+
+class EstadoProxy:
+    """Métricas de um proxy: latência média móvel, sucessos/falhas e fim da quarentena"""
+
+    def __init__(self, url):
+        self.url = url
+        self.latencia_ms = None
+        self.sucessos = 0
+        self.falhas = 0
+        self.falhas_seguidas = 0
+        self.bloqueado_ate = 0.0
+
+    @property
+    def taxa_erro(self):
+        total = self.sucessos + self.falhas
+        return self.falhas / total if total else 0.0
+
+    def em_quarentena(self, agora=None):
+        return (agora or time.time()) < self.bloqueado_ate
+
+
+class ProxyPool:
+    """Escolhe o proxy de cada contexto do navegador / cliente HTTP conforme a rotação configurada"""
+
+    # Status que indicam proxy bloqueado ou recusado pelo destino
+    STATUS_FALHA = {403, 407, 429}
+
+    def __init__(self, config_manager=None):
+        self.logger = get_logger()
+        self.config_manager = config_manager or ConfigManager()
+        config = self.config_manager.get_scraping_config().get("proxies", {})
+
+        self.habilitado = bool(config.get("enabled", False) and config.get("list"))
+        self.rotacao = config.get("rotation", "random")  # random, sequential, best
+        self.url_teste = config.get("test_url", "https://www.ifood.com.br")
+        self.timeout_teste = config.get("test_timeout", 10)
+        self.cooldown = config.get("cooldown_s", 300)
+        self.max_falhas = config.get("max_failures", 2)
+
+        self.estados = {url: EstadoProxy(url) for url in config.get("list", [])}
+        self._ciclo = itertools.cycle(list(self.estados))
+        self._verificado = False
+
+    def pontuacao(self, estado):
+        """Menor é melhor: latência (ou o timeout, se desconhecida) penalizada pela taxa de erro"""
+        latencia = estado.latencia_ms if estado.latencia_ms is not None else self.timeout_teste * 1000
+        return latencia * (1 + 4 * estado.taxa_erro)
+
+    def registrar_sucesso(self, proxy, latencia_s):
+        """Atualizar latência (média móvel) e zerar falhas seguidas"""
+        estado = self.estados.get(proxy)
+        if estado is None:
+            return
+        latencia_ms = latencia_s * 1000
+        estado.latencia_ms = latencia_ms if estado.latencia_ms is None else 0.7 * estado.latencia_ms + 0.3 * latencia_ms
+        estado.sucessos += 1
+        estado.falhas_seguidas = 0
+
+    def registrar_falha(self, proxy, motivo=""):
+        """Contar falha; após max_failures seguidas o proxy fica em quarentena até o cooldown expirar"""
+        estado = self.estados.get(proxy)
+        if estado is None:
+            return
+        estado.falhas += 1
+        estado.falhas_seguidas += 1
+        if estado.falhas_seguidas >= self.max_falhas and not estado.em_quarentena():
+            estado.bloqueado_ate = time.time() + self.cooldown
+            self.logger.warning(f"Proxy {self._mascarar(proxy)} em quarentena por {self.cooldown}s ({motivo})")
+
+    @staticmethod
+    def proxy_httpx(proxy):
+        """URL do proxy no formato do transporte httpx (o httpx 0.25 só aceita httpx.Proxy, não a string)"""
+        return httpx.Proxy(proxy) if proxy else None
+
+    async def _verificar(self, estado):
+        """Requisição de teste pelo proxy (conta como sucesso/falha)"""
+        inicio = time.perf_counter()
+        try:
+            async with httpx.AsyncClient(transport=httpx.AsyncHTTPTransport(proxy=self.proxy_httpx(estado.url)),
+                                         timeout=self.timeout_teste, follow_redirects=True) as cliente:
+                resposta = await cliente.get(self.url_teste)
+            if resposta.status_code in self.STATUS_FALHA or resposta.status_code >= 500:
+                self.registrar_falha(estado.url, f"HTTP {resposta.status_code}")
+                return False
+            self.registrar_sucesso(estado.url, time.perf_counter() - inicio)
+            return True
+        except Exception as e:
+            self.registrar_falha(estado.url, type(e).__name__)
+            return False
+
+    async def verificar_todos(self):
+        """Testar todos os proxies em paralelo; proxies com falha vão direto para a quarentena"""
+        if not self.estados:
+            return {}
+        resultados = await asyncio.gather(*[self._verificar(estado) for estado in self.estados.values()])
+        for estado, saudavel in zip(self.estados.values(), resultados):
+            if not saudavel and not estado.em_quarentena():
+                estado.bloqueado_ate = time.time() + self.cooldown
+        self._verificado = True
+        return dict(zip(self.estados, resultados))
+
+    async def preparar(self):
+        """Verificação única por processo antes de abrir contextos/clientes"""
+        if self.habilitado and not self._verificado:
+            await self.verificar_todos()
+            saudaveis = len(self.saudaveis())
+            print(f"{Fore.CYAN}🧭 Proxies saudáveis: {saudaveis}/{len(self.estados)}")
+
+    def saudaveis(self):
+        """Proxies fora de quarentena"""
+        agora = time.time()
+        return [estado for estado in self.estados.values() if not estado.em_quarentena(agora)]
+
+    def escolher(self):
+        """Proxy para um novo contexto/cliente conforme a rotação (None se desabilitado)"""
+        if not self.habilitado:
+            return None
+
+        candidatos = self.saudaveis()
+        if not candidatos:
+            # Todos em quarentena: usa o que sai primeiro (melhor que expor o IP da máquina)
+            estado = min(self.estados.values(), key=lambda e: e.bloqueado_ate)
+            self.logger.warning(f"Todos os proxies em quarentena - usando {self._mascarar(estado.url)}")
+            return estado.url
+
+        if self.rotacao == "best":
+            return min(candidatos, key=self.pontuacao).url
+        if self.rotacao == "sequential":
+            urls = {estado.url for estado in candidatos}
+            for url in self._ciclo:
+                if url in urls:
+                    return url
+        # random: sorteio ponderado pela pontuação (melhores saem mais)
+        pesos = [1 / max(1.0, self.pontuacao(estado)) for estado in candidatos]
+        return random.choices(candidatos, weights=pesos)[0].url
+
+    @staticmethod
+    def opcoes_proxy_playwright(proxy):
+        """Converter URL do proxy (com usuário/senha opcionais) para o formato do Playwright"""
+        partes = urlsplit(proxy)
+        opcoes = {"server": f"{partes.scheme}://{partes.hostname}:{partes.port}" if partes.port
+                  else f"{partes.scheme}://{partes.hostname}"}
+        if partes.username:
+            opcoes["username"] = partes.username
+            opcoes["password"] = partes.password or ""
+        return opcoes
+
+    def opcoes_launch(self):
+        """Opções extras para chromium.launch() (proxy definido por contexto)"""
+        return {"proxy": {"server": "per-context"}} if self.habilitado else {}
+
+    def opcoes_contexto(self, proxy):
+        """Opções extras para browser.new_context() com o proxy escolhido (escolher())"""
+        return {"proxy": self.opcoes_proxy_playwright(proxy)} if proxy else {}
+
+    def registrar_resposta(self, proxy, status, latencia_s=None):
+        """Resultado de uma resposta servida pelo proxy no navegador: bloqueio conta como falha, o resto como
+        sucesso quando há latência medida"""
+        if status in self.STATUS_FALHA:
+            self.registrar_falha(proxy, f"HTTP {status}")
+        elif latencia_s is not None:
+            self.registrar_sucesso(proxy, latencia_s)
+
+    @staticmethod
+    def _mascarar(proxy):
+        """URL do proxy sem credenciais (para logs)"""
+        partes = urlsplit(proxy)
+        return f"{partes.scheme}://{partes.hostname}:{partes.port}" if partes.port else proxy
+
+    def exibir_relatorio(self):
+        """Tabela de saúde dos proxies"""
+        if not self.estados:
+            return
+        print(f"\n{Fore.CYAN}🧭 PROXIES (rotação: {self.rotacao}):")
+        for estado in sorted(self.estados.values(), key=self.pontuacao):
+            latencia = f"{estado.latencia_ms:.0f}ms" if estado.latencia_ms is not None else "N/A"
+            situacao = (f"{Fore.RED}quarentena ({estado.bloqueado_ate - time.time():.0f}s)"
+                        if estado.em_quarentena() else f"{Fore.GREEN}ativo")
+            print(f"{Fore.WHITE}   • {self._mascarar(estado.url)}: {latencia} | "
+                  f"{estado.sucessos} ok / {estado.falhas} falhas | {situacao}")
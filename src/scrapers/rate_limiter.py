@@ -0,0 +1,157 @@
+"""
+Limitador de taxa global: token bucket por host compartilhado entre tarefas asyncio e processos
+"""
+import asyncio
+import json
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from urllib.parse import urlsplit
+from colorama import Fore
+from src.utils.logger import get_logger
+from src.config.config_manager import ConfigManager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Um limitador por processo (entre processos o estado é compartilhado pelos arquivos de trava)
+_limitador = None
+
+
+def obter_limitador(config_manager=None):
+    """Obter (ou criar) o limitador do processo"""
+    global _limitador
+    if _limitador is None:
+        _limitador = RateLimiter(config_manager)
+    return _limitador
+
+
+class RateLimiter:
+    """Token bucket por host: ritmo = 1 / request_interval, com rajada configurável"""
+
+    def __init__(self, config_manager=None):
+        self.logger = get_logger()
+        self.config_manager = config_manager or ConfigManager()
+        config = self.config_manager.get_rate_limit_config()
+
+        self.habilitado = config.get("enabled", True)
+        self.intervalo = float(self.config_manager.get_request_interval())
+        self.rajada = max(1, int(config.get("burst", 1)))
+        self.backend = config.get("backend", "file")  # file (entre processos), memory (só este processo)
+        self.diretorio = Path(config.get("dir", "data/ratelimit"))
+        self.hosts = config.get("hosts", {})
+
+        self._baldes = {}
+        self.stats = defaultdict(Counter)
+
+    @staticmethod
+    def _host(url):
+        """Host da URL (o próprio texto se não for URL)"""
+        return urlsplit(url).hostname or url
+
+    def _parametros(self, host):
+        """(intervalo, rajada) do host - sobrescritos em rate_limit.hosts"""
+        especifico = self.hosts.get(host, {})
+        return float(especifico.get("interval", self.intervalo)), max(1, int(especifico.get("burst", self.rajada)))
+
+    @staticmethod
+    def _consumir(estado, agora, intervalo, rajada):
+        """Retirar um token reservando a vez: o saldo pode ficar negativo e a espera é o tempo até voltar a zero"""
+        tokens, atualizado = estado if estado else (rajada, agora)
+        tokens = min(rajada, tokens + max(0.0, agora - atualizado) / intervalo) - 1
+        espera = -tokens * intervalo if tokens < 0 else 0.0
+        return (tokens, agora), espera
+
+    def _reservar_memoria(self, host, intervalo, rajada):
+        """Backend em memória (tarefas asyncio do mesmo processo)"""
+        self._baldes[host], espera = self._consumir(self._baldes.get(host), time.time(), intervalo, rajada)
+        return espera
+
+    @staticmethod
+    def _travar(arquivo):
+        if fcntl:
+            fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX)
+        else:
+            arquivo.seek(0)
+            msvcrt.locking(arquivo.fileno(), msvcrt.LK_LOCK, 1)
+
+    @staticmethod
+    def _destravar(arquivo):
+        if fcntl:
+            fcntl.flock(arquivo.fileno(), fcntl.LOCK_UN)
+        else:
+            arquivo.seek(0)
+            msvcrt.locking(arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _reservar_arquivo(self, host, intervalo, rajada):
+        """Backend em arquivo com trava exclusiva (workers em processos separados)"""
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        caminho = self.diretorio / f"{re.sub(r'[^A-Za-z0-9.-]', '_', host)}.json"
+
+        # Seção crítica curta (ler, consumir, gravar): não cede o event loop
+        with os.fdopen(os.open(caminho, os.O_RDWR | os.O_CREAT), "r+", encoding="utf-8") as arquivo:
+            self._travar(arquivo)
+            try:
+                arquivo.seek(0)
+                try:
+                    dados = json.loads(arquivo.read() or "null")
+                except ValueError:
+                    dados = None
+                estado = (dados["tokens"], dados["atualizado"]) if dados else None
+
+                (tokens, atualizado), espera = self._consumir(estado, time.time(), intervalo, rajada)
+
+                arquivo.seek(0)
+                arquivo.truncate()
+                json.dump({"tokens": tokens, "atualizado": atualizado}, arquivo)
+                arquivo.flush()
+            finally:
+                self._destravar(arquivo)
+
+        return espera
+
+    async def aguardar(self, url):
+        """Reservar a vez no host da URL e aguardar até ela (retorna os segundos esperados)"""
+        if not self.habilitado:
+            return 0.0
+
+        host = self._host(url)
+        intervalo, rajada = self._parametros(host)
+        if intervalo <= 0:
+            return 0.0
+
+        try:
+            if self.backend == "file":
+                espera = self._reservar_arquivo(host, intervalo, rajada)
+            else:
+                espera = self._reservar_memoria(host, intervalo, rajada)
+        except OSError as e:
+            self.logger.warning(f"Trava do limitador indisponível ({str(e)}) - limitando só este processo")
+            espera = self._reservar_memoria(host, intervalo, rajada)
+
+        self.stats[host]["requisicoes"] += 1
+        if espera > 0:
+            self.stats[host]["esperas"] += 1
+            self.stats[host]["espera_ms"] += int(espera * 1000)
+            await asyncio.sleep(espera)
+        return espera
+
+    async def goto(self, page, url, **kwargs):
+        """page.goto passando pelo limitador"""
+        await self.aguardar(url)
+        return await page.goto(url, **kwargs)
+
+    def exibir_relatorio(self):
+        """Resumo das requisições limitadas por host"""
+        if not self.habilitado or not self.stats:
+            return
+
+        print(f"\n{Fore.CYAN}⏱️ LIMITE DE TAXA ({1 / self.intervalo if self.intervalo > 0 else 0:.2f} req/s, rajada {self.rajada}):")
+        for host, stats in self.stats.items():
+            print(f"{Fore.WHITE}   🌐 {host}: {stats['requisicoes']} requisições | "
+                  f"{stats['esperas']} aguardaram ({stats['espera_ms'] / 1000:.1f}s no total)")
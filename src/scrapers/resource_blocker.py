@@ -0,0 +1,182 @@
+"""
+Perfil de bloqueio de recursos de rede para os scrapers Playwright
+"""
+from collections import Counter
+from colorama import Fore
+from src.utils.logger import get_logger
+from src.config.config_manager import ConfigManager
+
+class ResourceBlocker:
+    """Intercepta requisições do contexto e aborta o que não é necessário para ler o DOM"""
+
+    # Tamanho médio aproximado por tipo de recurso (requisições abortadas não informam tamanho)
+    ESTIMATIVA_BYTES_POR_TIPO = {
+        "image": 35 * 1024,
+        "media": 400 * 1024,
+        "font": 45 * 1024,
+        "stylesheet": 30 * 1024,
+        "script": 60 * 1024,
+        "xhr": 5 * 1024,
+        "fetch": 5 * 1024,
+        "other": 10 * 1024
+    }
+
+    # Desliga animações e transições (menos trabalho de layout/paint e elementos estáveis mais cedo)
+    SCRIPT_SEM_ANIMACOES = """
+        (() => {
+            const css = `*, *::before, *::after {
+                animation-duration: 0s !important;
+                animation-delay: 0s !important;
+                transition-duration: 0s !important;
+                transition-delay: 0s !important;
+                scroll-behavior: auto !important;
+            }`;
+            const injetar = () => {
+                const style = document.createElement('style');
+                style.setAttribute('data-ifood-scraper', 'sem-animacoes');
+                style.textContent = css;
+                (document.head || document.documentElement).appendChild(style);
+            };
+            if (document.documentElement) {
+                injetar();
+            } else {
+                document.addEventListener('DOMContentLoaded', injetar, { once: true });
+            }
+        })();
+    """
+
+    def __init__(self, config_manager=None):
+        self.logger = get_logger()
+        config = (config_manager or ConfigManager()).get_network_config()
+
+        self.habilitado = config.get("block_resources", True)
+        self.tipos_bloqueados = set(config.get("blocked_resource_types", ["image", "media", "font"]))
+        self.padroes_url = [padrao.lower() for padrao in config.get("blocked_url_patterns", [])]
+        self.desabilitar_animacoes = config.get("disable_animations", True)
+
+        self.resetar()
+
+    def resetar(self):
+        """Zerar estatísticas da execução"""
+        self.stats = {
+            "permitidas": 0,
+            "bloqueadas": 0,
+            "bloqueadas_por_motivo": Counter(),
+            "bytes_economizados_estimados": 0,
+            "bytes_recebidos": 0
+        }
+
+    def opcoes_contexto(self):
+        """Opções extras para browser.new_context()"""
+        if self.desabilitar_animacoes:
+            return {"reduced_motion": "reduce"}
+        return {}
+
+    async def aplicar(self, context):
+        """Registrar interceptação e injeção de CSS em um contexto"""
+        if self.habilitado:
+            await context.route("**/*", self._interceptar)
+
+        if self.desabilitar_animacoes:
+            await context.add_init_script(self.SCRIPT_SEM_ANIMACOES)
+
+        context.on("response", self._registrar_resposta)
+
+    def _motivo_bloqueio(self, request):
+        """Retornar motivo do bloqueio ou None se a requisição deve seguir"""
+        if request.resource_type in self.tipos_bloqueados:
+            return request.resource_type
+
+        url = request.url.lower()
+        for padrao in self.padroes_url:
+            if padrao in url:
+                return f"url:{padrao}"
+
+        return None
+
+    async def _interceptar(self, route):
+        """Handler de rota: abortar ou continuar a requisição"""
+        request = route.request
+        motivo = self._motivo_bloqueio(request)
+
+        try:
+            if motivo:
+                self.stats["bloqueadas"] += 1
+                self.stats["bloqueadas_por_motivo"][motivo] += 1
+                self.stats["bytes_economizados_estimados"] += self.ESTIMATIVA_BYTES_POR_TIPO.get(
+                    request.resource_type, self.ESTIMATIVA_BYTES_POR_TIPO["other"]
+                )
+                await route.abort("blockedbyclient")
+            else:
+                self.stats["permitidas"] += 1
+                await route.continue_()
+        except Exception as e:
+            # Página fechada no meio da requisição
+            self.logger.debug(f"Erro ao interceptar {request.url[:80]}: {str(e)}")
+
+    def _registrar_resposta(self, response):
+        """Somar bytes recebidos (pelo Content-Length, quando informado)"""
+        try:
+            tamanho = response.headers.get("content-length")
+            if tamanho:
+                self.stats["bytes_recebidos"] += int(tamanho)
+        except Exception:
+            pass
+
+    def resumo(self):
+        """Estatísticas serializáveis (para somar entre processos)"""
+        return {
+            "permitidas": self.stats["permitidas"],
+            "bloqueadas": self.stats["bloqueadas"],
+            "bloqueadas_por_motivo": dict(self.stats["bloqueadas_por_motivo"]),
+            "bytes_economizados_estimados": self.stats["bytes_economizados_estimados"],
+            "bytes_recebidos": self.stats["bytes_recebidos"]
+        }
+
+    @staticmethod
+    def somar_resumos(resumos):
+        """Combinar resumos de vários workers"""
+        total = {
+            "permitidas": 0,
+            "bloqueadas": 0,
+            "bloqueadas_por_motivo": Counter(),
+            "bytes_economizados_estimados": 0,
+            "bytes_recebidos": 0
+        }
+        for resumo in resumos:
+            if not resumo:
+                continue
+            for chave in ("permitidas", "bloqueadas", "bytes_economizados_estimados", "bytes_recebidos"):
+                total[chave] += resumo.get(chave, 0)
+            total["bloqueadas_por_motivo"].update(resumo.get("bloqueadas_por_motivo", {}))
+        total["bloqueadas_por_motivo"] = dict(total["bloqueadas_por_motivo"])
+        return total
+
+    @staticmethod
+    def _formatar_bytes(tamanho):
+        """Formatar bytes em unidade legível"""
+        for unidade in ['B', 'KB', 'MB', 'GB']:
+            if tamanho < 1024.0:
+                return f"{tamanho:.1f}{unidade}"
+            tamanho /= 1024.0
+        return f"{tamanho:.1f}TB"
+
+    def exibir_relatorio(self, resumo=None):
+        """Exibir requisições e bytes economizados na execução"""
+        resumo = resumo or self.resumo()
+        total = resumo["permitidas"] + resumo["bloqueadas"]
+
+        if not self.habilitado or total == 0:
+            return
+
+        percentual = resumo["bloqueadas"] / total * 100
+
+        print(f"\n{Fore.CYAN}🛡️ BLOQUEIO DE RECURSOS:")
+        print(f"{Fore.WHITE}   🚫 Requisições bloqueadas: {resumo['bloqueadas']}/{total} ({percentual:.1f}%)")
+        for motivo, count in sorted(resumo["bloqueadas_por_motivo"].items(), key=lambda item: -item[1])[:6]:
+            print(f"{Fore.WHITE}      • {motivo}: {count}")
+        print(f"{Fore.WHITE}   💾 Banda economizada (estimada): {self._formatar_bytes(resumo['bytes_economizados_estimados'])}")
+        print(f"{Fore.WHITE}   📥 Banda recebida (Content-Length): {self._formatar_bytes(resumo['bytes_recebidos'])}")
+
+        self.logger.info(f"Bloqueio de recursos: {resumo['bloqueadas']}/{total} requisições, "
+                         f"~{resumo['bytes_economizados_estimados']} bytes economizados")
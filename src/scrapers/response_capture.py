@@ -0,0 +1,226 @@
+"""
+Captura das respostas JSON (XHR/fetch) do iFood para extrair restaurantes e produtos sem DOM
+"""
+import asyncio
+import time
+import weakref
+from src.utils.logger import get_logger
+from src.config.config_manager import ConfigManager
+
+# Uma captura por página (páginas fechadas saem do dicionário sozinhas)
+_capturas = weakref.WeakKeyDictionary()
+
+
+def obter_captura(page, config_manager=None):
+    """Obter (ou criar e registrar) a captura de respostas da página"""
+    captura = _capturas.get(page)
+    if captura is None:
+        captura = ResponseCapture(config_manager)
+        captura.anexar(page)
+        _capturas[page] = captura
+    return captura
+
+
+class ResponseCapture:
+    """Registra payloads JSON das APIs de merchants/catálogo e converte em registros do scraper"""
+
+    # Chaves que identificam um merchant nas respostas (formatos v1 e cardstack)
+    CHAVES_RESTAURANTE = ("userRating", "deliveryFee", "deliveryInfo", "mainCategory", "deliveryTime")
+
+    # Subárvores que não são pratos (complementos/opcionais também têm description + unitPrice)
+    CHAVES_IGNORADAS = {"choices", "garnishItens", "garnishItems", "complements"}
+
+    def __init__(self, config_manager=None):
+        self.logger = get_logger()
+        config = (config_manager or ConfigManager()).get_capture_config()
+
+        self.habilitado = config.get("enabled", True)
+        self.padroes_url = [padrao.lower() for padrao in config.get("url_patterns", [])]
+        self.timeout = config.get("timeout", 5)
+        self.payloads = []
+        self._pendentes = set()
+
+    @classmethod
+    def de_payloads(cls, payloads, config_manager=None):
+        """Captura montada a partir de payloads já obtidos (ex.: modo HTTP direto)"""
+        captura = cls(config_manager)
+        captura.payloads = list(payloads)
+        return captura
+
+    def anexar(self, page):
+        """Começar a escutar as respostas da página"""
+        if self.habilitado:
+            page.on("response", self._ao_receber)
+
+    def limpar(self):
+        """Descartar payloads anteriores (chamar antes de cada navegação)"""
+        self.payloads = []
+
+    def _ao_receber(self, response):
+        """Handler de resposta: agenda a leitura do corpo se for JSON de uma API de interesse"""
+        try:
+            url = response.url.lower()
+            if not any(padrao in url for padrao in self.padroes_url):
+                return
+            if "json" not in response.headers.get("content-type", ""):
+                return
+
+            tarefa = asyncio.ensure_future(self._ler(response))
+            self._pendentes.add(tarefa)
+            tarefa.add_done_callback(self._pendentes.discard)
+        except Exception as e:
+            self.logger.debug(f"Erro ao registrar resposta: {str(e)}")
+
+    async def _ler(self, response):
+        """Ler o corpo JSON da resposta"""
+        try:
+            self.payloads.append({
+                "url": response.url,
+                "headers": response.request.headers,
+                "dados": await response.json()
+            })
+        except Exception as e:
+            # Corpo indisponível (redirect, página fechada) ou JSON inválido
+            self.logger.debug(f"Resposta ignorada {response.url[:80]}: {str(e)}")
+
+    async def aguardar(self, extrator, timeout=None):
+        """Aguardar até o extrator devolver registros (ou estourar o timeout); retorna os registros"""
+        if not self.habilitado:
+            return []
+
+        limite = time.time() + (self.timeout if timeout is None else timeout)
+        while True:
+            if self._pendentes:
+                await asyncio.wait(list(self._pendentes), timeout=max(0.0, limite - time.time()))
+
+            registros = extrator()
+            if registros or time.time() >= limite:
+                return registros
+            await asyncio.sleep(0.25)
+
+    @classmethod
+    def _percorrer(cls, obj):
+        """Percorrer todos os dicionários do JSON (qualquer profundidade)"""
+        pilha = [obj]
+        while pilha:
+            atual = pilha.pop()
+            if isinstance(atual, dict):
+                yield atual
+                pilha.extend(reversed([valor for chave, valor in atual.items() if chave not in cls.CHAVES_IGNORADAS]))
+            elif isinstance(atual, list):
+                pilha.extend(reversed(atual))
+
+    def _merchants(self):
+        """Merchants encontrados nos payloads (sem repetição)"""
+        vistos = set()
+        for payload in self.payloads:
+            for item in self._percorrer(payload["dados"]):
+                if not item.get("name") or not any(chave in item for chave in self.CHAVES_RESTAURANTE):
+                    continue
+                chave = item.get("id") or item["name"]
+                if chave not in vistos:
+                    vistos.add(chave)
+                    yield item
+
+    def _itens_cardapio(self):
+        """Itens de cardápio encontrados nos payloads (sem repetição)"""
+        vistos = set()
+        for payload in self.payloads:
+            for item in self._percorrer(payload["dados"]):
+                if "unitPrice" in item and item.get("description"):
+                    # Catálogo: description = nome do prato, details = descrição
+                    nome, descricao, preco = item["description"], item.get("details"), item.get("unitPrice")
+                elif item.get("name") and "price" in item and not any(c in item for c in self.CHAVES_RESTAURANTE):
+                    preco = item["price"]
+                    if isinstance(preco, dict):
+                        preco = preco.get("value")
+                    nome, descricao = item["name"], item.get("description")
+                else:
+                    continue
+
+                chave = item.get("id") or item.get("code") or nome
+                if chave not in vistos:
+                    vistos.add(chave)
+                    yield nome, descricao, preco
+
+    @staticmethod
+    def _numero(valor):
+        """Converter para float (None se não numérico)"""
+        try:
+            return float(valor)
+        except (TypeError, ValueError):
+            return None
+
+    def restaurantes(self, categoria_nome, categoria_url, base_url):
+        """Merchants capturados no formato de coletar_restaurantes_categoria"""
+        registros = []
+
+        for merchant in self._merchants():
+            rating = self._numero(merchant.get("userRating"))
+
+            delivery_time = "N/A"
+            entrega = merchant.get("deliveryInfo") or {}
+            if merchant.get("deliveryTime") is not None:
+                delivery_time = int(merchant["deliveryTime"])
+            elif entrega.get("timeMinMinutes") is not None and entrega.get("timeMaxMinutes") is not None:
+                delivery_time = (int(entrega["timeMinMinutes"]) + int(entrega["timeMaxMinutes"])) // 2
+
+            # deliveryFee.value em reais (v1) / deliveryInfo.fee em centavos (cardstack)
+            taxa = None
+            if isinstance(merchant.get("deliveryFee"), dict):
+                taxa = self._numero(merchant["deliveryFee"].get("value"))
+            elif entrega.get("fee") is not None:
+                taxa = self._numero(entrega["fee"])
+                taxa = taxa / 100 if taxa is not None else None
+
+            distancia = self._numero(merchant.get("distance"))
+            reviews = merchant.get("userRatingCount") or merchant.get("reviewsCount")
+            min_order = self._numero(merchant.get("minimumOrderValue") or merchant.get("minimumOrder"))
+
+            link = "N/A"
+            if merchant.get("slug") and merchant.get("id"):
+                link = f"{base_url}/delivery/{merchant['slug']}/{merchant['id']}"
+
+            registros.append({
+                "nome": merchant["name"],
+                "categoria": categoria_nome,
+                "rating": str(round(rating, 2)) if rating is not None else "N/A",
+                "tipo_comida": merchant.get("mainCategory") or "N/A",
+                "distancia": f"{distancia:.1f} km" if distancia is not None else "N/A",
+                "taxa_entrega": "0" if taxa == 0 else (f"{taxa:.2f}" if taxa is not None else "N/A"),
+                "delivery_time": delivery_time,
+                "reviews": int(reviews) if reviews is not None else "N/A",
+                "min_order": min_order if min_order is not None else "N/A",
+                "link_restaurante": link,
+                "categoria_url": categoria_url
+            })
+
+        return registros
+
+    def info_extra(self):
+        """(reviews, pedido mínimo) do merchant capturado - None quando ausente"""
+        for merchant in self._merchants():
+            reviews = merchant.get("userRatingCount") or merchant.get("reviewsCount")
+            min_order = self._numero(merchant.get("minimumOrderValue") or merchant.get("minimumOrder"))
+            if reviews is not None or min_order is not None:
+                return (int(reviews) if reviews is not None else None), min_order
+        return None, None
+
+    def produtos(self, restaurant_id, restaurant_name, restaurant_category):
+        """Itens de cardápio capturados no formato de coletar_produtos_restaurante"""
+        registros = []
+
+        for nome, descricao, preco in self._itens_cardapio():
+            if len(nome) <= 2:
+                continue
+            preco = self._numero(preco)
+            registros.append({
+                "restaurant_id": restaurant_id,
+                "restaurant_name": restaurant_name,
+                "category": restaurant_category,
+                "nome": nome,
+                "descricao": descricao or None,
+                "preco": f"R$ {preco:.2f}" if preco is not None else None
+            })
+
+        return registros
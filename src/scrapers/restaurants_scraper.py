@@ -3,21 +3,189 @@ Scraper de restaurantes por categoria
 """
 import asyncio
 import time
+from collections import Counter
 from datetime import datetime
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 from colorama import Fore, Style
 from src.utils.logger import get_logger
 from src.database.db_manager import DatabaseManager
 from src.config.config_manager import ConfigManager
+from src.scrapers.resource_blocker import ResourceBlocker
+from src.scrapers.session_cache import LocationSessionCache
+from src.scrapers.response_capture import obter_captura
+from src.scrapers.page_readiness import PageReadiness
+from src.scrapers.rate_limiter import obter_limitador
+from src.scrapers.retry_policy import obter_politica, transitorio
+from src.scrapers.proxy_pool import obter_pool
+from src.scrapers.context_factory import ContextFactory
+from src.scrapers.checkpoint import RunCheckpoint
+from src.scrapers.batch_writer import BatchWriter
 from src.utils.display_formatter import DisplayFormatter
+from src.utils.benchmark import ContadorRoundTrips, comparar_execucoes
+from src.utils import text_parsers
+from src.utils.content_hash import hash_conteudo
+from src.database.staging import carregar_staging, inserir_novos, em_transacao
+from src.database.dedupe_keys import garantir_chaves, normalizar_chave
+from src.scrapers.dedupe_cache import DedupeCache
 
 class RestaurantsScraper:
+    # Campos avançados: seletores tentados em ordem (chaves de seletores_restaurantes)
+    CAMPOS_AVANCADOS = {
+        "rating": ["rating_detalhado", "alt_rating"],
+        "delivery_time": ["tempo_entrega", "alt_delivery_time"],
+        "reviews": ["reviews_count", "alt_reviews"],
+        "min_order": ["min_order_info", "alt_min_order"]
+    }
+    
+    INTERPRETADORES = {
+        "rating": "_interpretar_rating",
+        "delivery_time": "_interpretar_tempo_entrega",
+        "reviews": "_interpretar_reviews",
+        "min_order": "_interpretar_pedido_minimo"
+    }
+    
+    # Scroll infinito no navegador: um MutationObserver conta os cards anexados, rola de novo assim que
+    # chegam e só responde ao Python quando o crescimento para, o fim aparece ou o orçamento acaba
+    SCRIPT_SCROLL_INFINITO = """
+        (opcoes) => new Promise(resolve => {
+            const inicio = performance.now();
+            const contar = () => document.querySelectorAll(opcoes.seletor).length;
+            const visivel = el => !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length));
+            const iniciais = contar();
+            let atual = iniciais;
+            let ultimoCrescimento = inicio;
+            let scrolls = 0;
+            let cliques = 0;
+            let cutucado = false;
+            let finalizado = false;
+
+            const botaoCarregarMais = () => {
+                for (const seletor of opcoes.seletoresBotao) {
+                    const el = document.querySelector(seletor);
+                    if (visivel(el)) return el;
+                }
+                for (const el of document.querySelectorAll('button')) {
+                    const texto = (el.innerText || '').trim();
+                    if (visivel(el) && opcoes.textosBotao.some(t => texto.includes(t))) return el;
+                }
+                return null;
+            };
+            const carregando = () => opcoes.seletoresCarregando.some(s => visivel(document.querySelector(s)));
+            const fimVisivel = () => opcoes.seletoresFim.some(s => visivel(document.querySelector(s)));
+
+            const terminar = (motivo) => {
+                if (finalizado) return;
+                finalizado = true;
+                observer.disconnect();
+                clearInterval(relogio);
+                resolve({ iniciais, finais: contar(), scrolls, cliques, motivo,
+                          duracaoMs: Math.round(performance.now() - inicio) });
+            };
+            const avancar = () => {
+                if (finalizado) return;
+                if (scrolls >= opcoes.maxScrolls) return terminar('limite_scrolls');
+                const botao = botaoCarregarMais();
+                if (botao) {
+                    botao.click();
+                    cliques++;
+                }
+                window.scrollTo(0, document.documentElement.scrollHeight);
+                scrolls++;
+            };
+
+            const observer = new MutationObserver(() => {
+                const novo = contar();
+                if (novo > atual) {
+                    atual = novo;
+                    ultimoCrescimento = performance.now();
+                    cutucado = false;
+                    // Modo incremental: devolve o controle ao Python a cada leva de `loteCards` novos cards
+                    if (opcoes.loteCards && atual - iniciais >= opcoes.loteCards) return terminar('lote');
+                    setTimeout(avancar, 0);
+                }
+            });
+            observer.observe(document.body, { childList: true, subtree: true });
+
+            const relogio = setInterval(() => {
+                const agora = performance.now();
+                const ocioso = agora - ultimoCrescimento;
+                if (fimVisivel()) return terminar('sentinela_fim');
+                if (agora - inicio >= opcoes.limiteMs) return terminar('limite_tempo');
+                if (carregando()) return;
+                if (ocioso >= opcoes.ociosoMs) return terminar('sem_crescimento');
+                if (!cutucado && ocioso >= opcoes.ociosoMs / 2) {
+                    // Sobe um pouco e desce de novo para reativar sentinelas de lazy loading
+                    cutucado = true;
+                    window.scrollBy(0, -window.innerHeight);
+                    setTimeout(avancar, 50);
+                }
+            }, 100);
+
+            avancar();
+        })
+    """
+    
+    # Extração em lote: um único round trip devolve os textos brutos de todos os cards.
+    # Com `marcador`, devolve só os cards ainda não extraídos e marca cada um com o link (data-attribute);
+    # nós reciclados por listas virtualizadas mudam de link e voltam a ser extraídos
+    SCRIPT_EXTRACAO_CARDS = """
+        ({ container, item, seletores, campos, marcador }) => {
+            const texto = (raiz, seletor) => {
+                try {
+                    const el = raiz.querySelector(seletor);
+                    return el ? el.innerText : null;
+                } catch (e) {
+                    return null;
+                }
+            };
+            const cards = [];
+            document.querySelectorAll(`${container} ${item}`).forEach((card, indice) => {
+                const link = card.querySelector('a');
+                const nome = texto(card, seletores.nome);
+                if (marcador) {
+                    // Card ainda sem conteúdo (placeholder) fica para a próxima leva
+                    if (!nome) return;
+                    const chave = (link && link.getAttribute('href')) || nome;
+                    if (card.getAttribute(marcador) === chave) return;
+                    card.setAttribute(marcador, chave);
+                }
+                const candidatos = {};
+                for (const [campo, lista] of Object.entries(campos)) {
+                    candidatos[campo] = lista.map(seletor => texto(card, seletor));
+                }
+                cards.push({
+                    indice,
+                    nome,
+                    href: link ? link.getAttribute('href') : null,
+                    info: texto(card, seletores.info),
+                    entrega: texto(card, seletores.entrega),
+                    candidatos,
+                    texto: card.innerText
+                });
+            });
+            return cards;
+        }
+    """
+    
+    # Atributo gravado nos cards já extraídos (modo incremental)
+    MARCADOR_CARD = "data-scraper-coletado"
+    
     def __init__(self):
         self.logger = get_logger()
         self.db_manager = DatabaseManager()
         self.config_manager = ConfigManager()
         self.base_url = "https://www.ifood.com.br"
         self.cidade_busca = self.config_manager.get_default_city()
+        self.dedupe_cache = DedupeCache(self.config_manager)
+        self.resource_blocker = ResourceBlocker(self.config_manager)
+        self.session_cache = LocationSessionCache(self.config_manager)
+        self.readiness = PageReadiness(self.config_manager)
+        self.limitador = obter_limitador(self.config_manager)
+        self.retry_policy = obter_politica(self.config_manager)
+        self.proxy_pool = obter_pool(self.config_manager)
+        self.context_factory = ContextFactory(
+            self.config_manager, self.resource_blocker, self.session_cache, self.proxy_pool
+        )
         
         # Configurações otimizadas (herdadas do categories_scraper)
         self.config_otimizado = {
@@ -55,11 +223,17 @@ class RestaurantsScraper:
         # Configurações para carregamento de mais restaurantes
         # Buscar configuração de scrolls do ConfigManager
         max_scrolls_config = self.config_manager.get_max_scrolls()
+        config_scroll = self.config_manager.get_scroll_config()
+        
+        # Modo de extração dos cards ("batch" = um page.evaluate por categoria, "legacy" = card a card)
+        # e coleta incremental (extrair/salvar a cada leva de scroll)
+        self.config_extracao = self.config_manager.get_extraction_config()
         
         self.config_scroll = {
-            "max_scrolls": max_scrolls_config,  # Máximo de scrolls do ConfigManager
-            "timeout_scroll": 2,  # Segundos entre scrolls
-            "max_tentativas_sem_novos": 3  # Parar após X tentativas sem novos restaurantes
+            "max_scrolls": max_scrolls_config,  # Máximo de scrolls do ConfigManager (limite de segurança)
+            "ocioso_ms": config_scroll.get("idle_ms", 2500),  # Parar após X ms sem novos cards
+            "limite_s": config_scroll.get("max_duration_s", 90),  # Orçamento total do scroll por categoria
+            "sentinelas_fim": config_scroll.get("end_sentinels", [])  # Elementos que indicam fim da lista
         }
     
     async def preencher_localizacao_otimizado(self, page):
@@ -115,7 +289,8 @@ class RestaurantsScraper:
                 await asyncio.sleep(0.3)
                 await page.keyboard.press("Enter")
             
-            await asyncio.sleep(2)
+            # Aguardar o modal reagir à seleção (botão de confirmar ou DOM estável)
+            await self.readiness.pronta(page, "button:has-text('Confirmar')", timeout_ms=3000)
             
             # Confirmar localização
             try:
@@ -133,7 +308,7 @@ class RestaurantsScraper:
             except:
                 pass
             
-            await asyncio.sleep(2)
+            await self.readiness.dom_quieto(page)
             
             tempo_total = time.time() - tempo_inicio
             print(f"{Fore.GREEN}✅ Localização configurada em {tempo_total:.2f}s!")
@@ -145,352 +320,343 @@ class RestaurantsScraper:
             print(f"{Fore.RED}❌ Erro na localização ({tempo_total:.2f}s): {str(e)}")
             return False
     
-    async def tentar_carregar_mais_conteudo(self, page, scroll_num):
-        """Tentar diferentes estratégias para carregar mais conteúdo"""
-        try:
-            # Estratégia 1: Botão "Ver mais" ou "Carregar mais"
-            botoes_carregar = [
-                "button:has-text('Ver mais')",
-                "button:has-text('Carregar mais')", 
-                "button:has-text('Mostrar mais')",
-                "[data-test-id='load-more']",
-                ".load-more-button",
-                "button[aria-label*='mais']"
-            ]
-            
-            for seletor in botoes_carregar:
-                try:
-                    botao = await page.query_selector(seletor)
-                    if botao:
-                        await botao.click()
-                        print(f"{Fore.CYAN}   🔘 Botão encontrado e clicado: {seletor}")
-                        await asyncio.sleep(3)
-                        return True
-                except:
-                    continue
-            
-            # Estratégia 2: Scroll gradual (a cada 3 scrolls)
-            if scroll_num % 3 == 0:
-                await page.evaluate("window.scrollBy(0, window.innerHeight / 2)")
-                await asyncio.sleep(1)
-            
-            # Estratégia 3: Simular hover em elementos para trigger lazy loading
-            if scroll_num % 5 == 0:
-                try:
-                    ultimo_restaurante = await page.query_selector(f"{self.seletores_restaurantes['container']} {self.seletores_restaurantes['item']}:last-child")
-                    if ultimo_restaurante:
-                        await ultimo_restaurante.hover()
-                        await asyncio.sleep(0.5)
-                except:
-                    pass
-            
-            return False
-            
-        except Exception as e:
-            self.logger.debug(f"Erro nas estratégias de carregamento: {str(e)}")
-            return False
+    def _seletor_cards(self):
+        """Seletor completo dos cards de restaurante"""
+        return f"{self.seletores_restaurantes['container']} {self.seletores_restaurantes['item']}"
     
-    async def verificar_necessidade_scroll(self, page):
-        """Verificar se há mais conteúdo para carregar"""
-        try:
-            # Verificar se há botão "Ver mais" ou similar
-            botoes_mais = [
-                "button:has-text('Ver mais')",
-                "button:has-text('Carregar mais')",
-                "button:has-text('Mostrar mais')",
-                "[data-test-id='load-more']",
-                ".load-more-button"
-            ]
-            
-            for seletor in botoes_mais:
-                botao = await page.query_selector(seletor)
-                if botao:
-                    is_visible = await botao.is_visible()
-                    if is_visible:
-                        print(f"{Fore.CYAN}   🔍 Botão 'Ver mais' detectado - scroll necessário")
-                        return True
-            
-            # Verificar se página está no final
-            scroll_info = await page.evaluate("""
-                () => {
-                    const scrollTop = window.pageYOffset || document.documentElement.scrollTop;
-                    const scrollHeight = document.documentElement.scrollHeight;
-                    const clientHeight = document.documentElement.clientHeight;
-                    const scrollPercentage = (scrollTop / (scrollHeight - clientHeight)) * 100;
-                    
-                    return {
-                        scrollTop,
-                        scrollHeight,
-                        clientHeight,
-                        scrollPercentage,
-                        isAtBottom: scrollTop + clientHeight >= scrollHeight - 100
-                    };
-                }
-            """)
-            
-            if scroll_info['isAtBottom']:
-                print(f"{Fore.GREEN}   ✅ Página já está no final - scroll desnecessário")
-                return False
-            
-            # Verificar se há conteúdo lazy-loading
-            lazy_indicators = []
-            for selector in [".loading", ".spinner", "[data-loading]", ".skeleton"]:
-                elements = await page.query_selector_all(selector)
-                lazy_indicators.extend(elements)
-            
-            if lazy_indicators:
-                print(f"{Fore.CYAN}   🔄 Indicadores de loading detectados - scroll pode ser necessário")
-                return True
-            
-            # Por padrão, assumir que scroll pode ser necessário se não estiver no final
-            print(f"{Fore.YELLOW}   📏 Scroll pode ser necessário (página {scroll_info['scrollPercentage']:.1f}% completa)")
-            return scroll_info['scrollPercentage'] < 90
-            
-        except Exception as e:
-            print(f"{Fore.YELLOW}   ⚠️ Erro ao verificar necessidade de scroll: {e}")
-            return True  # Por segurança, assumir que scroll é necessário
-
-    async def detectar_elementos_duplicados(self, page):
-        """Detectar se há elementos duplicados (indica que não há mais conteúdo novo)"""
-        try:
-            restaurantes = await page.query_selector_all(
-                f"{self.seletores_restaurantes['container']} {self.seletores_restaurantes['item']}"
-            )
-            
-            # Coletar nomes dos últimos 10 restaurantes
-            nomes_restaurantes = []
-            for restaurante in restaurantes[-10:]:
-                try:
-                    nome_element = await restaurante.query_selector(self.seletores_restaurantes["nome"])
-                    if nome_element:
-                        nome = await nome_element.inner_text()
-                        nomes_restaurantes.append(nome.strip())
-                except:
-                    continue
-            
-            # Verificar se há duplicatas nos últimos elementos
-            if len(nomes_restaurantes) > 5:
-                duplicatas = len(nomes_restaurantes) - len(set(nomes_restaurantes))
-                if duplicatas >= 3:  # Se 3+ duplicatas nos últimos 10
-                    print(f"{Fore.YELLOW}   🔁 Detectadas {duplicatas} duplicatas - possível fim do conteúdo")
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            self.logger.debug(f"Erro ao detectar duplicatas: {str(e)}")
-            return False
-
-    async def verificar_carregamento_completo(self, page):
-        """Verificar múltiplas condições para determinar se o carregamento está completo"""
-        try:
-            # 1. Verificar se há indicadores de loading
-            loading_selectors = [
-                ".loading", ".spinner", "[data-loading]", ".skeleton",
-                ".loading-more", ".load-more-spinner", "[aria-busy='true']"
-            ]
-            
-            for selector in loading_selectors:
-                loading_elements = await page.query_selector_all(f"{selector}:visible")
-                if loading_elements:
-                    print(f"{Fore.CYAN}   🔄 Loading detectado - aguardando...")
-                    return False
-            
-            # 2. Verificar posição do scroll
-            scroll_info = await page.evaluate("""
-                () => {
-                    const scrollTop = window.pageYOffset || document.documentElement.scrollTop;
-                    const scrollHeight = document.documentElement.scrollHeight;
-                    const clientHeight = document.documentElement.clientHeight;
-                    const scrollPercentage = (scrollTop / (scrollHeight - clientHeight)) * 100;
-                    
-                    return {
-                        scrollPercentage,
-                        isAtBottom: scrollTop + clientHeight >= scrollHeight - 50,
-                        documentHeight: scrollHeight
-                    };
-                }
-            """)
-            
-            # 3. Verificar se há botões de "carregar mais" visíveis
-            load_more_buttons = [
-                "button:has-text('Ver mais'):visible",
-                "button:has-text('Carregar mais'):visible", 
-                "button:has-text('Mostrar mais'):visible",
-                "[data-test-id='load-more']:visible"
-            ]
-            
-            for selector in load_more_buttons:
-                button = await page.query_selector(selector)
-                if button:
-                    print(f"{Fore.CYAN}   🔘 Botão 'Carregar mais' ainda visível")
-                    return False
-            
-            # 4. Verificar duplicatas
-            tem_duplicatas = await self.detectar_elementos_duplicados(page)
-            
-            # Condições para considerar carregamento completo:
-            condicoes_fim = [
-                scroll_info['isAtBottom'],  # Está no final da página
-                scroll_info['scrollPercentage'] > 95,  # Scroll > 95%
-                tem_duplicatas  # Tem elementos duplicados
-            ]
-            
-            condicoes_atendidas = sum(condicoes_fim)
-            
-            if condicoes_atendidas >= 2:  # Se 2+ condições são atendidas
-                print(f"{Fore.GREEN}   ✅ Carregamento completo detectado ({condicoes_atendidas}/3 condições)")
+    async def configurar_localizacao(self, page, context):
+        """Abrir o iFood já localizado (sessão em cache) ou preencher a localização e salvar a sessão"""
+        await self.retry_policy.navegar(page, self.base_url, wait_until="domcontentloaded")
+        
+        if self.session_cache.obter(self.cidade_busca):
+            if await self.session_cache.sessao_localizada(page, self.config_otimizado['campo_endereco']):
+                print(f"{Fore.GREEN}✅ Localização restaurada da sessão salva ({self.cidade_busca})")
                 return True
             
-            print(f"{Fore.CYAN}   📊 Progresso: {scroll_info['scrollPercentage']:.1f}% | Condições: {condicoes_atendidas}/3")
-            return False
-            
-        except Exception as e:
-            self.logger.debug(f"Erro ao verificar carregamento: {str(e)}")
-            return False
-
+            # Sessão não foi aceita pelo site: descartar e localizar normalmente
+            self.logger.warning(f"Sessão salva de '{self.cidade_busca}' não está localizada - descartando")
+            self.session_cache.invalidar(self.cidade_busca)
+        
+        sucesso = await self.preencher_localizacao_otimizado(page)
+        if sucesso:
+            await self.session_cache.salvar(context, self.cidade_busca)
+        return sucesso
+    
+    async def _rolar(self, page, lote_cards=0, limite_ms=None, max_scrolls=None):
+        """Executar o driver de scroll no navegador e devolver o resumo (iniciais, finais, scrolls, motivo...)"""
+        return await page.evaluate(self.SCRIPT_SCROLL_INFINITO, {
+            "seletor": self._seletor_cards(),
+            "ociosoMs": self.config_scroll["ocioso_ms"],
+            "limiteMs": limite_ms if limite_ms is not None else self.config_scroll["limite_s"] * 1000,
+            "maxScrolls": max_scrolls if max_scrolls is not None else self.config_scroll["max_scrolls"],
+            "loteCards": lote_cards,
+            "textosBotao": ["Ver mais", "Carregar mais", "Mostrar mais"],
+            "seletoresBotao": ["[data-test-id='load-more']", ".load-more-button"],
+            "seletoresCarregando": [".loading", ".spinner", "[data-loading]", ".skeleton",
+                                    ".loading-more", ".load-more-spinner", "[aria-busy='true']"],
+            "seletoresFim": self.config_scroll["sentinelas_fim"]
+        })
+    
     async def carregar_mais_restaurantes_com_scroll(self, page):
-        """Fazer scroll automático inteligente para carregar mais restaurantes"""
+        """Scroll infinito dirigido pela página: o próximo scroll sai assim que novos cards chegam"""
         try:
-            restaurantes_iniciais = len(await page.query_selector_all(
-                f"{self.seletores_restaurantes['container']} {self.seletores_restaurantes['item']}"
-            ))
-            
-            print(f"{Fore.WHITE}   📊 Restaurantes iniciais: {restaurantes_iniciais}")
-            
-            # Verificar se scroll é necessário
-            precisa_scroll = await self.verificar_necessidade_scroll(page)
+            print(f"{Fore.CYAN}   🔄 Iniciando scroll inteligente...")
             
-            if not precisa_scroll:
-                print(f"{Fore.GREEN}   ⚡ Scroll desnecessário - usando {restaurantes_iniciais} restaurantes existentes")
-                return restaurantes_iniciais
+            resultado = await self._rolar(page)
             
-            print(f"{Fore.CYAN}   🔄 Iniciando scroll inteligente...")
+            motivos = {
+                "sem_crescimento": "sem novos cards",
+                "sentinela_fim": "fim da lista",
+                "limite_scrolls": "máximo de scrolls",
+                "limite_tempo": "tempo máximo"
+            }
+            total_carregados = resultado["finais"] - resultado["iniciais"]
+            print(f"{Fore.GREEN}   🎯 Total: {resultado['finais']} restaurantes (+{total_carregados}) | "
+                  f"{resultado['scrolls']} scrolls, {resultado['cliques']} cliques em 'Ver mais' | "
+                  f"{resultado['duracaoMs'] / 1000:.1f}s | parada: {motivos.get(resultado['motivo'], resultado['motivo'])}")
             
-            scrolls_realizados = 0
-            max_scrolls = self.config_scroll["max_scrolls"]
-            sem_novos_restaurantes = 0
-            max_tentativas = self.config_scroll["max_tentativas_sem_novos"]
-            restaurantes_antes_scroll = restaurantes_iniciais
-            altura_pagina_anterior = 0
-            
-            while scrolls_realizados < max_scrolls and sem_novos_restaurantes < max_tentativas:
-                # Verificar se carregamento está completo (múltiplas condições)
-                carregamento_completo = await self.verificar_carregamento_completo(page)
-                if carregamento_completo:
-                    print(f"{Fore.GREEN}   🎯 Sistema inteligente detectou fim do conteúdo - parando scroll")
-                    break
-                
-                # Verificar se altura da página mudou (indicador de novo conteúdo)
-                altura_atual = await page.evaluate("document.documentElement.scrollHeight")
-                if altura_atual == altura_pagina_anterior and scrolls_realizados > 2:
-                    print(f"{Fore.YELLOW}   📏 Altura da página não mudou - possível fim do conteúdo")
-                    sem_novos_restaurantes += 1
-                else:
-                    altura_pagina_anterior = altura_atual
-                
-                # Fazer scroll para baixo
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await asyncio.sleep(self.config_scroll["timeout_scroll"])
-                
-                # Aguardar carregamento adicional após scroll
-                await asyncio.sleep(1)
-                
-                # Verificar se carregaram novos restaurantes
-                restaurantes_atuais = len(await page.query_selector_all(
-                    f"{self.seletores_restaurantes['container']} {self.seletores_restaurantes['item']}"
-                ))
-                
-                if restaurantes_atuais > restaurantes_antes_scroll:
-                    novos_restaurantes = restaurantes_atuais - restaurantes_antes_scroll
-                    print(f"{Fore.GREEN}   ✅ +{novos_restaurantes} restaurantes carregados (scroll {scrolls_realizados + 1})")
-                    restaurantes_antes_scroll = restaurantes_atuais
-                    sem_novos_restaurantes = 0
-                else:
-                    sem_novos_restaurantes += 1
-                    print(f"{Fore.YELLOW}   ⏳ Aguardando carregamento... ({sem_novos_restaurantes}/{max_tentativas})")
-                
-                scrolls_realizados += 1
-                
-                # Estratégias para carregar mais conteúdo
-                await self.tentar_carregar_mais_conteudo(page, scrolls_realizados)
-                
-                # Parada inteligente: se muitos scrolls sem resultado, verificar fim
-                if sem_novos_restaurantes >= 2:
-                    fim_detectado = await self.verificar_carregamento_completo(page)
-                    if fim_detectado:
-                        print(f"{Fore.GREEN}   🧠 Parada inteligente ativada - fim do conteúdo confirmado")
-                        break
-            
-            restaurantes_finais = len(await page.query_selector_all(
-                f"{self.seletores_restaurantes['container']} {self.seletores_restaurantes['item']}"
-            ))
-            
-            total_carregados = restaurantes_finais - restaurantes_iniciais
-            eficiencia_msg = "otimizado" if scrolls_realizados < max_scrolls else "máximo atingido"
-            economia_scrolls = max_scrolls - scrolls_realizados
-            
-            if economia_scrolls > 0:
-                print(f"{Fore.GREEN}   🎯 Total: {restaurantes_finais} restaurantes (+{total_carregados}) | {scrolls_realizados} scrolls ({eficiencia_msg}) | 💡 {economia_scrolls} scrolls economizados!")
-            else:
-                print(f"{Fore.GREEN}   🎯 Total: {restaurantes_finais} restaurantes (+{total_carregados}) | {scrolls_realizados} scrolls ({eficiencia_msg})")
-                
-            return restaurantes_finais
+            self.logger.debug(f"Scroll: {resultado}")
+            return resultado["finais"]
             
         except Exception as e:
             self.logger.error(f"Erro no scroll automático: {str(e)}")
             print(f"{Fore.RED}   ❌ Erro no scroll: {str(e)}")
             return 0
     
-    async def coletar_restaurantes_categoria(self, page, categoria_nome, categoria_url):
-        """Coletar restaurantes de uma categoria específica"""
+    async def colher_restaurantes_incremental(self, page, categoria_nome, categoria_url):
+        """Gerador assíncrono: após cada leva de scroll extrai só os cards novos e entrega o lote"""
+        inicio = time.perf_counter()
+        limite_ms = self.config_scroll["limite_s"] * 1000
+        lote_cards = self.config_extracao.get("incremental_batch", 20)
+        scrolls = 0
+        lotes = 0
+        vistos = set()
+        fim = False
+        
+        while True:
+            lote = await self.extrair_restaurantes_lote(
+                page, categoria_nome, categoria_url, marcador=self.MARCADOR_CARD
+            )
+            if lote is None:
+                return
+            
+            # Listas virtualizadas recriam nós já vistos: filtrar pelo link
+            novos = []
+            for restaurante in lote:
+                chave = restaurante["link_restaurante"] if restaurante["link_restaurante"] != "N/A" else restaurante["nome"]
+                if chave not in vistos:
+                    vistos.add(chave)
+                    novos.append(restaurante)
+            
+            if novos:
+                lotes += 1
+                yield novos
+            
+            decorrido_ms = (time.perf_counter() - inicio) * 1000
+            if fim or decorrido_ms >= limite_ms or scrolls >= self.config_scroll["max_scrolls"]:
+                break
+            
+            try:
+                resultado = await self._rolar(
+                    page,
+                    lote_cards=lote_cards,
+                    limite_ms=limite_ms - decorrido_ms,
+                    max_scrolls=self.config_scroll["max_scrolls"] - scrolls
+                )
+            except Exception as e:
+                # Lotes já entregues continuam válidos
+                self.logger.error(f"Erro no scroll incremental: {str(e)}")
+                print(f"{Fore.RED}   ❌ Erro no scroll: {str(e)} - mantendo {len(vistos)} restaurantes já coletados")
+                return
+            
+            scrolls += resultado["scrolls"]
+            # Qualquer parada que não seja "lote" encerra após extrair o que chegou nessa última leva
+            fim = resultado["motivo"] != "lote"
+        
+        print(f"{Fore.GREEN}   🎯 {len(vistos)} restaurantes em {lotes} lotes | {scrolls} scrolls | "
+              f"{time.perf_counter() - inicio:.1f}s")
+    
+    async def coletar_restaurantes_em_lotes(self, page, categoria_nome, categoria_url):
+        """Gerador assíncrono dos restaurantes de uma categoria (um único lote, ou vários no modo incremental)"""
+        entregues = 0
         try:
             self.logger.info(f"Coletando restaurantes da categoria: {categoria_nome}")
             print(f"\n{Fore.CYAN}🍴 Coletando restaurantes: {categoria_nome}")
             
+            # Escutar as respostas JSON da listagem antes de navegar
+            captura = obter_captura(page, self.config_manager)
+            captura.limpar()
+            
             # Navegar para categoria
-            await page.goto(categoria_url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(3)
+            await self.retry_policy.goto(page, categoria_url, wait_until="domcontentloaded")
             
-            # Aguardar container de restaurantes
-            container = await page.wait_for_selector(
-                self.seletores_restaurantes["container"], 
-                timeout=10000
+            # Modo preferencial: merchants vindos da API (sem depender dos seletores nem do scroll)
+            restaurantes_api = await captura.aguardar(
+                lambda: captura.restaurantes(categoria_nome, categoria_url, self.base_url)
             )
-            
-            if not container:
+            if restaurantes_api:
+                print(DisplayFormatter.success(f"{len(restaurantes_api)} restaurantes capturados da API (JSON)"))
+                entregues += 1
+                yield restaurantes_api
+                return
+            
+            # Fallback: scraping do DOM
+            if captura.habilitado:
+                print(DisplayFormatter.info("Nenhum JSON de restaurantes capturado - usando DOM"))
+            
+            # Aguardar os cards aparecerem e a primeira leva estabilizar
+            if not await self.readiness.seletor(page, self._seletor_cards()):
                 print(f"{Fore.YELLOW}   ⚠️ Container de restaurantes não encontrado")
-                return []
+                return
+            await self.readiness.contagem_estavel(page, self._seletor_cards())
+            
+            # Modo incremental: extrair os cards novos a cada leva de scroll
+            if self.config_extracao.get("incremental", False):
+                print(DisplayFormatter.subsection("Carregando e extraindo restaurantes por lotes"))
+                async for lote in self.colher_restaurantes_incremental(page, categoria_nome, categoria_url):
+                    entregues += 1
+                    yield lote
+                return
             
             # NOVO: Fazer scroll automático para carregar mais restaurantes
             print(DisplayFormatter.subsection("Carregando restaurantes com scroll inteligente"))
             await self.carregar_mais_restaurantes_com_scroll(page)
             
-            # Buscar todos os restaurantes após o scroll
-            restaurantes = await page.query_selector_all(
-                f"{self.seletores_restaurantes['container']} {self.seletores_restaurantes['item']}"
-            )
+            # Benchmark opcional: extração card a card x extração em lote na mesma página
+            if self.config_extracao.get("benchmark", False):
+                await self.comparar_modos_extracao(page, categoria_nome, categoria_url)
+            
+            dados_coletados = None
+            if self.config_extracao.get("mode", "batch") == "batch":
+                dados_coletados = await self.extrair_restaurantes_lote(page, categoria_nome, categoria_url)
             
-            print(DisplayFormatter.success(f"{len(restaurantes)} restaurantes encontrados"))
+            # Fallback: extração card a card (um round trip por seletor)
+            if dados_coletados is None:
+                dados_coletados = await self.extrair_restaurantes_por_card(page, categoria_nome, categoria_url)
             
-            dados_coletados = []
+            entregues += 1
+            yield dados_coletados
             
-            for i, restaurante in enumerate(restaurantes):
+        except Exception as e:
+            # Erro transitório antes de qualquer lote: a categoria inteira pode ser tentada de novo
+            if transitorio(e) and not entregues:
+                raise
+            self.logger.error(f"Erro ao coletar restaurantes da categoria {categoria_nome}: {str(e)}")
+            print(f"{Fore.RED}❌ Erro na categoria {categoria_nome}: {str(e)}")
+    
+    async def coletar_restaurantes_categoria(self, page, categoria_nome, categoria_url):
+        """Coletar restaurantes de uma categoria específica"""
+        dados_coletados = []
+        async for lote in self.coletar_restaurantes_em_lotes(page, categoria_nome, categoria_url):
+            dados_coletados.extend(lote)
+        
+        print(DisplayFormatter.success(f"{len(dados_coletados)} restaurantes coletados"))
+        return dados_coletados
+    
+    async def extrair_restaurantes_lote(self, page, categoria_nome, categoria_url, marcador=None):
+        """Extrair todos os cards (ou só os não marcados) em um único page.evaluate (None se o script falhar)"""
+        try:
+            cards = await page.evaluate(self.SCRIPT_EXTRACAO_CARDS, {
+                "container": self.seletores_restaurantes["container"],
+                "item": self.seletores_restaurantes["item"],
+                "seletores": self.seletores_restaurantes,
+                "campos": {
+                    campo: [self.seletores_restaurantes[chave] for chave in chaves]
+                    for campo, chaves in self.CAMPOS_AVANCADOS.items()
+                },
+                "marcador": marcador
+            })
+        except Exception as e:
+            self.logger.warning(f"Extração em lote falhou, usando extração por card: {str(e)}")
+            return None
+        
+        if not marcador:
+            print(DisplayFormatter.success(f"{len(cards)} restaurantes encontrados"))
+        
+        dados_coletados = []
+        for card in cards:
+            try:
+                dados_coletados.append(self._montar_restaurante(card, categoria_nome, categoria_url))
+            except Exception as e:
+                self.logger.debug(f"Erro ao processar restaurante {card.get('indice', 0) + 1}: {str(e)}")
+        
+        return dados_coletados
+    
+    def _montar_restaurante(self, card, categoria_nome, categoria_url):
+        """Converter o card bruto (textos do page.evaluate) no registro de restaurante"""
+        nome = card.get("nome") or "N/A"
+        
+        link_restaurante = "N/A"
+        href = card.get("href")
+        if href:
+            link_restaurante = f"{self.base_url}{href}" if href.startswith("/") else href
+        
+        # Separar info (rating • tipo • km) por "•"
+        info_text = card.get("info")
+        info_parts = [part.strip() for part in info_text.split("•")] if info_text else []
+        rating = info_parts[0] if len(info_parts) > 0 else "N/A"
+        tipo_comida = info_parts[1] if len(info_parts) > 1 else "N/A"
+        distancia = info_parts[2] if len(info_parts) > 2 else "N/A"
+        
+        dados_avancados = {"rating": "N/A", "delivery_time": "N/A", "reviews": "N/A", "min_order": "N/A"}
+        for campo, textos in card.get("candidatos", {}).items():
+            interpretar = getattr(self, self.INTERPRETADORES[campo])
+            for texto in textos:
+                valor = interpretar(texto) if texto else None
+                if valor is not None:
+                    dados_avancados[campo] = valor
+                    break
+        self._complementar_pelo_texto_completo(dados_avancados, card.get("texto") or "")
+        
+        if dados_avancados["rating"] != "N/A":
+            rating = dados_avancados["rating"]
+        
+        taxa_entrega = card.get("entrega") or "N/A"
+        
+        delivery_time = dados_avancados["delivery_time"]
+        if delivery_time == "N/A" and taxa_entrega != "N/A":
+            delivery_time = text_parsers.interpretar_tempo_entrega(taxa_entrega) or "N/A"
+        
+        # Processar taxa de entrega (grátis = 0)
+        if taxa_entrega.lower() == "grátis":
+            taxa_entrega = "0"
+        
+        return {
+            "nome": nome,
+            "categoria": categoria_nome,
+            "rating": rating,
+            "tipo_comida": tipo_comida,
+            "distancia": distancia,
+            "taxa_entrega": taxa_entrega,
+            "delivery_time": delivery_time,
+            "reviews": dados_avancados["reviews"],
+            "min_order": dados_avancados["min_order"],
+            "link_restaurante": link_restaurante,
+            "categoria_url": categoria_url
+        }
+    
+    async def comparar_modos_extracao(self, page, categoria_nome, categoria_url):
+        """Benchmark: round trips e tempo da extração por card x em lote (use com 1 worker)"""
+        with ContadorRoundTrips() as antes:
+            por_card = await self.extrair_restaurantes_por_card(page, categoria_nome, categoria_url)
+        
+        with ContadorRoundTrips() as depois:
+            em_lote = await self.extrair_restaurantes_lote(page, categoria_nome, categoria_url) or []
+        
+        print(DisplayFormatter.section(f"BENCHMARK DE EXTRAÇÃO - {categoria_nome}"))
+        print(DisplayFormatter.stats_table(
+            comparar_execucoes("por card", antes, "lote", depois, len(por_card))
+        ))
+        
+        divergentes = sum(1 for a, b in zip(por_card, em_lote) if a != b) + abs(len(por_card) - len(em_lote))
+        if divergentes:
+            print(DisplayFormatter.warning(f"{divergentes} registros diferentes entre os dois modos"))
+        
+        self.logger.info(f"Benchmark extração {categoria_nome}: {antes.total} RT/{antes.tempo:.3f}s (por card) x "
+                         f"{depois.total} RT/{depois.tempo:.3f}s (lote), {len(por_card)} cards")
+    
+    async def extrair_restaurantes_por_card(self, page, categoria_nome, categoria_url):
+        """Extração card a card via ElementHandle (modo original, vários round trips por card)"""
+        restaurantes = await page.query_selector_all(
+            f"{self.seletores_restaurantes['container']} {self.seletores_restaurantes['item']}"
+        )
+        
+        print(DisplayFormatter.success(f"{len(restaurantes)} restaurantes encontrados"))
+        
+        dados_coletados = []
+        
+        for i, restaurante in enumerate(restaurantes):
+            try:
+                # Coletar nome
+                nome_element = await restaurante.query_selector(self.seletores_restaurantes["nome"])
+                nome = await nome_element.inner_text() if nome_element else "N/A"
+                
+                # Coletar link do restaurante (estratégias múltiplas)
+                link_restaurante = "N/A"
+                
+                # Estratégia 1: Seletor específico fornecido
                 try:
-                    # Coletar nome
-                    nome_element = await restaurante.query_selector(self.seletores_restaurantes["nome"])
-                    nome = await nome_element.inner_text() if nome_element else "N/A"
-                    
-                    # Coletar link do restaurante (estratégias múltiplas)
-                    link_restaurante = "N/A"
-                    
-                    # Estratégia 1: Seletor específico fornecido
+                    link_element = await restaurante.query_selector("a")
+                    if link_element:
+                        href = await link_element.get_attribute("href")
+                        if href:
+                            # Se for link relativo, completar com base_url
+                            if href.startswith("/"):
+                                link_restaurante = f"{self.base_url}{href}"
+                            else:
+                                link_restaurante = href
+                            # Link coletado silenciosamente
+                except:
+                    pass
+                
+                # Estratégia 2: Se não encontrou, tentar seletor mais específico
+                if link_restaurante == "N/A":
                     try:
-                        link_element = await restaurante.query_selector("a")
+                        # Usando o seletor específico que você forneceu
+                        link_element = await page.query_selector(f"{self.seletores_restaurantes['container']} > div:nth-child({i+1}) > a")
                         if link_element:
                             href = await link_element.get_attribute("href")
                             if href:
-                                # Se for link relativo, completar com base_url
                                 if href.startswith("/"):
                                     link_restaurante = f"{self.base_url}{href}"
                                 else:
@@ -498,89 +664,61 @@ class RestaurantsScraper:
                                 # Link coletado silenciosamente
                     except:
                         pass
-                    
-                    # Estratégia 2: Se não encontrou, tentar seletor mais específico
-                    if link_restaurante == "N/A":
-                        try:
-                            # Usando o seletor específico que você forneceu
-                            link_element = await page.query_selector(f"{self.seletores_restaurantes['container']} > div:nth-child({i+1}) > a")
-                            if link_element:
-                                href = await link_element.get_attribute("href")
-                                if href:
-                                    if href.startswith("/"):
-                                        link_restaurante = f"{self.base_url}{href}"
-                                    else:
-                                        link_restaurante = href
-                                    # Link coletado silenciosamente
-                        except:
-                            pass
-                    
-                    # Coletar info (rating • tipo • km)
-                    info_element = await restaurante.query_selector(self.seletores_restaurantes["info"])
-                    info_text = await info_element.inner_text() if info_element else "N/A"
-                    
-                    # Separar info por "•"
-                    info_parts = [part.strip() for part in info_text.split("•")] if info_text != "N/A" else []
-                    rating = info_parts[0] if len(info_parts) > 0 else "N/A"
-                    tipo_comida = info_parts[1] if len(info_parts) > 1 else "N/A"
-                    distancia = info_parts[2] if len(info_parts) > 2 else "N/A"
-                    
-                    # MELHORADO: Coletar dados avançados
-                    dados_avancados = await self._coletar_dados_avancados(restaurante)
-                    
-                    # Usar dados melhorados se disponíveis
-                    if dados_avancados["rating"] != "N/A":
-                        rating = dados_avancados["rating"]
-                    
-                    # Coletar taxa de entrega
-                    entrega_element = await restaurante.query_selector(self.seletores_restaurantes["entrega"])
-                    taxa_entrega = await entrega_element.inner_text() if entrega_element else "N/A"
-                    
-                    # Usar delivery_time melhorado se disponível
-                    delivery_time = dados_avancados["delivery_time"]
-                    if delivery_time == "N/A" and taxa_entrega != "N/A":
-                        # Tentar extrair tempo da string de entrega
-                        import re
-                        time_match = re.search(r'(\d+)-(\d+)\s*min', taxa_entrega)
-                        if time_match:
-                            # Usar tempo médio
-                            min_time = int(time_match.group(1))
-                            max_time = int(time_match.group(2))
-                            delivery_time = (min_time + max_time) // 2
-                    
-                    # Processar taxa de entrega (grátis = 0)
-                    if taxa_entrega.lower() == "grátis":
-                        taxa_entrega = "0"
-                    
-                    dados_coletados.append({
-                        "nome": nome,
-                        "categoria": categoria_nome,
-                        "rating": rating,
-                        "tipo_comida": tipo_comida,
-                        "distancia": distancia,
-                        "taxa_entrega": taxa_entrega,
-                        "delivery_time": delivery_time,
-                        "reviews": dados_avancados["reviews"],
-                        "min_order": dados_avancados["min_order"],
-                        "link_restaurante": link_restaurante,
-                        "categoria_url": categoria_url
-                    })
-                    
-                    if (i + 1) % 20 == 0:
-                        progress_msg = DisplayFormatter.progress(i + 1, len(restaurantes), "processados")
-                        print(progress_msg)
-                    
-                except Exception as e:
-                    self.logger.debug(f"Erro ao processar restaurante {i+1}: {str(e)}")
-                    continue
-            
-            print(DisplayFormatter.success(f"{len(dados_coletados)} restaurantes coletados"))
-            return dados_coletados
-            
-        except Exception as e:
-            self.logger.error(f"Erro ao coletar restaurantes da categoria {categoria_nome}: {str(e)}")
-            print(f"{Fore.RED}❌ Erro na categoria {categoria_nome}: {str(e)}")
-            return []
+                
+                # Coletar info (rating • tipo • km)
+                info_element = await restaurante.query_selector(self.seletores_restaurantes["info"])
+                info_text = await info_element.inner_text() if info_element else "N/A"
+                
+                # Separar info por "•"
+                info_parts = [part.strip() for part in info_text.split("•")] if info_text != "N/A" else []
+                rating = info_parts[0] if len(info_parts) > 0 else "N/A"
+                tipo_comida = info_parts[1] if len(info_parts) > 1 else "N/A"
+                distancia = info_parts[2] if len(info_parts) > 2 else "N/A"
+                
+                # MELHORADO: Coletar dados avançados
+                dados_avancados = await self._coletar_dados_avancados(restaurante)
+                
+                # Usar dados melhorados se disponíveis
+                if dados_avancados["rating"] != "N/A":
+                    rating = dados_avancados["rating"]
+                
+                # Coletar taxa de entrega
+                entrega_element = await restaurante.query_selector(self.seletores_restaurantes["entrega"])
+                taxa_entrega = await entrega_element.inner_text() if entrega_element else "N/A"
+                
+                # Usar delivery_time melhorado se disponível
+                delivery_time = dados_avancados["delivery_time"]
+                if delivery_time == "N/A" and taxa_entrega != "N/A":
+                    # Tentar extrair tempo da string de entrega (média do intervalo)
+                    delivery_time = text_parsers.interpretar_tempo_entrega(taxa_entrega) or "N/A"
+                
+                # Processar taxa de entrega (grátis = 0)
+                if taxa_entrega.lower() == "grátis":
+                    taxa_entrega = "0"
+                
+                dados_coletados.append({
+                    "nome": nome,
+                    "categoria": categoria_nome,
+                    "rating": rating,
+                    "tipo_comida": tipo_comida,
+                    "distancia": distancia,
+                    "taxa_entrega": taxa_entrega,
+                    "delivery_time": delivery_time,
+                    "reviews": dados_avancados["reviews"],
+                    "min_order": dados_avancados["min_order"],
+                    "link_restaurante": link_restaurante,
+                    "categoria_url": categoria_url
+                })
+                
+                if (i + 1) % 20 == 0:
+                    progress_msg = DisplayFormatter.progress(i + 1, len(restaurantes), "processados")
+                    print(progress_msg)
+                
+            except Exception as e:
+                self.logger.debug(f"Erro ao processar restaurante {i+1}: {str(e)}")
+                continue
+        
+        return dados_coletados
     
     async def _coletar_dados_avancados(self, restaurante_element):
         """Coletar dados avançados do restaurante (delivery_time, reviews, min_order)"""
@@ -592,103 +730,24 @@ class RestaurantsScraper:
         }
         
         try:
-            # 1. RATING detalhado
-            for seletor in [self.seletores_restaurantes["rating_detalhado"], 
-                           self.seletores_restaurantes["alt_rating"]]:
-                try:
-                    rating_elem = await restaurante_element.query_selector(seletor)
-                    if rating_elem:
-                        rating_text = await rating_elem.inner_text()
-                        # Extrair apenas número (ex: "4.5" de "4.5 ★" ou "★ 4.5")
-                        import re
-                        rating_match = re.search(r'(\d+\.?\d*)', rating_text)
-                        if rating_match:
-                            dados["rating"] = rating_match.group(1)
-                            break
-                except:
-                    continue
-            
-            # 2. DELIVERY TIME
-            for seletor in [self.seletores_restaurantes["tempo_entrega"],
-                           self.seletores_restaurantes["alt_delivery_time"]]:
-                try:
-                    time_elem = await restaurante_element.query_selector(seletor)
-                    if time_elem:
-                        time_text = await time_elem.inner_text()
-                        # Extrair tempo em minutos (ex: "30-45 min" → 37)
-                        import re
-                        time_match = re.search(r'(\d+)-(\d+)\s*min', time_text)
-                        if time_match:
-                            min_time = int(time_match.group(1))
-                            max_time = int(time_match.group(2))
-                            dados["delivery_time"] = (min_time + max_time) // 2
-                            break
-                        # Tempo único (ex: "30 min")
-                        single_time = re.search(r'(\d+)\s*min', time_text)
-                        if single_time:
-                            dados["delivery_time"] = int(single_time.group(1))
-                            break
-                except:
-                    continue
-            
-            # 3. REVIEWS COUNT
-            for seletor in [self.seletores_restaurantes["reviews_count"],
-                           self.seletores_restaurantes["alt_reviews"]]:
-                try:
-                    reviews_elem = await restaurante_element.query_selector(seletor)
-                    if reviews_elem:
-                        reviews_text = await reviews_elem.inner_text()
-                        # Extrair número de reviews (ex: "(234)" ou "234 avaliações")
-                        import re
-                        reviews_match = re.search(r'(\d+)', reviews_text)
-                        if reviews_match:
-                            dados["reviews"] = int(reviews_match.group(1))
-                            break
-                except:
-                    continue
-            
-            # 4. MIN ORDER
-            for seletor in [self.seletores_restaurantes["min_order_info"],
-                           self.seletores_restaurantes["alt_min_order"]]:
-                try:
-                    min_order_elem = await restaurante_element.query_selector(seletor)
-                    if min_order_elem:
-                        min_order_text = await min_order_elem.inner_text()
-                        # Extrair valor mínimo (ex: "R$ 25,00" ou "Mínimo R$25")
-                        import re
-                        min_order_match = re.search(r'R\$\s*(\d+[.,]?\d*)', min_order_text)
-                        if min_order_match:
-                            valor_str = min_order_match.group(1).replace(',', '.')
-                            dados["min_order"] = float(valor_str)
-                            break
-                except:
-                    continue
+            # 1-4. RATING, DELIVERY TIME, REVIEWS e MIN ORDER (seletor principal, depois alternativo)
+            for campo, chaves in self.CAMPOS_AVANCADOS.items():
+                interpretar = getattr(self, self.INTERPRETADORES[campo])
+                for chave in chaves:
+                    try:
+                        elemento = await restaurante_element.query_selector(self.seletores_restaurantes[chave])
+                        if elemento:
+                            valor = interpretar(await elemento.inner_text())
+                            if valor is not None:
+                                dados[campo] = valor
+                                break
+                    except:
+                        continue
             
             # 5. Busca adicional no texto completo do elemento (fallback)
             try:
-                texto_completo = await restaurante_element.inner_text()
-                
-                # Buscar reviews no texto completo
-                if dados["reviews"] == "N/A":
-                    import re
-                    # Padrões: "(123)", "123 avaliações", "123 reviews"
-                    reviews_patterns = [r'\((\d+)\)', r'(\d+)\s*avalia', r'(\d+)\s*review']
-                    for pattern in reviews_patterns:
-                        match = re.search(pattern, texto_completo, re.IGNORECASE)
-                        if match:
-                            dados["reviews"] = int(match.group(1))
-                            break
-                
-                # Buscar min_order no texto completo
-                if dados["min_order"] == "N/A":
-                    min_patterns = [r'mínimo.*?R\$\s*(\d+[.,]?\d*)', r'pedido.*?R\$\s*(\d+[.,]?\d*)']
-                    for pattern in min_patterns:
-                        match = re.search(pattern, texto_completo, re.IGNORECASE)
-                        if match:
-                            valor_str = match.group(1).replace(',', '.')
-                            dados["min_order"] = float(valor_str)
-                            break
-                            
+                if dados["reviews"] == "N/A" or dados["min_order"] == "N/A":
+                    self._complementar_pelo_texto_completo(dados, await restaurante_element.inner_text())
             except:
                 pass
         
@@ -698,8 +757,35 @@ class RestaurantsScraper:
         
         return dados
     
+    def _interpretar_rating(self, texto):
+        """Extrair apenas número (ex: "4.5" de "4.5 ★" ou "★ 4,5")"""
+        rating = text_parsers.interpretar_rating(texto)
+        return str(rating) if rating is not None else None
+    
+    def _interpretar_tempo_entrega(self, texto):
+        """Extrair tempo em minutos (ex: "30-45 min" → 37, "30 min" → 30)"""
+        return text_parsers.interpretar_tempo_entrega(texto)
+    
+    def _interpretar_reviews(self, texto):
+        """Extrair número de reviews (ex: "(234)" ou "1.234 avaliações")"""
+        return text_parsers.interpretar_inteiro(texto)
+    
+    def _interpretar_pedido_minimo(self, texto):
+        """Extrair valor mínimo (ex: "R$ 25,00" ou "Mínimo R$ 1.234,56")"""
+        return text_parsers.interpretar_preco(texto) if "R$" in texto else None
+    
+    def _complementar_pelo_texto_completo(self, dados, texto_completo):
+        """Preencher reviews/min_order ainda ausentes a partir do texto completo do card"""
+        # Buscar reviews no texto completo - padrões: "(123)", "123 avaliações", "123 reviews"
+        if dados["reviews"] == "N/A":
+            dados["reviews"] = text_parsers.reviews_no_texto(texto_completo) or "N/A"
+        
+        # Buscar min_order no texto completo
+        if dados["min_order"] == "N/A":
+            dados["min_order"] = text_parsers.pedido_minimo_no_texto(texto_completo) or "N/A"
+    
     def _verificar_estrutura_tabela_restaurants(self, conn):
-        """Verificar e adicionar coluna link se necessário"""
+        """Verificar e adicionar colunas link, content_hash e chaves de dedupe se necessário"""
         try:
             # Verificar se coluna 'link' existe
             try:
@@ -713,145 +799,131 @@ class RestaurantsScraper:
                     print(f"{Fore.GREEN}✅ Coluna 'link' adicionada com sucesso!")
                 except Exception as alter_error:
                     print(f"{Fore.RED}❌ Erro ao adicionar coluna link: {alter_error}")
+            
+            # Hash do card (re-coletas só gravam restaurantes cujo card mudou)
+            conn.execute("ALTER TABLE restaurants ADD COLUMN IF NOT EXISTS content_hash VARCHAR")
+            
+            # Chave de dedupe normalizada (nome + cidade) com índice único
+            garantir_chaves(conn, "restaurants")
                     
         except Exception as e:
             print(f"{Fore.RED}❌ Erro ao verificar tabela: {e}")
     
-    def _verificar_duplicata_restaurante(self, conn, nome, cidade, categoria):
-        """Verificar se restaurante já existe no banco"""
-        try:
-            # Verificar por nome + cidade (critério principal)
-            result = conn.execute("""
-                SELECT id FROM restaurants 
-                WHERE LOWER(TRIM(name)) = LOWER(TRIM(?)) 
-                AND LOWER(TRIM(city)) = LOWER(TRIM(?))
-                LIMIT 1
-            """, [nome, cidade]).fetchone()
-            
-            return result is not None
-            
-        except Exception as e:
-            self.logger.debug(f"Erro ao verificar duplicata: {str(e)}")
-            return False
-
-    def salvar_restaurantes_no_banco(self, restaurantes):
-        """Salvar restaurantes coletados no banco de dados (evitando duplicatas)"""
+    # Campos do card que contam como mudança (categoria fica de fora: o mesmo restaurante aparece em várias)
+    CAMPOS_HASH_CARD = ("nome", "rating", "tipo_comida", "taxa_entrega", "delivery_time", "reviews", "min_order",
+                        "link_restaurante")
+    
+    # Colunas gravadas pelo staging (id vem da SEQUENCE nos novos)
+    COLUNAS_STAGING = ["name", "category", "rating", "delivery_time", "delivery_fee", "city", "link", "reviews",
+                       "min_order", "content_hash"]
+    
+    def hash_card(self, restaurante):
+        """Hash do card bruto (antes de interpretar os textos)"""
+        return hash_conteudo({campo: restaurante.get(campo) for campo in self.CAMPOS_HASH_CARD})
+    
+    def salvar_lote_restaurantes(self, restaurantes):
+        """Gravar um lote de restaurantes: novos inseridos, cards alterados atualizados, iguais ignorados;
+        retorna Counter de salvos/atualizados/duplicados (falha na gravação é levantada)"""
+        conn = self.db_manager._get_connection()
+        
         try:
-            self.logger.info("Salvando restaurantes no banco de dados")
-            print(f"\n{Fore.CYAN}💾 Salvando no banco de dados (com verificação anti-duplicatas)...")
-            
-            conn = self.db_manager._get_connection()
-            
             # Verificar/corrigir estrutura da tabela
             self._verificar_estrutura_tabela_restaurants(conn)
             
             restaurantes_salvos = 0
+            restaurantes_atualizados = 0
             restaurantes_duplicados = 0
-            restaurantes_erros = 0
             
-            for i, rest in enumerate(restaurantes):
-                try:
-                    nome = rest["nome"]
-                    categoria = rest["categoria"]
-                    
-                    # NOVO: Verificar se já existe (anti-duplicatas)
-                    if self._verificar_duplicata_restaurante(conn, nome, self.cidade_busca, categoria):
-                        restaurantes_duplicados += 1
-                        if restaurantes_duplicados <= 5:  # Mostrar apenas os primeiros 5
-                            print(f"{Fore.YELLOW}   🔄 Duplicata: {nome} (já existe)")
-                        elif restaurantes_duplicados == 6:
-                            print(f"{Fore.YELLOW}   🔄 ... (mais duplicatas encontradas)")
-                        continue
-                    
-                    # Obter próximo ID
-                    result = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 as next_id FROM restaurants").fetchone()
-                    next_id = result[0]
-                    
-                    # Processar dados para tipos corretos
-                    rating_num = None
-                    if rest["rating"] != "N/A":
-                        try:
-                            # Extrair apenas número da rating (ex: "4.5" de "4.5 ★")
-                            rating_str = rest["rating"].replace("★", "").strip()
-                            rating_num = float(rating_str) if rating_str else None
-                        except:
-                            rating_num = None
-                    
-                    delivery_fee_num = None
-                    if rest["taxa_entrega"] != "N/A":
-                        try:
-                            if rest["taxa_entrega"] == "0" or rest["taxa_entrega"].lower() == "grátis":
-                                delivery_fee_num = 0.0
-                            else:
-                                # Extrair valor numérico (ex: "3.50" de "R$ 3,50")
-                                fee_str = rest["taxa_entrega"].replace("R$", "").replace(",", ".").strip()
-                                delivery_fee_num = float(fee_str) if fee_str else None
-                        except:
-                            delivery_fee_num = None
-                    
-                    # Processar link do restaurante
-                    link_rest = rest.get("link_restaurante", "N/A")
-                    if link_rest == "N/A":
-                        # Gerar link baseado na cidade configurada
-                        cidade_url = self.cidade_busca.lower().replace(' ', '-')
-                        link_rest = f"{self.base_url}/delivery/{cidade_url}-sp/{nome.lower().replace(' ', '-')}"
-                    
-                    # Processar dados avançados
-                    delivery_time_num = None
-                    if rest.get("delivery_time", "N/A") != "N/A":
-                        try:
-                            delivery_time_num = int(rest["delivery_time"])
-                        except:
-                            delivery_time_num = None
-                    
-                    reviews_num = None
-                    if rest.get("reviews", "N/A") != "N/A":
-                        try:
-                            reviews_num = int(rest["reviews"])
-                        except:
-                            reviews_num = None
-                    
-                    min_order_num = None
-                    if rest.get("min_order", "N/A") != "N/A":
-                        try:
-                            min_order_num = float(rest["min_order"])
-                        except:
-                            min_order_num = None
-                    
-                    # Inserir novo restaurante com todos os campos
-                    conn.execute("""
-                        INSERT INTO restaurants (id, name, category, rating, delivery_time, delivery_fee, 
-                                               city, link, reviews, min_order, scraped_at) 
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    """, [next_id, nome, categoria, rating_num, delivery_time_num, 
-                          delivery_fee_num, self.cidade_busca, link_rest, reviews_num, min_order_num])
-                    
-                    restaurantes_salvos += 1
-                    
-                    # Log progresso a cada 50 restaurantes
-                    if restaurantes_salvos % 50 == 0:
-                        print(f"{Fore.GREEN}   ✅ {restaurantes_salvos} novos restaurantes salvos...")
-                    
-                except Exception as e:
-                    restaurantes_erros += 1
-                    self.logger.error(f"Erro ao salvar restaurante {rest.get('nome', 'N/A')}: {str(e)}")
+            # id e hash do card dos já salvos na cidade: lidos uma vez por execução e mantidos em memória
+            existentes = self.dedupe_cache.restaurantes(conn, self.cidade_busca)
+            
+            # Card igual ao salvo (ou repetido no lote): nem interpretado nem gravado
+            alterados = []
+            vistos = set()
+            for rest in restaurantes:
+                chave = normalizar_chave(rest["nome"])
+                hash_card = self.hash_card(rest)
+                existente = existentes.get(chave)
+                if chave in vistos or (existente and existente[1] == hash_card):
+                    restaurantes_duplicados += 1
+                    if restaurantes_duplicados <= 5:  # Mostrar apenas os primeiros 5
+                        print(f"{Fore.YELLOW}   🔄 Sem mudanças: {rest['nome']} (já existe)")
+                    elif restaurantes_duplicados == 6:
+                        print(f"{Fore.YELLOW}   🔄 ... (mais restaurantes sem mudanças)")
+                    continue
+                vistos.add(chave)
+                alterados.append((rest, hash_card, existente[0] if existente else None))
             
-            conn.commit()
-            conn.close()
+            if not alterados:
+                return Counter(duplicados=restaurantes_duplicados)
             
-            # Relatório final detalhado
-            total_processados = len(restaurantes)
-            print(f"\n{Fore.CYAN}📊 RELATÓRIO FINAL:")
-            print(f"{Fore.GREEN}   ✅ Novos restaurantes salvos: {restaurantes_salvos}")
-            print(f"{Fore.YELLOW}   🔄 Duplicatas ignoradas: {restaurantes_duplicados}")
-            if restaurantes_erros > 0:
-                print(f"{Fore.RED}   ❌ Erros encontrados: {restaurantes_erros}")
-            print(f"{Fore.WHITE}   📋 Total processados: {total_processados}")
+            linhas = []
+            for rest, hash_card, restaurant_id in alterados:
+                nome = rest["nome"]
+                
+                # Processar link do restaurante
+                link_rest = rest.get("link_restaurante", "N/A")
+                if link_rest == "N/A":
+                    # Gerar link baseado na cidade configurada
+                    cidade_url = self.cidade_busca.lower().replace(' ', '-')
+                    link_rest = f"{self.base_url}/delivery/{cidade_url}-sp/{nome.lower().replace(' ', '-')}"
+                
+                # Valores numéricos interpretados só dos alterados (formato BRL: "R$ 1.234,56")
+                linhas.append([restaurant_id, nome, rest["categoria"],
+                               text_parsers.interpretar_rating(rest.get("rating")),
+                               text_parsers.interpretar_tempo_entrega(rest.get("delivery_time")),
+                               text_parsers.interpretar_taxa_entrega(rest.get("taxa_entrega")),
+                               self.cidade_busca, link_rest,
+                               text_parsers.interpretar_inteiro(rest.get("reviews")),
+                               text_parsers.interpretar_preco(rest.get("min_order")), hash_card])
+            
+            # Staging: o lote inteiro entra numa tabela temporária e é gravado com dois comandos set-based
+            def gravar():
+                carregar_staging(conn, "stg_restaurants", "restaurants", ["id"] + self.COLUNAS_STAGING, linhas)
+                
+                # Card mudou: grava só os campos presentes (sem apagar o que veio da coleta de info extra)
+                atualizados = conn.execute("""
+                    UPDATE restaurants SET
+                        rating = COALESCE(s.rating, restaurants.rating),
+                        delivery_time = COALESCE(s.delivery_time, restaurants.delivery_time),
+                        delivery_fee = COALESCE(s.delivery_fee, restaurants.delivery_fee),
+                        reviews = COALESCE(s.reviews, restaurants.reviews),
+                        min_order = COALESCE(s.min_order, restaurants.min_order),
+                        content_hash = s.content_hash, scraped_at = CURRENT_TIMESTAMP
+                    FROM stg_restaurants s WHERE restaurants.id = s.id
+                """).fetchone()[0]
+                
+                # Novos: anti-join pela chave nome + cidade (também pega os inseridos por outra execução nesse meio
+                # tempo) e ids da SEQUENCE em um único INSERT ... SELECT
+                salvos = inserir_novos(conn, "restaurants", "stg_restaurants", self.COLUNAS_STAGING)
+                return atualizados, salvos
             
-            eficiencia = (restaurantes_salvos / total_processados * 100) if total_processados > 0 else 0
-            print(f"{Fore.CYAN}   📈 Taxa de novos dados: {eficiencia:.1f}%")
+            try:
+                restaurantes_atualizados, restaurantes_salvos = em_transacao(conn, "restaurants", gravar)
+            except Exception as e:
+                # Propagar: quem chamou conta os erros (o BatchWriter deixa as tarefas do lote pendentes)
+                self.logger.error(f"Erro ao salvar lote de {len(linhas)} restaurantes: {str(e)}")
+                raise
+            
+            self.dedupe_cache.atualizar_restaurantes(conn, self.cidade_busca,
+                                                     {normalizar_chave(linha[1]) for linha in linhas})
+            novos = sum(1 for linha in linhas if linha[0] is None)
+            restaurantes_duplicados += novos - restaurantes_salvos
+            print(f"{Fore.GREEN}   ✅ {restaurantes_salvos} novos restaurantes salvos, {restaurantes_atualizados} atualizados")
+            
+            return Counter(salvos=restaurantes_salvos, atualizados=restaurantes_atualizados,
+                           duplicados=restaurantes_duplicados)
+            
+        finally:
+            conn.close()
+    
+    def salvar_restaurantes_no_banco(self, restaurantes):
+        """Salvar restaurantes coletados no banco de dados (evitando duplicatas)"""
+        try:
+            self.logger.info("Salvando restaurantes no banco de dados")
+            print(f"\n{Fore.CYAN}💾 Salvando no banco de dados (só restaurantes novos ou alterados)...")
             
-            self.logger.info(f"Restaurantes salvos: {restaurantes_salvos}/{total_processados} | Duplicatas: {restaurantes_duplicados}")
+            self.exibir_relatorio_salvamento(self.salvar_lote_restaurantes(restaurantes), len(restaurantes))
             return True
             
         except Exception as e:
@@ -859,6 +931,25 @@ class RestaurantsScraper:
             print(f"{Fore.RED}❌ Erro ao salvar: {str(e)}")
             return False
     
+    def exibir_relatorio_salvamento(self, contadores, total_processados):
+        """Relatório final do salvamento (contadores de salvar_lote_restaurantes somados)"""
+        restaurantes_salvos = contadores["salvos"]
+        restaurantes_duplicados = contadores["duplicados"]
+        restaurantes_erros = contadores["erros"]
+        
+        print(f"\n{Fore.CYAN}📊 RELATÓRIO FINAL:")
+        print(f"{Fore.GREEN}   ✅ Novos restaurantes salvos: {restaurantes_salvos}")
+        print(f"{Fore.GREEN}   ♻️ Atualizados (card mudou): {contadores['atualizados']}")
+        print(f"{Fore.YELLOW}   🔄 Sem mudanças (ignorados): {restaurantes_duplicados}")
+        if restaurantes_erros > 0:
+            print(f"{Fore.RED}   ❌ Erros encontrados: {restaurantes_erros}")
+        print(f"{Fore.WHITE}   📋 Total processados: {total_processados}")
+        
+        eficiencia = (restaurantes_salvos / total_processados * 100) if total_processados > 0 else 0
+        print(f"{Fore.CYAN}   📈 Taxa de novos dados: {eficiencia:.1f}%")
+        
+        self.logger.info(f"Restaurantes salvos: {restaurantes_salvos}/{total_processados} | Duplicatas: {restaurantes_duplicados}")
+    
     def obter_categorias_disponiveis(self):
         """Obter categorias disponíveis no banco de dados"""
         try:
@@ -937,63 +1028,101 @@ class RestaurantsScraper:
         # Executar scraping
         asyncio.run(self.executar_scraping_restaurantes(categorias_selecionadas))
     
-    async def executar_scraping_restaurantes(self, categorias):
-        """Executar scraping de restaurantes"""
+    async def _coletar_salvando_lotes(self, page, categoria, contadores, writer):
+        """Modo incremental: cada lote segue para o gravador (memória constante e lotes já gravados
+        sobrevivem a uma falha no meio do scroll); retorna a quantidade coletada"""
+        quantidade = 0
+        async for lote in self.coletar_restaurantes_em_lotes(page, categoria['nome'], categoria['url']):
+            await writer.enviar(lote)
+            contadores.update(r['categoria'] for r in lote)
+            quantidade += len(lote)
+            print(f"{Fore.WHITE}   📤 Lote enviado ao banco: +{len(lote)} ({quantidade} na categoria)")
+        return quantidade
+    
+    async def coletar_e_enviar_categoria(self, page, categoria, contadores, writer):
+        """Coletar uma categoria e enviar seus restaurantes ao gravador (em lotes durante o scroll se
+        scraping.extraction.incremental, senão ao final); mesma entrada do modo sequencial e do paralelo"""
+        if self.config_extracao.get("incremental", False):
+            return await self._coletar_salvando_lotes(page, categoria, contadores, writer)
+        
+        restaurantes_categoria = await self.coletar_restaurantes_categoria(page, categoria['nome'], categoria['url'])
+        # Gravados em segundo plano (não ficam todos em memória até o fim)
+        await writer.enviar(restaurantes_categoria)
+        contadores.update(r['categoria'] for r in restaurantes_categoria)
+        return len(restaurantes_categoria)
+    
+    async def executar_scraping_restaurantes(self, categorias, run_id=None):
+        """Executar scraping de restaurantes (run_id: retomar uma execução interrompida)"""
         tempo_inicio = time.time()
-        todos_restaurantes = []
+        contadores = Counter()
+        self.resource_blocker.resetar()
+        self.dedupe_cache.reiniciar()
+        
+        # Checkpoint: categorias marcadas como concluídas depois que seus restaurantes forem gravados
+        checkpoint = RunCheckpoint.abrir(
+            "restaurantes", categorias, "url", run_id=run_id, parametros={"cidade": self.cidade_busca},
+            config_manager=self.config_manager
+        )
+        self.cidade_busca = checkpoint.parametros.get("cidade", self.cidade_busca)
+        categorias = checkpoint.tarefas
+        pendentes = checkpoint.pendentes()
+        # Gravação em lotes em segundo plano, sobreposta à navegação
+        writer = BatchWriter(self.salvar_lote_restaurantes, checkpoint, self.config_manager, "restaurantes")
         
         async with async_playwright() as p:
+            await self.proxy_pool.preparar()
             browser = await p.chromium.launch(
                 headless=False,
-                args=['--no-sandbox', '--disable-setuid-sandbox']
+                args=['--no-sandbox', '--disable-setuid-sandbox'],
+                **self.proxy_pool.opcoes_launch()
             )
             
-            context = await browser.new_context(
-                viewport={'width': 1280, 'height': 720},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            )
+            context = await self.context_factory.novo_contexto(browser, self.cidade_busca)
             
             page = await context.new_page()
+            writer.iniciar()
             
             try:
                 # ETAPA 1: Acessar iFood e configurar localização
                 print(f"\n{Fore.CYAN}🌐 Acessando iFood...")
-                await page.goto(self.base_url, wait_until="domcontentloaded")
-                
-                sucesso_localizacao = await self.preencher_localizacao_otimizado(page)
+                sucesso_localizacao = await self.configurar_localizacao(page, context)
                 if not sucesso_localizacao:
                     print(f"{Fore.RED}❌ Falha na configuração de localização")
                     return
                 
-                # ETAPA 2: Coletar restaurantes de cada categoria
-                for i, categoria in enumerate(categorias, 1):
-                    print(f"\n{Fore.MAGENTA}📂 Categoria {i}/{len(categorias)}: {categoria['nome']}")
-                    
-                    restaurantes_categoria = await self.coletar_restaurantes_categoria(
-                        page, categoria['nome'], categoria['url']
-                    )
+                # ETAPA 2: Coletar restaurantes de cada categoria (só as pendentes ao retomar)
+                for i, categoria in enumerate(pendentes, 1):
+                    print(f"\n{Fore.MAGENTA}📂 Categoria {i}/{len(pendentes)}: {categoria['nome']}")
                     
-                    todos_restaurantes.extend(restaurantes_categoria)
-                    
-                    print(f"{Fore.GREEN}✅ {len(restaurantes_categoria)} restaurantes coletados")
+                    try:
+                        quantidade = await self.retry_policy.executar(
+                            lambda: self.coletar_e_enviar_categoria(page, categoria, contadores, writer),
+                            f"categoria:{categoria['nome']}"
+                        )
+                        await writer.concluir(categoria, quantidade)
+                    except Exception as e:
+                        self.logger.error(f"Categoria {categoria['nome']} abandonada: {str(e)}")
+                        print(f"{Fore.RED}❌ Categoria {categoria['nome']} abandonada após as tentativas: {str(e)}")
+                        continue
                     
-                    # Pausa entre categorias
-                    if i < len(categorias):
-                        await asyncio.sleep(2)
+                    print(f"{Fore.GREEN}✅ {quantidade} restaurantes coletados")
                 
-                # ETAPA 3: Salvar no banco
-                if todos_restaurantes:
-                    self.salvar_restaurantes_no_banco(todos_restaurantes)
+                # ETAPA 3: Aguardar a gravação do que ainda está na fila
+                await writer.fechar()
+                total_restaurantes = sum(contadores.values())
+                if total_restaurantes:
+                    self.exibir_relatorio_salvamento(writer.contadores, total_restaurantes)
+                    writer.exibir_relatorio()
                     
                     # Relatório final
                     tempo_total = time.time() - tempo_inicio
-                    performance = len(todos_restaurantes) / tempo_total if tempo_total > 0 else 0
+                    performance = total_restaurantes / tempo_total if tempo_total > 0 else 0
                     
                     # Criar dados de estatísticas
                     stats_data = {
                         "Tempo total": f"{tempo_total:.2f}s",
-                        "Categorias": len(categorias),
-                        "Restaurantes": len(todos_restaurantes),
+                        "Categorias": f"{len(pendentes)}/{len(categorias)}" if run_id else len(categorias),
+                        "Restaurantes": total_restaurantes,
                         "Performance": f"{performance:.1f}/s",
                         "Status": "✓ Salvo no BD"
                     }
@@ -1001,13 +1130,10 @@ class RestaurantsScraper:
                     print(f"\n{DisplayFormatter.stats_table(stats_data)}")
                     
                     # Estatísticas por categoria
-                    from collections import Counter
-                    contadores = Counter(r['categoria'] for r in todos_restaurantes)
-                    
                     categoria_list = [f"{categoria}: {count} restaurantes" for categoria, count in contadores.items()]
                     print(f"\n{DisplayFormatter.compact_list(categoria_list, 'RESTAURANTES POR CATEGORIA')}")
                     
-                    self.logger.info(f"Scraping de restaurantes concluído: {len(todos_restaurantes)} restaurantes em {tempo_total:.2f}s")
+                    self.logger.info(f"Scraping de restaurantes concluído: {total_restaurantes} restaurantes em {tempo_total:.2f}s")
                 else:
                     print(f"\n{Fore.YELLOW}⚠️ Nenhum restaurante foi coletado")
                 
@@ -1016,6 +1142,12 @@ class RestaurantsScraper:
                 print(f"\n{Fore.RED}❌ Erro durante scraping: {str(e)}")
                 
             finally:
+                await writer.fechar()
+                checkpoint.finalizar()
                 await browser.close()
                 print(f"\n{Fore.CYAN}🔒 Navegador fechado")
+                self.resource_blocker.exibir_relatorio()
+                self.context_factory.exibir_relatorio()
+                self.retry_policy.exibir_relatorio()
+                self.limitador.exibir_relatorio()
                 input(f"\n{Fore.GREEN}Pressione ENTER para continuar...")
\ No newline at end of file
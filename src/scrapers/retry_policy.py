@@ -0,0 +1,182 @@
+"""
+Política de novas tentativas (backoff exponencial com jitter) e circuit breaker por alvo (host, categoria, restaurante)
+"""
+import asyncio
+import random
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+import httpx
+from colorama import Fore
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from src.utils.logger import get_logger
+from src.config.config_manager import ConfigManager
+from src.scrapers.rate_limiter import obter_limitador
+
+# Uma política por processo (circuitos compartilhados por todos os workers/contextos do processo)
+_politica = None
+
+# Respostas que valem uma nova tentativa (limitação, sobrecarga, gateway)
+STATUS_TRANSITORIOS = {408, 425, 429, 500, 502, 503, 504}
+
+# Erros do navegador que indicam falha de rede, não de página
+MENSAGENS_TRANSITORIAS = ("net::ERR_", "NS_ERROR_NET", "ECONNRESET", "ECONNREFUSED", "ETIMEDOUT")
+
+
+def obter_politica(config_manager=None):
+    """Obter (ou criar) a política de retry do processo"""
+    global _politica
+    if _politica is None:
+        _politica = RetryPolicy(config_manager)
+    return _politica
+
+
+class ErroTransitorio(Exception):
+    """Resposta HTTP que deve ser tentada de novo (429, 5xx...)"""
+
+    def __init__(self, status, url):
+        super().__init__(f"HTTP {status} em {url[:90]}")
+        self.status = status
+        self.url = url
+
+
+def transitorio(erro):
+    """Classificar o erro: True para timeouts/falhas de rede/status transitórios, False para o resto"""
+    if isinstance(erro, ErroTransitorio):
+        return True
+    if isinstance(erro, httpx.HTTPStatusError):
+        return erro.response.status_code in STATUS_TRANSITORIOS
+    if isinstance(erro, (PlaywrightTimeoutError, asyncio.TimeoutError, TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    mensagem = str(erro)
+    return any(trecho in mensagem for trecho in MENSAGENS_TRANSITORIAS)
+
+
+class CircuitBreaker:
+    """Após N falhas seguidas o alvo fica pausado (aberto) pelo cooldown; depois libera uma tentativa (meio aberto)"""
+
+    def __init__(self, limite_falhas=3, pausa_s=60):
+        self.limite_falhas = max(1, int(limite_falhas))
+        self.pausa_s = pausa_s
+        self._falhas_seguidas = Counter()
+        self._aberto_ate = {}
+        self.aberturas = Counter()
+
+    def restante(self, alvo):
+        """Segundos até o circuito do alvo fechar (0 se fechado)"""
+        return max(0.0, self._aberto_ate.get(alvo, 0.0) - time.time())
+
+    def registrar_sucesso(self, alvo):
+        self._falhas_seguidas.pop(alvo, None)
+        self._aberto_ate.pop(alvo, None)
+
+    def registrar_falha(self, alvo):
+        """Contar falha; retorna True se o circuito abriu agora"""
+        self._falhas_seguidas[alvo] += 1
+        # Meio aberto: a primeira falha depois da pausa já reabre
+        if self._falhas_seguidas[alvo] >= self.limite_falhas and not self.restante(alvo):
+            self._aberto_ate[alvo] = time.time() + self.pausa_s
+            self._falhas_seguidas[alvo] = self.limite_falhas - 1
+            self.aberturas[alvo] += 1
+            return True
+        return False
+
+    async def aguardar(self, alvo):
+        """Pausar enquanto o circuito do alvo estiver aberto (retorna os segundos esperados)"""
+        espera = self.restante(alvo)
+        if espera > 0:
+            await asyncio.sleep(espera)
+        return espera
+
+
+class RetryPolicy:
+    """Tentativas = 1 + max_retries (configurável em configure_timeouts); só erros transitórios são repetidos"""
+
+    def __init__(self, config_manager=None):
+        self.logger = get_logger()
+        self.config_manager = config_manager or ConfigManager()
+        config = self.config_manager.get_retry_config()
+
+        self.max_retries = max(0, int(self.config_manager.get_max_retries()))
+        self.timeout_ms = int(self.config_manager.get_timeout() * 1000)
+        self.atraso_base = config.get("base_delay_s", 1.0)
+        self.atraso_max = config.get("max_delay_s", 30)
+        self.circuito = CircuitBreaker(config.get("breaker_failures", 3), config.get("breaker_cooldown_s", 60))
+        self.limitador = obter_limitador(self.config_manager)
+
+        self.stats = defaultdict(Counter)
+
+    def atraso(self, tentativa):
+        """Backoff exponencial com jitter completo: sorteio entre 0 e base * 2^tentativa (limitado ao máximo)"""
+        return random.uniform(0, min(self.atraso_max, self.atraso_base * 2 ** tentativa))
+
+    @staticmethod
+    def _host(url):
+        return urlsplit(url).hostname or url
+
+    async def executar(self, operacao, alvo, descricao=None):
+        """Executar operacao() (coroutine sem argumentos) com novas tentativas e o circuito do alvo"""
+        descricao = descricao or alvo
+        for tentativa in range(self.max_retries + 1):
+            pausa = await self.circuito.aguardar(alvo)
+            if pausa:
+                self.stats[alvo]["pausas"] += 1
+                self.logger.info(f"Circuito de {descricao} fechado após {pausa:.0f}s de pausa")
+
+            try:
+                resultado = await operacao()
+                self.circuito.registrar_sucesso(alvo)
+                return resultado
+            except Exception as e:
+                if not transitorio(e):
+                    raise
+
+                self.stats[alvo]["falhas"] += 1
+                if self.circuito.registrar_falha(alvo):
+                    print(f"{Fore.RED}   ⛔ {descricao}: falhas seguidas - pausado por {self.circuito.pausa_s}s")
+                    self.logger.warning(f"Circuito aberto para {descricao}: {str(e)}")
+
+                if tentativa == self.max_retries:
+                    self.stats[alvo]["desistencias"] += 1
+                    raise
+
+                atraso = self.atraso(tentativa)
+                self.stats[alvo]["tentativas"] += 1
+                print(f"{Fore.YELLOW}   🔁 {descricao}: {type(e).__name__} - nova tentativa "
+                      f"{tentativa + 1}/{self.max_retries} em {atraso:.1f}s")
+                self.logger.debug(f"Erro transitório em {descricao}: {str(e)}")
+                await asyncio.sleep(atraso)
+
+    async def goto(self, page, url, **kwargs):
+        """page.goto pelo limitador com o timeout configurado; falhas transitórias contam no circuito do host"""
+        kwargs.setdefault("timeout", self.timeout_ms)
+        host = self._host(url)
+        await self.circuito.aguardar(host)
+
+        try:
+            resposta = await self.limitador.goto(page, url, **kwargs)
+            if resposta is not None and resposta.status in STATUS_TRANSITORIOS:
+                raise ErroTransitorio(resposta.status, url)
+        except Exception as e:
+            if transitorio(e) and self.circuito.registrar_falha(host):
+                print(f"{Fore.RED}   ⛔ {host}: falhas seguidas - host pausado por {self.circuito.pausa_s}s")
+                self.logger.warning(f"Circuito aberto para o host {host}: {str(e)}")
+            raise
+
+        self.circuito.registrar_sucesso(host)
+        return resposta
+
+    async def navegar(self, page, url, alvo=None, **kwargs):
+        """goto com novas tentativas (o circuito do alvo é o da própria URL, o do host fica no goto)"""
+        return await self.executar(lambda: self.goto(page, url, **kwargs), alvo or url)
+
+    def exibir_relatorio(self):
+        """Novas tentativas, desistências e pausas por alvo"""
+        if not self.stats and not self.circuito.aberturas:
+            return
+        print(f"\n{Fore.CYAN}🔁 NOVAS TENTATIVAS (máx. {self.max_retries}, timeout {self.timeout_ms / 1000:.0f}s):")
+        for alvo in sorted(set(self.stats) | set(self.circuito.aberturas)):
+            stats = self.stats[alvo]
+            cor = Fore.RED if stats["desistencias"] else Fore.WHITE
+            print(f"{cor}   • {alvo}: {stats['tentativas']} novas tentativas | {stats['desistencias']} desistências | "
+                  f"circuito aberto {self.circuito.aberturas[alvo]}x")
@@ -0,0 +1,132 @@
+"""
+Cache em disco da sessão de localização (storage_state do Playwright) por cidade
+"""
+import json
+import os
+import re
+import time
+import unicodedata
+from pathlib import Path
+from colorama import Fore
+from src.utils.logger import get_logger
+from src.config.config_manager import ConfigManager
+
+class LocationSessionCache:
+    """Guarda cookies + localStorage após a localização e injeta em novos contextos"""
+
+    def __init__(self, config_manager=None):
+        self.logger = get_logger()
+        self.config_manager = config_manager or ConfigManager()
+        config = self.config_manager.get_session_cache_config()
+
+        self.habilitado = config.get("enabled", True)
+        self.ttl_segundos = float(config.get("ttl_hours", 12)) * 3600
+        self.diretorio = Path(config.get("dir", "data/sessions"))
+
+    def _slug(self, cidade):
+        """Nome de arquivo estável para a cidade"""
+        texto = unicodedata.normalize("NFKD", cidade).encode("ascii", "ignore").decode("ascii")
+        return re.sub(r"[^a-z0-9]+", "-", texto.lower()).strip("-") or "cidade"
+
+    def _arquivo(self, cidade):
+        """Caminho do arquivo de sessão da cidade"""
+        return self.diretorio / f"{self._slug(cidade)}.json"
+
+    def _ler(self, arquivo):
+        """Ler entrada do cache (None se inexistente/corrompida)"""
+        try:
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def obter(self, cidade):
+        """Obter storage_state válido da cidade (None se ausente, expirado ou cidade não configurada)"""
+        if not self.habilitado:
+            return None
+
+        if cidade not in self.config_manager.get_all_cities():
+            self.logger.debug(f"Cidade '{cidade}' não está configurada - sessão ignorada")
+            return None
+
+        entrada = self._ler(self._arquivo(cidade))
+        if not entrada or entrada.get("cidade") != cidade:
+            return None
+
+        idade = time.time() - entrada.get("criado_em", 0)
+        if idade > self.ttl_segundos:
+            self.logger.info(f"Sessão de localização de '{cidade}' expirada ({idade / 3600:.1f}h)")
+            self.invalidar(cidade)
+            return None
+
+        return entrada.get("storage_state")
+
+    def opcoes_contexto(self, cidade):
+        """Opções extras para browser.new_context() com a sessão da cidade (se houver)"""
+        storage_state = self.obter(cidade)
+        if storage_state:
+            return {"storage_state": storage_state}
+        return {}
+
+    async def salvar(self, context, cidade):
+        """Capturar storage_state do contexto já localizado e gravar em disco"""
+        if not self.habilitado:
+            return False
+
+        try:
+            storage_state = await context.storage_state()
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+
+            arquivo = self._arquivo(cidade)
+            temporario = arquivo.with_suffix(".tmp")
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "cidade": cidade,
+                    "criado_em": time.time(),
+                    "storage_state": storage_state
+                }, f, ensure_ascii=False)
+            os.replace(temporario, arquivo)
+
+            self.logger.info(f"Sessão de localização salva para '{cidade}'")
+            print(f"{Fore.WHITE}   💾 Sessão de localização salva ({cidade})")
+            return True
+
+        except Exception as e:
+            self.logger.warning(f"Erro ao salvar sessão de localização: {str(e)}")
+            return False
+
+    def invalidar(self, cidade):
+        """Remover sessão da cidade"""
+        try:
+            self._arquivo(cidade).unlink()
+        except FileNotFoundError:
+            pass
+
+    def limpar_expirados(self):
+        """Remover sessões expiradas ou de cidades que não estão mais configuradas"""
+        if not self.diretorio.exists():
+            return 0
+
+        cidades = set(self.config_manager.get_all_cities())
+        removidos = 0
+
+        for arquivo in self.diretorio.glob("*.json"):
+            entrada = self._ler(arquivo)
+            expirado = not entrada or time.time() - entrada.get("criado_em", 0) > self.ttl_segundos
+            if expirado or entrada.get("cidade") not in cidades:
+                arquivo.unlink(missing_ok=True)
+                removidos += 1
+
+        return removidos
+
+    async def sessao_localizada(self, page, seletor_campo_endereco, timeout=5000):
+        """Verificar se a página abriu já localizada (sem o campo de endereço do modal)"""
+        try:
+            # Aguarda o que aparecer primeiro: campo de endereço ou conteúdo com links de delivery
+            await page.wait_for_selector(
+                f"{seletor_campo_endereco}, a[href*='/delivery/']", timeout=timeout
+            )
+            campo = await page.query_selector(seletor_campo_endereco)
+            return not (campo and await campo.is_visible())
+        except Exception:
+            return False
@@ -0,0 +1,72 @@
+"""
+Utilitários de benchmark: contagem de round trips ao navegador e tempo de execução
+"""
+import functools
+import time
+from collections import Counter
+from playwright.async_api import Page, ElementHandle, Frame
+
+class ContadorRoundTrips:
+    """Conta chamadas assíncronas de Page/ElementHandle (cada uma é um round trip IPC ao navegador)"""
+
+    METODOS = {
+        Page: ["query_selector", "query_selector_all", "evaluate", "inner_text", "get_attribute",
+               "wait_for_selector"],
+        Frame: ["query_selector", "query_selector_all", "evaluate", "inner_text", "get_attribute",
+                "wait_for_selector"],
+        ElementHandle: ["query_selector", "query_selector_all", "evaluate", "inner_text", "text_content",
+                        "get_attribute", "is_visible"]
+    }
+
+    def __init__(self):
+        self.chamadas = Counter()
+        self._originais = []
+        self._inicio = None
+        self.tempo = 0.0
+
+    @property
+    def total(self):
+        """Total de round trips registrados"""
+        return sum(self.chamadas.values())
+
+    def _envolver(self, classe, nome, original):
+        contador = self
+
+        @functools.wraps(original)
+        async def wrapper(*args, **kwargs):
+            contador.chamadas[f"{classe.__name__}.{nome}"] += 1
+            return await original(*args, **kwargs)
+
+        return wrapper
+
+    def __enter__(self):
+        for classe, nomes in self.METODOS.items():
+            for nome in nomes:
+                original = getattr(classe, nome)
+                self._originais.append((classe, nome, original))
+                setattr(classe, nome, self._envolver(classe, nome, original))
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tempo = time.perf_counter() - self._inicio
+        for classe, nome, original in reversed(self._originais):
+            setattr(classe, nome, original)
+        self._originais = []
+        return False
+
+
+def comparar_execucoes(nome_antes, contador_antes, nome_depois, contador_depois, itens):
+    """Montar dados de comparação para DisplayFormatter.stats_table"""
+    ganho_tempo = contador_antes.tempo / contador_depois.tempo if contador_depois.tempo > 0 else 0
+    reducao_rt = (1 - contador_depois.total / contador_antes.total) * 100 if contador_antes.total else 0
+
+    return {
+        "Itens": itens,
+        f"Round trips ({nome_antes})": contador_antes.total,
+        f"Round trips ({nome_depois})": contador_depois.total,
+        "Redução de round trips": f"{reducao_rt:.1f}%",
+        f"Tempo ({nome_antes})": f"{contador_antes.tempo:.3f}s",
+        f"Tempo ({nome_depois})": f"{contador_depois.tempo:.3f}s",
+        "Speedup": f"{ganho_tempo:.1f}x"
+    }
@@ -0,0 +1,16 @@
+"""
+Hashes estáveis do conteúdo coletado (card, item de cardápio, cardápio inteiro) para detectar o que mudou
+"""
+import hashlib
+import json
+
+
+def hash_conteudo(valor):
+    """Hash curto de um valor serializável (dicts com chaves em qualquer ordem dão o mesmo hash)"""
+    texto = json.dumps(valor, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()[:16]
+
+
+def hash_conjunto(valores):
+    """Hash de uma coleção sem depender da ordem dos itens (ex.: cardápio renderizado em outra ordem)"""
+    return hash_conteudo(sorted(hash_conteudo(valor) for valor in valores))
@@ -0,0 +1,165 @@
+"""
+Interpretação dos textos dos cards (rating, tempo, reviews, preços em BRL) com padrões pré-compilados
+"""
+import re
+import time
+
+# Padrões compilados uma única vez (antes: re.search/import re dentro dos loops, por campo e por card)
+PADRAO_RATING = re.compile(r'\d+(?:[.,]\d+)?')
+PADRAO_INTERVALO_MIN = re.compile(r'(\d+)\s*-\s*(\d+)\s*min', re.IGNORECASE)
+PADRAO_MINUTOS = re.compile(r'(\d+)\s*min', re.IGNORECASE)
+PADRAO_INTEIRO = re.compile(r'(\d[\d.,]*)\s*(mil|k)?\b', re.IGNORECASE)
+PADRAO_MOEDA = re.compile(r'R\$\s*(\d[\d.,]*)')
+PADRAO_NUMERO = re.compile(r'\d[\d.,]*')
+PADRAO_MILHAR = re.compile(r'\d{1,3}(?:\.\d{3})+')
+PADRAO_PRECO_TEXTO = re.compile(r'R\$\s*\d[\d.]*,\d{2}|R\$\s*\d+\.\d{2}(?!\d)')
+PADROES_REVIEWS_TEXTO = [re.compile(padrao, re.IGNORECASE) for padrao in
+                         (r'\((\d[\d.]*)\)', r'(\d[\d.]*)\s*avalia', r'(\d[\d.]*)\s*review')]
+PADROES_MINIMO_TEXTO = [re.compile(padrao, re.IGNORECASE) for padrao in
+                        (r'mínimo.*?R\$\s*(\d[\d.,]*)', r'pedido.*?R\$\s*(\d[\d.,]*)')]
+GRATIS = {"0", "grátis", "gratis", "free"}
+
+
+def _decimal_brl(numero):
+    """Converter número no formato brasileiro ("1.234,56") ou já com ponto decimal ("12.50") para float;
+    None se não for um número válido (ex: "1.2.3")"""
+    numero = numero.rstrip(".,")
+    if "," in numero and "." in numero:
+        # O último separador é o decimal
+        if numero.rfind(",") > numero.rfind("."):
+            numero = numero.replace(".", "").replace(",", ".")
+        else:
+            numero = numero.replace(",", "")
+    elif "," in numero:
+        numero = numero.replace(",", "") if numero.count(",") > 1 else numero.replace(",", ".")
+    elif PADRAO_MILHAR.fullmatch(numero):
+        # "1.234" em BRL é milhar, não decimal
+        numero = numero.replace(".", "")
+    try:
+        return float(numero)
+    except ValueError:
+        return None
+
+
+def interpretar_preco(texto):
+    """Valor em reais (ex: "R$ 1.234,56" → 1234.56, "R$ 12.50" → 12.5); None se ausente"""
+    if texto is None or isinstance(texto, (int, float)):
+        return None if texto is None else float(texto)
+    match = PADRAO_MOEDA.search(texto)
+    if match:
+        return _decimal_brl(match.group(1))
+    match = PADRAO_NUMERO.search(texto)
+    return _decimal_brl(match.group(0)) if match else None
+
+
+def interpretar_taxa_entrega(texto):
+    """Taxa de entrega em reais ("Grátis"/"0" → 0.0); textos sem R$ (ex: "30-40 min") não são taxa"""
+    if not isinstance(texto, str):
+        return interpretar_preco(texto)
+    if texto.strip().lower() in GRATIS or "grátis" in texto.lower():
+        return 0.0
+    match = PADRAO_MOEDA.search(texto)
+    if match:
+        return _decimal_brl(match.group(1))
+    # Valor numérico puro (ex: "6.99" vindo da API)
+    return _decimal_brl(texto.strip()) if PADRAO_NUMERO.fullmatch(texto.strip()) else None
+
+
+def interpretar_rating(texto):
+    """Nota de 0 a 5 (ex: "4.5 ★", "★ 4,8"); None se ausente ou fora da escala"""
+    if texto is None or isinstance(texto, (int, float)):
+        return None if texto is None else float(texto)
+    match = PADRAO_RATING.search(texto)
+    if not match:
+        return None
+    valor = float(match.group(0).replace(",", "."))
+    return valor if 0 <= valor <= 5 else None
+
+
+def interpretar_tempo_entrega(texto):
+    """Tempo em minutos (ex: "30-45 min" → 37, "30 min" → 30)"""
+    if texto is None or isinstance(texto, (int, float)):
+        return None if texto is None else int(texto)
+    match = PADRAO_INTERVALO_MIN.search(texto)
+    if match:
+        return (int(match.group(1)) + int(match.group(2))) // 2
+    match = PADRAO_MINUTOS.search(texto)
+    return int(match.group(1)) if match else None
+
+
+def interpretar_inteiro(texto):
+    """Contagem (ex: "(234)", "1.234 avaliações" → 1234, "1,2 mil" → 1200)"""
+    if texto is None or isinstance(texto, (int, float)):
+        return None if texto is None else int(texto)
+    match = PADRAO_INTEIRO.search(texto)
+    if not match:
+        return None
+    numero, sufixo = match.groups()
+    if sufixo:
+        valor = _decimal_brl(numero)
+        return None if valor is None else int(round(valor * 1000))
+    return int(numero.rstrip(".,").replace(".", "").replace(",", ""))
+
+
+def encontrar_preco(texto):
+    """Primeiro preço ("R$ 12,90") dentro de um texto livre (string original ou None)"""
+    match = PADRAO_PRECO_TEXTO.search(texto or "")
+    return match.group(0) if match else None
+
+
+def reviews_no_texto(texto):
+    """Quantidade de avaliações no texto completo do card ("(123)", "123 avaliações", "123 reviews")"""
+    for padrao in PADROES_REVIEWS_TEXTO:
+        match = padrao.search(texto or "")
+        if match:
+            return interpretar_inteiro(match.group(1))
+    return None
+
+
+def pedido_minimo_no_texto(texto):
+    """Pedido mínimo no texto completo do card ("Pedido mínimo R$ 20,00")"""
+    for padrao in PADROES_MINIMO_TEXTO:
+        match = padrao.search(texto or "")
+        if match:
+            return _decimal_brl(match.group(1))
+    return None
+
+
+# Preços como aparecem nos cards (benchmark)
+TEXTOS_PRECO = ["R$ 1.234,56", "R$ 29,90", "R$ 2.500", "A partir de R$ 15,00", "R$ 12.50"]
+
+
+def _preco_legado(texto):
+    """Conversão antiga (referência do benchmark): replace(",", ".") e float"""
+    try:
+        return float(texto.replace("R$", "").replace(",", ".").strip())
+    except (AttributeError, ValueError):
+        return None
+
+
+def comparar_desempenho(repeticoes=2000):
+    """Microbenchmark: conversão antiga de preço x interpretar_preco (padrões pré-compilados, formato BRL)"""
+    textos = TEXTOS_PRECO * repeticoes
+
+    inicio = time.perf_counter()
+    legado = [_preco_legado(texto) for texto in textos]
+    tempo_legado = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    precos = [interpretar_preco(texto) for texto in textos]
+    tempo_novo = time.perf_counter() - inicio
+
+    errados = sum(1 for antigo, novo in zip(legado, precos) if antigo is None or abs(antigo - novo) > 1e-9)
+    return {
+        "Textos": len(textos),
+        "Tempo (antigo)": f"{tempo_legado * 1000:.1f}ms",
+        "Tempo (novo)": f"{tempo_novo * 1000:.1f}ms",
+        "Textos/s (novo)": f"{len(textos) / tempo_novo:,.0f}" if tempo_novo > 0 else "N/A",
+        "Divergências do antigo": f"{errados} ({errados / len(textos) * 100:.0f}%)"
+    }
+
+
+if __name__ == "__main__":
+    from src.utils.display_formatter import DisplayFormatter
+
+    print(DisplayFormatter.stats_table(comparar_desempenho()))
@@ -0,0 +1,113 @@
+"""
+Modo HTTP direto contra um servidor local de catálogo (python -m pytest tests)
+"""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from src.config.config_manager import ConfigManager
+from src.scrapers.direct_http import DirectHttpFetcher
+
+MERCHANT_ID = "12345678-1234-1234-1234-123456789abc"
+
+RESTAURANTE = {
+    "id": 1, "nome": "Lanchonete Teste", "categoria": "Lanches",
+    "link": f"https://www.ifood.com.br/delivery/birigui-sp/lanchonete-teste/{MERCHANT_ID}"
+}
+
+# Formato do JSON de catálogo (description = nome do prato, details = descrição)
+CATALOGO = {"data": {"menu": [{"code": "c1", "name": "Lanches", "itens": [
+    {"id": "i1", "description": "X-Burguer", "details": "Pão, carne e queijo", "unitPrice": 24.9},
+    {"id": "i2", "description": "X-Salada", "details": None, "unitPrice": 1234.5},
+    {"id": "i1", "description": "X-Burguer", "details": "Pão, carne e queijo", "unitPrice": 24.9},
+]}]}}
+
+
+@pytest.fixture
+def servidor():
+    """Servidor de catálogo: JSON em /catalogo/<merchant_id>, 404 no resto; guarda os caminhos pedidos"""
+    pedidos = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            pedidos.append(self.path)
+            if self.path != f"/catalogo/{MERCHANT_ID}":
+                self.send_error(404)
+                return
+            corpo = json.dumps(CATALOGO).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, *_):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{servidor.server_address[1]}", pedidos
+    servidor.shutdown()
+    servidor.server_close()
+
+
+@pytest.fixture
+def config_manager(tmp_path, monkeypatch):
+    """Configuração real com o HTTP direto ligado e arquivos (banco, sessões) no diretório temporário"""
+    monkeypatch.chdir(tmp_path)
+    config_manager = ConfigManager()
+    config_manager.config.setdefault("scraping", {})["direct_http"] = {
+        "enabled": True, "endpoints_file": str(tmp_path / "endpoints.json")
+    }
+    return config_manager
+
+
+def _endpoint(config_manager, url):
+    config_manager.config["scraping"]["direct_http"]["endpoints"] = {"catalogo": url}
+
+
+def test_catalogo_vira_produtos(servidor, config_manager):
+    base, pedidos = servidor
+    _endpoint(config_manager, f"{base}/catalogo/{{merchant_id}}")
+    fetcher = DirectHttpFetcher(config_manager)
+
+    async def buscar():
+        assert await fetcher.preparar([RESTAURANTE], "catalogo")
+        async with fetcher:
+            return await fetcher.buscar("catalogo", RESTAURANTE)
+
+    captura = asyncio.run(buscar())
+
+    assert pedidos == [f"/catalogo/{MERCHANT_ID}"]
+    assert captura.produtos(1, "Lanchonete Teste", "Lanches") == [
+        {"restaurant_id": 1, "restaurant_name": "Lanchonete Teste", "category": "Lanches",
+         "nome": "X-Burguer", "descricao": "Pão, carne e queijo", "preco": "R$ 24.90"},
+        {"restaurant_id": 1, "restaurant_name": "Lanchonete Teste", "category": "Lanches",
+         "nome": "X-Salada", "descricao": None, "preco": "R$ 1234.50"},
+    ]
+    assert fetcher.stats["ok"] == 1
+
+
+def test_endpoint_indisponivel_volta_para_o_navegador(servidor, config_manager):
+    from src.scrapers.products_scraper import ProductsScraper
+
+    base, pedidos = servidor
+    _endpoint(config_manager, f"{base}/inexistente/{{merchant_id}}")
+    scraper = ProductsScraper()
+    scraper.config_manager = config_manager
+
+    pendentes = asyncio.run(scraper.executar_scraping_produtos_http([RESTAURANTE]))
+
+    assert pedidos == [f"/inexistente/{MERCHANT_ID}"]
+    assert pendentes == [RESTAURANTE]
+
+
+def test_sem_endpoint_nem_merchant_id_volta_para_o_navegador(config_manager):
+    from src.scrapers.products_scraper import ProductsScraper
+
+    sem_link = dict(RESTAURANTE, link="N/A")
+    scraper = ProductsScraper()
+    scraper.config_manager = config_manager
+
+    assert asyncio.run(scraper.executar_scraping_produtos_http([sem_link])) == [sem_link]
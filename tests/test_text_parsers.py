@@ -0,0 +1,64 @@
+"""
+Interpretadores de texto dos cards conferidos contra um corpus de textos reais (python -m pytest tests)
+"""
+import pytest
+from src.utils import text_parsers
+
+INTERPRETADORES = {
+    "rating": text_parsers.interpretar_rating,
+    "delivery_time": text_parsers.interpretar_tempo_entrega,
+    "reviews": text_parsers.interpretar_inteiro,
+    "min_order": text_parsers.interpretar_preco,
+    "taxa_entrega": text_parsers.interpretar_taxa_entrega,
+    "preco": text_parsers.interpretar_preco
+}
+
+# Corpus de textos reais dos cards/páginas: (campo, texto, esperado)
+CORPUS = [
+    ("rating", "4.5", 4.5),
+    ("rating", "★ 4,8", 4.8),
+    ("rating", "4.7 • Lanches • 1,2 km", 4.7),
+    ("rating", "Novo!", None),
+    ("rating", "N/A", None),
+    ("delivery_time", "30-40 min • R$ 5,99", 35),
+    ("delivery_time", "50-60 min", 55),
+    ("delivery_time", "25 min", 25),
+    ("delivery_time", "Fechado", None),
+    ("reviews", "(234)", 234),
+    ("reviews", "1.234 avaliações", 1234),
+    ("reviews", "1,2 mil avaliações", 1200),
+    ("reviews", "N/A", None),
+    ("min_order", "Pedido mínimo R$ 20,00", 20.0),
+    ("min_order", "Mínimo R$25", 25.0),
+    ("min_order", "R$ 1.234,56", 1234.56),
+    ("min_order", 25.0, 25.0),
+    ("taxa_entrega", "Grátis", 0.0),
+    ("taxa_entrega", "0", 0.0),
+    ("taxa_entrega", "R$ 6,99", 6.99),
+    ("taxa_entrega", "R$ 12.50", 12.5),
+    ("taxa_entrega", "30-40 min • Grátis", 0.0),
+    ("taxa_entrega", "30-40 min", None),
+    ("taxa_entrega", "6.99", 6.99),
+    ("preco", "R$ 1.234,56", 1234.56),
+    ("preco", "R$ 29,90", 29.9),
+    ("preco", "R$ 2.500", 2500.0),
+    ("preco", "A partir de R$ 15,00", 15.0),
+    ("preco", "R$ 12.50", 12.5),
+    ("preco", "R$ 1.2.3", None),
+    ("preco", None, None),
+]
+
+
+@pytest.mark.parametrize("campo,texto,esperado", CORPUS)
+def test_corpus(campo, texto, esperado):
+    obtido = INTERPRETADORES[campo](texto)
+    if esperado is None:
+        assert obtido is None
+    else:
+        assert obtido == pytest.approx(esperado)
+
+
+def test_textos_livres():
+    assert text_parsers.encontrar_preco("X-Burguer Pão, carne R$ 24,90 Adicionar") == "R$ 24,90"
+    assert text_parsers.reviews_no_texto("Pizzaria 4.6 (1.234) • 40-50 min") == 1234
+    assert text_parsers.pedido_minimo_no_texto("Pedido mínimo R$ 20,00") == 20.0